@@ -28,6 +28,17 @@ celery -A Lunchbreak worker \
     --detach \
     --logfile="/var/lunchbreak/log/%n%I.log"
 
+# Periodic tasks of CELERY_BEAT_SCHEDULE, only one container may run the
+# scheduler, disable it in the others with CELERY_BEAT=false.
+if [ "${CELERY_BEAT}" != "false" ]; then
+    celery -A Lunchbreak beat \
+        -l info \
+        --detach \
+        --pidfile="/tmp/celerybeat.pid" \
+        --schedule="/tmp/celerybeat-schedule" \
+        --logfile="/var/lunchbreak/log/beat.log"
+fi
+
 uwsgi \
     --chdir=/code/ \
     --module=Lunchbreak.wsgi:application \
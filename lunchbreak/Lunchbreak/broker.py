@@ -0,0 +1,88 @@
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class Broker:
+    """Publish/subscribe broker of increasing values per channel.
+
+    Publishers publish the latest value of a channel, subscribers wait until
+    a channel has a value greater than the one they know of.
+    """
+
+    def publish(self, channel, value):
+        """Publish a new value of the channel.
+
+        Args:
+            channel (str): Channel name.
+            value (int): Latest value, lower values than the last published
+            value are ignored.
+        """
+        raise NotImplementedError()
+
+    def wait(self, channel, after, timeout):
+        """Wait until the channel has a value greater than the given value.
+
+        Args:
+            channel (str): Channel name.
+            after (int): Value known by the subscriber.
+            timeout (float): Maximum seconds to wait.
+
+        Returns:
+            int: Published value or None if the timeout expired.
+        """
+        raise NotImplementedError()
+
+    def clear(self):
+        """Forget all of the published values."""
+        raise NotImplementedError()
+
+
+class MemoryBroker(Broker):
+    """In-process broker, only wakes up subscribers of the same process.
+
+    This is a placeholder until a broker shared by all processes is
+    available. Under uwsgi every request is handled by one of several
+    processes, so most changes are only noticed by the polling of
+    ``OrderSequence.wait``.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._condition = threading.Condition()
+
+    def publish(self, channel, value):
+        with self._condition:
+            if value > self._values.get(channel, value - 1):
+                self._values[channel] = value
+                self._condition.notify_all()
+
+    def wait(self, channel, after, timeout):
+        def published():
+            value = self._values.get(channel)
+            return value is not None and value > after
+
+        with self._condition:
+            if self._condition.wait_for(published, timeout=timeout):
+                return self._values[channel]
+        return None
+
+    def clear(self):
+        with self._condition:
+            self._values.clear()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Broker of this process, an instance of ``settings.BROKER_CLASS``."""
+    global _broker
+
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.BROKER_CLASS)()
+    return _broker
@@ -1,31 +1,140 @@
+from copy import deepcopy
+
+import dirtyfields
 from django.core.exceptions import ValidationError
+from django.db.models.expressions import BaseExpression, Combinable
+from django.db.models.signals import class_prepared, post_save
+from django.dispatch import receiver
 
 from .exceptions import LunchbreakException
 
 
 class CleanModelMixin:
 
+    @classmethod
+    def get_clean_methods(cls):
+        """Fields with a clean_<field> method and the methods, in field order.
+
+        Resolved once per model, on the first clean, because the fields
+        include reverse relations which are only known once every model is
+        loaded.
+
+        Returns:
+            Tuples of the field name and the unbound clean method.
+            tuple
+        """
+        clean_methods = cls.__dict__.get('_clean_methods')
+        if clean_methods is None:
+            clean_methods = tuple(
+                (field.name, getattr(cls, 'clean_{}'.format(field.name)),)
+                for field in cls._meta.get_fields()
+                if hasattr(cls, 'clean_{}'.format(field.name))
+            )
+            cls._clean_methods = clean_methods
+        return clean_methods
+
     def clean(self):
         super().clean()
 
-        fields = self.__class__._meta.get_fields()
-
-        for field in fields:
-            clean_method_name = 'clean_{}'.format(field.name)
-            if hasattr(self, clean_method_name):
-                try:
-                    getattr(self, clean_method_name)()
-                except Exception as e:
-                    form = getattr(self, '_form', None)
-                    if form is None:
-                        raise
-
-                    if isinstance(e, LunchbreakException):
-                        e = e.django_validation_error
-                    elif not isinstance(e, ValidationError):
-                        raise
-
-                    form.add_error(
-                        field.name,
-                        e
-                    )
+        for field_name, clean_method in self.get_clean_methods():
+            try:
+                clean_method(self)
+            except Exception as e:
+                form = getattr(self, '_form', None)
+                if form is None:
+                    raise
+
+                if isinstance(e, LunchbreakException):
+                    e = e.django_validation_error
+                elif not isinstance(e, ValidationError):
+                    raise
+
+                form.add_error(
+                    field_name,
+                    e
+                )
+
+
+class DirtyFieldsMixin(dirtyfields.DirtyFieldsMixin):
+    """Dirty tracking limited to the fields in FIELDS_TO_CHECK.
+
+    Only those fields are snapshotted when an instance is initialised or saved
+    and compared by `get_dirty_fields`. The fields and the post_save receiver
+    resetting the snapshot are set up once per model when its class is
+    prepared, instead of on every initialisation.
+    """
+
+    # Names of the fields that are tracked, None tracks every field
+    FIELDS_TO_CHECK = None
+
+    _dirty_tracked_fields = ()
+
+    def __init__(self, *args, **kwargs):
+        # Skips dirtyfields.DirtyFieldsMixin.__init__ which connects the
+        # post_save receiver again for every instance.
+        super(dirtyfields.DirtyFieldsMixin, self).__init__(*args, **kwargs)
+        self._original_state = self._as_dict(check_relationship=True)
+        if self.ENABLE_M2M_CHECK:
+            self._original_m2m_state = self._as_dict_m2m()
+
+    def _as_dict(self, check_relationship, include_primary_key=True):
+        state = {}
+        deferred_fields = self.get_deferred_fields()
+
+        for field in self._dirty_tracked_fields:
+            if field.primary_key and not include_primary_key:
+                continue
+            if field.remote_field and not check_relationship:
+                continue
+            if field.attname in deferred_fields:
+                continue
+
+            value = getattr(self, field.attname)
+            # Expressions are only evaluated by the database
+            if isinstance(value, (BaseExpression, Combinable,)):
+                continue
+
+            try:
+                value = field.to_python(value)
+            except ValidationError:
+                pass
+
+            if isinstance(value, memoryview):
+                value = str(value)
+
+            state[field.name] = deepcopy(value)
+
+        return state
+
+
+def reset_dirty_state(sender, instance, update_fields=None, **kwargs):
+    """Snapshot the tracked fields of a saved instance."""
+    state = instance._as_dict(check_relationship=True)
+    if update_fields:
+        for name in update_fields:
+            if name in state:
+                instance._original_state[name] = state[name]
+    else:
+        instance._original_state = state
+    if instance.ENABLE_M2M_CHECK:
+        instance._original_m2m_state = instance._as_dict_m2m()
+
+
+@receiver(class_prepared)
+def prepare_dirty_fields(sender, **kwargs):
+    if not issubclass(sender, DirtyFieldsMixin):
+        return
+
+    sender._dirty_tracked_fields = tuple(
+        field
+        for field in sender._meta.fields
+        if sender.FIELDS_TO_CHECK is None
+        or field.name in sender.FIELDS_TO_CHECK
+    )
+    post_save.connect(
+        reset_dirty_state,
+        sender=sender,
+        dispatch_uid='{label}-DirtyFieldsMixin-reset'.format(
+            label=sender._meta.label
+        )
+    )
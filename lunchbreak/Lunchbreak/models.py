@@ -1,36 +1,98 @@
-from dirtyfields import DirtyFieldsMixin
 from django.db import models
 
+from .mixins import DirtyFieldsMixin
+
 
 class StatusSignalModel(models.Model, DirtyFieldsMixin):
 
     class Meta:
         abstract = True
 
+    FIELDS_TO_CHECK = ('status',)
+    # Fields that can be saved on their own with update_fields without a full
+    # clean, see StatusSignalModel.clean_for_save.
+    FAST_PATH_FIELDS = ('status',)
+
     def _get_FIELD_signal(self, field):
         value = getattr(self, field.attname)
         return field.signals[value]
 
-    def save(self, *args, **kwargs):
+    def is_fast_path(self, update_fields):
+        """Whether a save of update_fields only touches FAST_PATH_FIELDS."""
+        return self.pk is not None \
+            and bool(update_fields) \
+            and set(update_fields) <= set(self.FAST_PATH_FIELDS)
+
+    def clean_for_save(self, update_fields=None):
+        """Validate the instance before it is saved.
+
+        Saves of existing instances that only update FAST_PATH_FIELDS only
+        validate those fields and call their clean_<field> methods, which hold
+        the transition rules. Other saves do a full clean.
+
+        Args:
+            update_fields (list): The update_fields of the save.
+        """
+        if not self.is_fast_path(update_fields):
+            self.full_clean()
+            return
+
+        self.clean_fields(
+            exclude=[
+                field.name
+                for field in self._meta.fields
+                if field.name not in update_fields
+            ]
+        )
+        for field_name in update_fields:
+            clean_method = getattr(self, 'clean_{}'.format(field_name), None)
+            if clean_method is not None:
+                clean_method()
+
+    def save(self, *args, send_status_signal=True, **kwargs):
+        """Save and send the status signal if the status changed.
+
+        Args:
+            send_status_signal (bool): Whether the status signal should be
+            sent, if False it needs to be sent with
+            :meth:`StatusSignalModel.send_status_signal` afterwards.
+        """
         dirty_fields = self.get_dirty_fields()
         # Currently does not support fields that are not named 'status'
         # This must be changed in case this is needed here.
         dirty_status = dirty_fields.get('status', None)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'status' not in update_fields:
+            dirty_status = None
 
         signal = None
-        if self.pk is None or dirty_status is not None:
+        if send_status_signal and (self.pk is None or dirty_status is not None):
             signal = self.get_status_signal()
 
         super().save(*args, **kwargs)
 
         if signal is not None:
-            signal.send(
-                **{
-                    'sender': self.__class__,
-                    # Assumes that the signal only has 1 argument
-                    list(signal.providing_args)[0]: self
-                }
-            )
+            self.send_status_signal(signal)
+
+    def send_status_signal(self, signal=None, status_changed=True):
+        """Send the signal of the current status.
+
+        Args:
+            signal (Signal, optional): Signal to send, defaults to the signal of
+            the current status.
+            status_changed (bool): Whether to call status_changed afterwards.
+        """
+        if signal is None:
+            signal = self.get_status_signal()
+
+        signal.send(
+            **{
+                'sender': self.__class__,
+                # Assumes that the signal only has 1 argument
+                list(signal.providing_args)[0]: self
+            }
+        )
+        if status_changed:
             self.status_changed()
 
     def status_changed(self):
@@ -33,6 +33,48 @@ class PrimaryModelSerializer(serializers.ModelSerializer):
             self.fail('incorrect_type', data_type=type(data).__name__)
 
 
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+
+    """Primary key field reading the instances preloaded by a parent serializer.
+
+    A parent serializer can set ``preloaded``, a dict of models mapped to dicts
+    of primary keys and their instances, in ``to_internal_value`` before its
+    children are validated. Primary keys that were not preloaded are looked up
+    in the queryset like ``PrimaryKeyRelatedField`` does.
+    """
+
+    def get_preloaded(self):
+        parent = self.parent
+        while parent is not None:
+            preloaded = getattr(parent, 'preloaded', None)
+            if preloaded is not None:
+                return preloaded.get(self.get_queryset().model)
+            parent = parent.parent
+        return None
+
+    def to_internal_value(self, data):
+        preloaded = self.get_preloaded()
+        if preloaded is not None and not isinstance(data, bool):
+            try:
+                return preloaded[int(data)]
+            except (KeyError, TypeError, ValueError):
+                pass
+        return super().to_internal_value(data)
+
+    @staticmethod
+    def primary_keys(values):
+        """Valid integer primary keys of the given input values."""
+        result = set()
+        for value in values:
+            if isinstance(value, bool):
+                continue
+            try:
+                result.add(int(value))
+            except (TypeError, ValueError):
+                continue
+        return result
+
+
 class RequestAttributeDefault():
 
     def __init__(self, attribute, raise_exception=True, fallback=None):
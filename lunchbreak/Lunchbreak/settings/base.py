@@ -46,6 +46,7 @@ INSTALLED_APPS = [
     'imagekit',
     'polaroid',
 
+    'webhooks',
     'django_sms',
     'payconiq',
     'django_gocardless',
@@ -91,6 +92,20 @@ PASSWORD_HASHERS = (
     'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
     'django.contrib.auth.hashers.SHA1PasswordHasher',
 )
+# Per-process cache of verified API tokens, see lunch.authentication.TokenCache
+TOKEN_CACHE_SIZE = 1024
+TOKEN_CACHE_TTL = 60
+# Publish/subscribe broker waking up long-polling requests, see
+# Lunchbreak.broker
+BROKER_CLASS = 'Lunchbreak.broker.MemoryBroker'
+# Maximum seconds a long-polling request for order changes is held and the
+# interval in which changes of other processes are checked. The timeout stays
+# well below the uwsgi harakiri timeout of 20 seconds.
+ORDER_LONG_POLL_TIMEOUT = 15
+ORDER_LONG_POLL_INTERVAL = 5
+# Maximum long-polling requests held at once by the processes of a host, the
+# others are answered immediately so processes remain free for other requests.
+ORDER_LONG_POLL_SLOTS = 2
 
 LANGUAGE_CODE = 'nl-BE'
 LANGUAGES = [
@@ -1,5 +1,6 @@
 import logging
 import os
+from datetime import timedelta
 
 from django_jinja.builtins import DEFAULT_EXTENSIONS
 from kombu import Exchange, Queue
@@ -179,6 +180,18 @@ CELERY_TASK_QUEUES = (
         routing_key='task.#'
     ),
 )
+# Run by the beat scheduler of docker-entrypoint.sh
+CELERY_BEAT_SCHEDULE = {
+    'payconiq-reconcile-stale-transactions': {
+        'task': 'payconiq.tasks.reconcile_stale_transactions',
+        'schedule': timedelta(minutes=5),
+    },
+    # Events of which the enqueue on commit or the follow-up got lost
+    'webhooks-process-events': {
+        'task': 'webhooks.tasks.process_webhook_events',
+        'schedule': timedelta(minutes=1),
+    },
+}
 
 # Raven configuration for Sentry
 RAVEN_CONFIG = {
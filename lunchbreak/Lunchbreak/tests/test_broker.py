@@ -0,0 +1,48 @@
+import threading
+
+from django.test import SimpleTestCase
+
+from ..broker import MemoryBroker
+
+
+class MemoryBrokerTestCase(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.broker = MemoryBroker()
+
+    def test_wait(self):
+        """Test whether waiting subscribers are woken up by a publish."""
+        timer = threading.Timer(
+            0.1,
+            self.broker.publish,
+            args=('channel', 2,)
+        )
+        timer.start()
+        try:
+            self.assertEqual(
+                self.broker.wait('channel', after=1, timeout=5),
+                2
+            )
+        finally:
+            timer.cancel()
+
+        # Already published values are returned immediately
+        self.assertEqual(
+            self.broker.wait('channel', after=1, timeout=0),
+            2
+        )
+
+    def test_timeout(self):
+        """Test whether old values and other channels are ignored."""
+        self.broker.publish('channel', 3)
+        self.broker.publish('channel', 2)
+        self.broker.publish('other', 10)
+        self.assertIsNone(
+            self.broker.wait('channel', after=3, timeout=0.01)
+        )
+
+        self.broker.clear()
+        self.assertIsNone(
+            self.broker.wait('other', after=0, timeout=0)
+        )
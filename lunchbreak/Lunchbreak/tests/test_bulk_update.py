@@ -0,0 +1,69 @@
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from lunch.models import Ingredient
+from lunch.tests import LunchTestCase
+
+
+class BulkUpdateTestCase(LunchTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.ingredients = [
+            Ingredient.objects.create(
+                name='Ingredient {}'.format(i),
+                cost=i,
+                group=self.ingredientgroup
+            )
+            for i in range(5)
+        ]
+
+    def test_batches(self):
+        """Test whether every batch is updated with one query."""
+        for ingredient in self.ingredients:
+            ingredient.name = 'Updated {}'.format(ingredient.pk)
+            ingredient.cost = F('cost') + 10
+
+        with CaptureQueriesContext(connection) as context:
+            rows = Ingredient.objects.bulk_update(
+                self.ingredients,
+                ['name', 'cost'],
+                batch_size=2
+            )
+
+        self.assertEqual(rows, 5)
+        self.assertEqual(
+            len([
+                query
+                for query in context.captured_queries
+                if query['sql'].startswith('UPDATE')
+            ]),
+            3
+        )
+        for i, ingredient in enumerate(self.ingredients):
+            ingredient.refresh_from_db()
+            self.assertEqual(ingredient.name, 'Updated {}'.format(ingredient.pk))
+            self.assertEqual(ingredient.cost, i + 10)
+
+    def test_invalid(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(Ingredient.objects.bulk_update([], ['name']), 0)
+
+        self.assertRaises(
+            ValueError,
+            Ingredient.objects.bulk_update,
+            self.ingredients,
+            []
+        )
+        self.assertRaises(
+            ValueError,
+            Ingredient.objects.bulk_update,
+            self.ingredients,
+            ['id']
+        )
+        self.assertRaises(
+            ValueError,
+            Ingredient.objects.bulk_update,
+            [Ingredient(name='New')],
+            ['name']
+        )
@@ -0,0 +1,63 @@
+from django.db.models.signals import post_save
+from lunch.models import (Food, HolidayPeriod, Ingredient, IngredientGroup,
+                          Store)
+from lunch.tests import LunchTestCase
+
+
+class MixinsTestCase(LunchTestCase):
+
+    def test_clean_methods(self):
+        """Test whether the clean methods are resolved once in field order."""
+        clean_methods = Food.get_clean_methods()
+
+        self.assertEqual(
+            [field_name for field_name, clean_method in clean_methods],
+            ['amount']
+        )
+        self.assertIs(clean_methods[0][1], Food.clean_amount)
+        self.assertIs(Food.get_clean_methods(), clean_methods)
+
+    def test_tracked_fields(self):
+        """Test whether only the fields to check are snapshotted."""
+        self.assertEqual(
+            set(self.store._original_state),
+            set(Store.FIELDS_TO_CHECK)
+        )
+
+        self.store.name = 'Renamed'
+        self.assertEqual(self.store.get_dirty_fields(), {})
+
+        self.store.city = 'Gent'
+        self.assertEqual(
+            self.store.get_dirty_fields(),
+            {
+                'city': 'Wetteren',
+            }
+        )
+
+    def test_update_fields(self):
+        """Test whether saving specific fields only resets their snapshot."""
+        group = IngredientGroup.objects.create(
+            name='IngredientGroup 2',
+            foodtype=self.foodtype,
+            store=self.store,
+            cost=10
+        )
+        ingredient = Ingredient.objects.get(pk=self.ingredient.pk)
+        ingredient.name = 'Renamed'
+        ingredient.group = group
+        ingredient.save(update_fields=['name', 'group'])
+
+        self.assertNotIn('name', ingredient._original_state)
+        self.assertEqual(ingredient._original_state['group'], group.pk)
+        self.assertEqual(
+            ingredient.get_dirty_fields(check_relationship=True),
+            {}
+        )
+
+    def test_receivers(self):
+        """Test whether instances do not connect receivers themselves."""
+        receivers = len(post_save.receivers)
+        list(HolidayPeriod.objects.all())
+        HolidayPeriod()
+        self.assertEqual(len(post_save.receivers), receivers)
@@ -0,0 +1,19 @@
+from django.test import SimpleTestCase
+
+from ..utils import process_slot
+
+
+class ProcessSlotTestCase(SimpleTestCase):
+
+    def test_process_slot(self):
+        """Test whether no more slots are claimed than available."""
+        with process_slot('test', 2) as first:
+            self.assertTrue(first)
+            with process_slot('test', 2) as second:
+                self.assertTrue(second)
+                with process_slot('test', 2) as third:
+                    self.assertFalse(third)
+
+        # Released slots can be claimed again
+        with process_slot('test', 1) as claimed:
+            self.assertTrue(claimed)
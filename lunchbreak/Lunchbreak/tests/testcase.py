@@ -1,8 +1,10 @@
 import json
+from contextlib import contextmanager
 
 import mock
 from django.conf import settings
-from django.test.utils import override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
 from freezegun import freeze_time
 from lunch.models import Store
 from pendulum import Pendulum
@@ -130,6 +132,61 @@ class LunchbreakTestCase(APITestCase):
         force_authenticate(request, user=user, token=token)
         return self.as_view(request, view, view_actions, *args, **kwargs)
 
+    @contextmanager
+    def assertNoSeqScans(self, *models):
+        """Fail if a query in the context scans the table of a model sequentially.
+
+        The queries are explained with sequential scans disabled, the planner
+        then only falls back to one if no index can be used. The plans are
+        those of large tables even though the test database holds few rows.
+
+        Args:
+            *models: Models of which the tables are large.
+        """
+        if connection.vendor != 'postgresql':
+            self.skipTest('Query plans are only checked on PostgreSQL.')
+
+        tables = {model._meta.db_table for model in models}
+        with CaptureQueriesContext(connection) as context:
+            yield
+
+        for query in context.captured_queries:
+            sql = query['sql']
+            if not sql.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE',)):
+                continue
+
+            scanned = self.seq_scanned_tables(sql) & tables
+            if scanned:
+                self.fail(
+                    'Sequential scan on {tables}: {sql}'.format(
+                        tables=', '.join(sorted(scanned)),
+                        sql=sql
+                    )
+                )
+
+    @staticmethod
+    def seq_scanned_tables(sql):
+        """Tables that are scanned sequentially in the plan of a query."""
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+            try:
+                cursor.execute('EXPLAIN (FORMAT JSON) ' + sql)
+                plan = cursor.fetchone()[0]
+            finally:
+                cursor.execute('RESET enable_seqscan')
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        tables = set()
+        nodes = [plan[0]['Plan']]
+        while nodes:
+            node = nodes.pop()
+            if node['Node Type'] == 'Seq Scan':
+                tables.add(node['Relation Name'])
+            nodes.extend(node.get('Plans', []))
+        return tables
+
     def assertInCount(self, haystack, needles):
         self.assertEqual(len(haystack), len(needles))
 
@@ -1,3 +1,7 @@
+import fcntl
+import os
+import tempfile
+from contextlib import contextmanager
 from decimal import Decimal
 
 
@@ -17,3 +21,43 @@ def format_money(value):
             Decimal(10) ** -2
         )
     ).replace('.', ',')
+
+
+@contextmanager
+def process_slot(name, slots):
+    """Claim one of a limited amount of slots shared by the processes of a host.
+
+    A slot is an exclusive lock on a file in the temporary directory. Locks
+    are released by the system when a process exits, even if it was killed.
+
+    Args:
+        name (str): Name of the slots.
+        slots (int): Amount of slots.
+
+    Yields:
+        bool: Whether a slot was claimed.
+    """
+    for slot in range(slots):
+        lock_file = open(
+            os.path.join(
+                tempfile.gettempdir(),
+                'lunchbreak-{name}-{slot}.lock'.format(
+                    name=name,
+                    slot=slot
+                )
+            ),
+            'a'
+        )
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            continue
+
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+        return
+    yield False
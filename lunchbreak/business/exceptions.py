@@ -5,6 +5,7 @@ INVALID_EMAIL = 800
 INCORRECT_PASSWORD = 801
 INVALID_DATE = 802
 INVALID_PASSWORD_RESET = 803
+INVALID_CURSOR = 804
 
 
 class InvalidEmail(LunchbreakException):
@@ -29,3 +30,9 @@ class InvalidPasswordReset(LunchbreakException):
     status_code = status.HTTP_400_BAD_REQUEST
     default_code = INVALID_PASSWORD_RESET
     default_detail = 'Ongeldige wachtwoord reset token en e-mailadres combinatie.'
+
+
+class InvalidCursor(LunchbreakException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_code = INVALID_CURSOR
+    default_detail = 'Ongeldige cursor.'
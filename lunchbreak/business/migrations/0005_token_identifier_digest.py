@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0004_push_notifications_rollback'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employeetoken',
+            name='identifier_digest',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Sleutel-HMAC van de identificatie code.', max_length=64, verbose_name='identificatie digest'),
+        ),
+        migrations.AddField(
+            model_name='stafftoken',
+            name='identifier_digest',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Sleutel-HMAC van de identificatie code.', max_length=64, verbose_name='identificatie digest'),
+        ),
+    ]
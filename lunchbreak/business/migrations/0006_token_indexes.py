@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0005_token_identifier_digest'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='employeetoken',
+            index_together=set([('employee', 'device')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='stafftoken',
+            index_together=set([('staff', 'device')]),
+        ),
+    ]
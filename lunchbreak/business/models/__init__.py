@@ -1,6 +1,50 @@
+from django.db.models.signals import post_delete, post_save
+from lunch.authentication import TokenCache
+
 from .abstract_password import AbstractPassword  # noqa
 from .abstract_password_reset import AbstractPasswordReset  # noqa
 from .employee import Employee  # noqa
 from .employee_token import EmployeeToken  # noqa
 from .staff import Staff  # noqa
 from .staff_token import StaffToken  # noqa
+
+post_save.connect(
+    TokenCache.changed,
+    sender=StaffToken,
+    weak=False
+)
+post_delete.connect(
+    TokenCache.changed,
+    sender=StaffToken,
+    weak=False
+)
+post_save.connect(
+    TokenCache.changed,
+    sender=EmployeeToken,
+    weak=False
+)
+post_delete.connect(
+    TokenCache.changed,
+    sender=EmployeeToken,
+    weak=False
+)
+post_save.connect(
+    TokenCache.changed,
+    sender=Staff,
+    weak=False
+)
+post_delete.connect(
+    TokenCache.changed,
+    sender=Staff,
+    weak=False
+)
+post_save.connect(
+    TokenCache.changed,
+    sender=Employee,
+    weak=False
+)
+post_delete.connect(
+    TokenCache.changed,
+    sender=Employee,
+    weak=False
+)
@@ -16,5 +16,6 @@ class EmployeeToken(BaseToken):
     APNS_CERTIFICATE = settings.BUSINESS_APNS_CERTIFICATE
 
     class Meta:
+        index_together = ('employee', 'device',)
         verbose_name = _('werknemerstoken')
         verbose_name_plural = _('werknemerstokens')
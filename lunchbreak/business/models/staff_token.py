@@ -16,5 +16,6 @@ class StaffToken(BaseToken):
     APNS_CERTIFICATE = settings.BUSINESS_APNS_CERTIFICATE
 
     class Meta:
+        index_together = ('staff', 'device',)
         verbose_name = _('personeelstoken')
         verbose_name_plural = _('personeelstokens')
@@ -366,6 +366,25 @@ class OrderDetailSerializer(OrderSerializer):
             'group_order',
         )
 
+    def update(self, instance, validated_data):
+        """Save changes of only the status or confirmed total with
+        update_fields, so the order is not cleaned fully, see
+        StatusSignalModel.clean_for_save."""
+        changed = [
+            attr
+            for attr, value in validated_data.items()
+            if getattr(instance, attr) != value
+        ]
+        if not instance.is_fast_path(changed):
+            return super().update(instance, validated_data)
+
+        for attr in changed:
+            setattr(instance, attr, validated_data[attr])
+        instance.save(
+            update_fields=changed
+        )
+        return instance
+
 
 class IngredientGroupSerializer(serializers.ModelSerializer):
 
@@ -0,0 +1,164 @@
+from datetime import timedelta
+
+import mock
+from customers.config import ORDER_STATUS_RECEIVED
+from customers.models import Order, OrderSequence
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from Lunchbreak.utils import process_slot
+from rest_framework import status
+
+from .. import views
+from .testcase import BusinessTestCase
+
+
+class OrderFeedTestCase(BusinessTestCase):
+
+    def place_order(self):
+        return Order.objects.create_with_orderedfood(
+            user=self.user,
+            store=self.store,
+            receipt=timezone.now() + timedelta(days=1),
+            orderedfood=[
+                {
+                    'original': self.food,
+                    'ingredients': [self.deselected_ingredient],
+                    'total': self.food.cost,
+                    'amount': 1
+                }
+            ]
+        )
+
+    def feed(self, cursor=None, view=views.OrderFeedView, **extra):
+        url = '/business/order/feed'
+        data = {'cursor': cursor} if cursor is not None else {}
+        request = self.factory.get(url, data, HTTP_X_VERSION='2.3.0', **extra)
+        return self.authenticate_request(
+            request,
+            view,
+            user=self.owner,
+            token=self.ownertoken
+        )
+
+    def test_changes(self):
+        """Test whether only the orders changed since the cursor are returned."""
+        order = self.place_order()
+        other_order = self.place_order()
+        self.assertGreater(other_order.sequence, order.sequence)
+        self.assertEqual(
+            OrderSequence.current(self.store.id),
+            other_order.sequence
+        )
+
+        response = self.feed()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {o['id'] for o in response.data['orders']},
+            {order.id, other_order.id}
+        )
+        cursor = response.data['cursor']
+        etag = response['ETag']
+
+        response = self.feed(cursor)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['orders'], [])
+        self.assertEqual(response.data['cursor'], cursor)
+
+        response = self.feed(cursor, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        order.status = ORDER_STATUS_RECEIVED
+        order.save()
+
+        response = self.feed(cursor, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [o['id'] for o in response.data['orders']],
+            [order.id]
+        )
+        self.assertGreater(response.data['cursor'], cursor)
+        self.assertNotEqual(response['ETag'], etag)
+
+        # Changing the ordered food changes the order
+        cursor = response.data['cursor']
+        orderedfood = other_order.orderedfood.all().first()
+        orderedfood.comment = 'Changed'
+        orderedfood.save()
+        response = self.feed(cursor)
+        self.assertEqual(
+            [o['id'] for o in response.data['orders']],
+            [other_order.id]
+        )
+
+    def test_queries(self):
+        """Test whether the amount of orders does not affect the queries."""
+        cursor = OrderSequence.current(self.store.id)
+        self.place_order()
+        with CaptureQueriesContext(connection) as context:
+            response = self.feed(cursor)
+        self.assertEqual(len(response.data['orders']), 1)
+        single_queries = len(context)
+
+        cursor = response.data['cursor']
+        for i in range(5):
+            self.place_order()
+        with CaptureQueriesContext(connection) as context:
+            response = self.feed(cursor)
+        self.assertEqual(len(response.data['orders']), 5)
+        self.assertEqual(single_queries, len(context))
+
+    @override_settings(ORDER_LONG_POLL_TIMEOUT=0)
+    def test_long_poll_timeout(self):
+        """Test whether nothing is returned if nothing changed in time."""
+        self.place_order()
+        cursor = OrderSequence.current(self.store.id)
+
+        response = self.feed(cursor, view=views.OrderLongPollView)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['orders'], [])
+        self.assertEqual(response.data['cursor'], cursor)
+
+        response = self.feed(
+            cursor,
+            view=views.OrderLongPollView,
+            HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(ORDER_LONG_POLL_TIMEOUT=5)
+    @mock.patch('Lunchbreak.broker.MemoryBroker.wait')
+    def test_long_poll(self, mock_wait):
+        """Test whether the changes are returned once the sequence changes."""
+        cursor = OrderSequence.current(self.store.id)
+        orders = []
+
+        def place_order(channel, after, timeout):
+            self.assertEqual(channel, OrderSequence.channel(self.store.id))
+            self.assertEqual(after, cursor)
+            orders.append(self.place_order())
+            return orders[-1].sequence
+
+        mock_wait.side_effect = place_order
+
+        response = self.feed(cursor, view=views.OrderLongPollView)
+        self.assertEqual(mock_wait.call_count, 1)
+        self.assertEqual(
+            [o['id'] for o in response.data['orders']],
+            [orders[0].id]
+        )
+        self.assertEqual(response.data['cursor'], orders[0].sequence)
+
+    @override_settings(ORDER_LONG_POLL_TIMEOUT=5, ORDER_LONG_POLL_SLOTS=1)
+    @mock.patch('customers.models.OrderSequence.wait')
+    def test_long_poll_slots(self, mock_wait):
+        """Test whether requests are answered immediately without free slots."""
+        cursor = OrderSequence.current(self.store.id)
+
+        with process_slot(views.OrderLongPollView.SLOT_NAME, 1):
+            response = self.feed(cursor, view=views.OrderLongPollView)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(mock_wait.called)
+
+        response = self.feed(cursor, view=views.OrderLongPollView)
+        self.assertTrue(mock_wait.called)
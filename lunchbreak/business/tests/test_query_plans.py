@@ -0,0 +1,146 @@
+from datetime import timedelta
+from uuid import uuid4
+
+import mock
+from customers import views as customers_views
+from customers.authentication import CustomerAuthentication
+from customers.models import Order, OrderedFood, UserToken
+from django.core.urlresolvers import reverse
+from django.utils import timezone
+from django_sms.models import Message
+from lunch import views as lunch_views
+from lunch.authentication import token_cache
+from lunch.models import Food, HolidayPeriod, Ingredient
+from rest_framework import status
+from webhooks.models import WebhookEvent
+
+from .. import views
+from ..models import EmployeeToken, StaffToken
+from .testcase import BusinessTestCase
+
+
+class QueryPlanTestCase(BusinessTestCase):
+    """Query plans of the endpoints must not scan large tables sequentially.
+
+    See ``LunchbreakTestCase.assertNoSeqScans``.
+    """
+
+    LARGE_MODELS = (
+        Order,
+        OrderedFood,
+        Food,
+        Ingredient,
+        HolidayPeriod,
+        UserToken,
+        EmployeeToken,
+        StaffToken,
+        Message,
+    )
+
+    def setUp(self):
+        super().setUp()
+        Order.objects.create_with_orderedfood(
+            user=self.user,
+            store=self.store,
+            receipt=timezone.now() + timedelta(days=1),
+            orderedfood=[
+                {
+                    'original': self.food,
+                    'total': self.food.cost,
+                    'amount': 1
+                }
+            ]
+        )
+
+    def test_customer_orders(self):
+        request = self.factory.get(reverse('customers:order-list'))
+        with self.assertNoSeqScans(*self.LARGE_MODELS):
+            response = self.authenticate_request(
+                request,
+                customers_views.OrderViewSet,
+                view_actions={
+                    'get': 'list'
+                }
+            )
+            response.render()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_store_orders(self):
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        for order_by in ('receipt', 'placed',):
+            request = self.factory.get(
+                '/business/order',
+                {
+                    'order_by': order_by,
+                    'since': since,
+                }
+            )
+            with self.assertNoSeqScans(*self.LARGE_MODELS):
+                response = self.authenticate_request(
+                    request,
+                    views.OrderView,
+                    user=self.owner,
+                    token=self.ownertoken
+                )
+                response.render()
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_menu_food(self):
+        request = self.factory.get(
+            reverse(
+                'customers:food-menu-list',
+                kwargs={
+                    'menu_id': self.menu.id
+                }
+            )
+        )
+        with self.assertNoSeqScans(*self.LARGE_MODELS):
+            response = self.authenticate_request(
+                request,
+                customers_views.FoodViewSet,
+                view_actions={
+                    'get': 'list'
+                },
+                menu_id=self.menu.id
+            )
+            response.render()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_holiday_periods(self):
+        with self.assertNoSeqScans(*self.LARGE_MODELS):
+            list(
+                lunch_views.StoreHolidayPeriodViewSet._get_queryset(
+                    parent_pk=self.store.id
+                )
+            )
+
+    def test_token_authentication(self):
+        token_cache.clear()
+        request = self.factory.get(
+            '/',
+            HTTP_X_IDENTIFIER='something',
+            HTTP_X_USER=self.user.id,
+            HTTP_X_DEVICE=self.usertoken.device
+        )
+        with self.assertNoSeqScans(*self.LARGE_MODELS):
+            CustomerAuthentication().authenticate(request)
+
+    @mock.patch('django_sms.models.Message.handle_status')
+    def test_messages(self, mock_handle_status):
+        message = Message.objects.create(
+            phone=self.phone,
+            gateway=Message.TWILIO,
+            remote_uuid=uuid4()
+        )
+        event = WebhookEvent(
+            provider=WebhookEvent.TWILIO,
+            payload={
+                'MessageSid': 'SM' + message.remote_uuid.hex,
+                'MessageStatus': Message.DELIVERED,
+            }
+        )
+
+        with self.assertNoSeqScans(*self.LARGE_MODELS):
+            self.assertEqual(self.phone.last_message, message)
+            Message.handle_webhook_event(event)
+        self.assertTrue(mock_handle_status.called)
@@ -151,6 +151,14 @@ urlpatterns = [
         r'^order/?$',
         views.OrderView.as_view()
     ),
+    url(
+        r'^order/feed/?$',
+        views.OrderFeedView.as_view()
+    ),
+    url(
+        r'^order/feed/poll/?$',
+        views.OrderLongPollView.as_view()
+    ),
     url(
         r'^order/(?P<pk>\d+)/?$',
         views.OrderDetailView.as_view()
@@ -1,16 +1,16 @@
 import pendulum
-from customers.config import (ORDER_STATUS_COMPLETED, ORDER_STATUS_PLACED,
-                              ORDER_STATUS_RECEIVED, ORDER_STATUS_STARTED,
-                              ORDER_STATUS_WAITING)
-from customers.models import (ConfirmedOrder, Group, GroupOrder, Order,
-                              OrderedFood)
+from customers.config import (ORDER_STATUS_PLACED, ORDER_STATUS_RECEIVED,
+                              ORDER_STATUS_STARTED, ORDER_STATUS_WAITING)
+from customers.models import (ConfirmedOrder, FoodStatistic, Group,
+                              GroupOrder, OrderedFood, OrderSequence,
+                              OrderStatistic)
 from customers.serializers import (GroupOrderDetailSerializer,
                                    GroupOrderSerializer)
 from django.conf import settings
 from django.core.validators import validate_email
-from django.db.models import Count
 from django.http import Http404
 from django.utils import timezone
+from django.utils.http import parse_etags
 from django_gocardless.models import Merchant as GoCardlessMerchant
 from django_gocardless.serializers import \
     MerchantSerializer as GoCardlessMerchantSerializer
@@ -20,6 +20,7 @@ from lunch.models import (Food, FoodType, HolidayPeriod, Ingredient,
 from lunch.serializers import (FoodTypeSerializer, MenuSerializer,
                                QuantityDetailSerializer)
 from Lunchbreak.exceptions import LunchbreakException
+from Lunchbreak.utils import process_slot
 from Lunchbreak.views import TargettedViewSet
 from payconiq.models import Merchant as PayconiqMerchant
 from rest_framework import generics, mixins, status, viewsets
@@ -30,7 +31,8 @@ from rest_framework.response import Response
 from rest_framework_extensions.mixins import NestedViewSetMixin
 
 from .authentication import EmployeeAuthentication, StaffAuthentication
-from .exceptions import InvalidDatetime, InvalidEmail, InvalidPasswordReset
+from .exceptions import (InvalidCursor, InvalidDatetime, InvalidEmail,
+                         InvalidPasswordReset)
 from .mixins import SafeDeleteModelMixin
 from .models import Employee, Staff
 from .permissions import StoreOwnerOnlyPermission, StoreOwnerPermission
@@ -236,6 +238,9 @@ class FoodViewSet(TargettedViewSet,
     def queryset(self):
         return Food.objects.filter(
             menu__store=self.request.user.staff.store
+        ).select_related(
+            'foodtype',
+            'menu__store',  # Food.menu_snapshot
         )
 
     @property
@@ -251,7 +256,10 @@ class FoodViewSet(TargettedViewSet,
                 menu__store=self.request.user.staff.store
             )
 
-        return result.order_by('-priority', 'name')
+        return result.select_related(
+            'foodtype',
+            'menu__store',  # Food.menu_snapshot
+        ).order_by('-priority', 'name')
 
     @property
     def queryset_popular(self):
@@ -260,13 +268,22 @@ class FoodViewSet(TargettedViewSet,
         if frm is not None:
             to = datetime_request(self.request, arg='to')
             to = to if to is not None else timezone.now()
-            return Food.objects.filter(
+            amounts = FoodStatistic.popular(
+                store_id=self.request.user.staff.store_id,
+                frm=frm,
+                to=to
+            )
+            foods = Food.objects.filter(
                 menu__store_id=self.request.user.staff.store_id,
-                orderedfood__placed_order__receipt__gt=frm,
-                orderedfood__placed_order__receipt__lt=to
-            ).annotate(
-                orderedfood_count=Count('orderedfood')
-            ).order_by('-orderedfood_count')
+                id__in=amounts.keys()
+            )
+            for food in foods:
+                food.orderedfood_count = amounts[food.id]
+            return sorted(
+                foods,
+                key=lambda food: food.orderedfood_count,
+                reverse=True
+            )
         else:
             raise Http404()
 
@@ -412,6 +429,130 @@ class OrderView(generics.ListAPIView):
         return ConfirmedOrder.objects.filter(**filters)
 
 
+class OrderFeedView(generics.GenericAPIView):
+    """Orders of the store that changed since the given cursor.
+
+    Every change of an order, its ordered food or its transaction gives the
+    order the next value of the change sequence of the store, see
+    ``Order.mark_changed``. Without a cursor the orders that still need to be
+    handled are returned. The returned cursor is used for the next request.
+    """
+
+    authentication_classes = (EmployeeAuthentication,)
+    serializer_class = OrderDetailSerializer
+    pagination_class = None
+    limit = 100
+
+    def get_queryset(self):
+        return ConfirmedOrder.objects.filter(
+            store_id=self.request.user.staff.store_id
+        ).select_related(
+            'user__phone',
+            'group_order__group',
+            'transaction',
+            'payment',
+        ).prefetch_related(
+            'orderedfood__ingredients',
+        )
+
+    def get_cursor(self):
+        cursor = self.request.query_params.get('cursor')
+        if cursor is None:
+            return None
+        try:
+            cursor = int(cursor)
+        except ValueError:
+            raise InvalidCursor()
+        if cursor < 0:
+            raise InvalidCursor()
+        return cursor
+
+    def get(self, request, *args, **kwargs):
+        cursor = self.get_cursor()
+        # Read before the orders, orders changing in between are returned
+        # again by the next request.
+        sequence = OrderSequence.current(
+            store_id=request.user.staff.store_id
+        )
+
+        etag = '"{sequence}-{version}"'.format(
+            sequence=sequence,
+            version=request.version
+        )
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED,
+                headers={
+                    'ETag': etag
+                }
+            )
+
+        more = False
+        next_cursor = sequence
+        if cursor is None:
+            orders = self.get_queryset().filter(
+                status__in=AVAILABLE_STATUSES
+            ).order_by(
+                '-placed'
+            )
+        elif cursor >= sequence:
+            orders = []
+        else:
+            orders = list(
+                self.get_queryset().filter(
+                    sequence__gt=cursor
+                ).order_by(
+                    'sequence'
+                )[:self.limit + 1]
+            )
+            if len(orders) > self.limit:
+                more = True
+                orders = orders[:self.limit]
+                next_cursor = orders[-1].sequence
+            elif orders:
+                next_cursor = max(sequence, orders[-1].sequence)
+
+        serializer = self.get_serializer(
+            orders,
+            many=True
+        )
+        return Response(
+            data={
+                'cursor': next_cursor,
+                'more': more,
+                'orders': serializer.data,
+            },
+            headers={
+                'ETag': etag
+            }
+        )
+
+
+class OrderLongPollView(OrderFeedView):
+    """Order feed that holds the request until an order of the store changed
+    since the cursor or ``ORDER_LONG_POLL_TIMEOUT`` seconds passed, see
+    ``OrderSequence.wait``.
+
+    Every held request occupies a whole uwsgi process, at most
+    ``ORDER_LONG_POLL_SLOTS`` requests are held at once. The others are
+    answered immediately like the order feed.
+    """
+
+    SLOT_NAME = 'order-long-poll'
+
+    def get(self, request, *args, **kwargs):
+        cursor = self.get_cursor()
+        if cursor is not None:
+            with process_slot(self.SLOT_NAME, settings.ORDER_LONG_POLL_SLOTS) as claimed:
+                if claimed:
+                    OrderSequence.wait(
+                        store_id=request.user.staff.store_id,
+                        after=cursor,
+                        timeout=settings.ORDER_LONG_POLL_TIMEOUT
+                    )
+        return super().get(request, *args, **kwargs)
+
+
 class OrderDetailView(generics.RetrieveUpdateAPIView):
     authentication_classes = (EmployeeAuthentication,)
     serializer_class = OrderDetailSerializer
@@ -455,28 +596,12 @@ class OrderSpreadView(viewsets.ReadOnlyModelViewSet, generics.ListAPIView):
         if to is None:
             to = timezone.now()
 
-        return Order.objects.raw('''
-            SELECT
-                customers_order.id,
-                COUNT(customers_order.id) as amount,
-                SUM(customers_order.total) as sum,
-                AVG(customers_order.total) as average,
-                EXTRACT({unit} FROM customers_order.receipt) as unit
-            FROM
-                customers_order
-            WHERE
-                customers_order.receipt > %s
-                AND customers_order.receipt < %s
-                AND customers_order.store_id = %s
-                AND customers_order.status = %s
-            GROUP BY
-                customers_order.id,
-                unit
-            ORDER BY
-                unit;
-        '''.format(
-            unit=unit
-        ), [frm, to, store_id, ORDER_STATUS_COMPLETED])
+        return OrderStatistic.spread(
+            store_id=store_id,
+            unit=unit,
+            frm=frm,
+            to=to
+        )
 
 
 class OrderedFoodViewSet(TargettedViewSet,
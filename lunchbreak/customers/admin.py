@@ -1,7 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import Group as DjangoGroup
-from django.contrib.contenttypes.admin import GenericTabularInline
 from django.utils.translation import ugettext as _
 from frontend.templatetags.filters import amount
 from lunch.admin import BaseTokenAdmin
@@ -118,7 +117,7 @@ class GroupAdmin(admin.ModelAdmin):
     members_count.short_description = _('leden')
 
 
-class OrderedFoodInline(GenericTabularInline):
+class OrderedFoodInline(admin.TabularInline):
     model = OrderedFood
     readonly_fields = ('ingredients', 'comment',)
     extra = 0
@@ -190,14 +189,15 @@ class HeartAdmin(admin.ModelAdmin):
 class OrderedFoodAdmin(admin.ModelAdmin):
     list_display = ('original', 'user', 'status', 'cost_display',
                     'amount_display', 'total_display', 'is_original', )
-    search_fields = ('order', 'order__user', 'original',),
+    search_fields = ('placed_order__user__name',
+                     'temporary_order__user__name', 'original__name',)
     list_filter = ('is_original', 'status',)
 
     def get_queryset(self, request):
         return super().get_queryset(request).select_related(
             'original__foodtype',
-        ).prefetch_related(
-            'order__user',
+            'placed_order__user',
+            'temporary_order__user',
         )
 
     def cost_display(self, instance):
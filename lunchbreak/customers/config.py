@@ -60,3 +60,10 @@ PAYMENT_METHODS = (
 )
 
 PAYMENTLINK_COMPLETION_REDIRECT_URL = 'lunchbreak://gocardless/redirectflow/'
+
+STATISTIC_PERIOD_HOUR = 0
+STATISTIC_PERIOD_DAY = 1
+STATISTIC_PERIODS = (
+    (STATISTIC_PERIOD_HOUR, _('Uur')),
+    (STATISTIC_PERIOD_DAY, _('Dag')),
+)
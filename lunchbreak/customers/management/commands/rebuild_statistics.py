@@ -0,0 +1,54 @@
+import pendulum
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import CountedOrder, FoodStatistic, OrderStatistic
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the hourly and daily order and food statistics from the '
+        'completed orders. Without a range every statistic is rebuilt.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--store',
+            type=int,
+            default=None,
+            help='Only rebuild the statistics of the store with this id.'
+        )
+        parser.add_argument(
+            '--from',
+            dest='frm',
+            default=None,
+            help='First day to rebuild, ISO 8601.'
+        )
+        parser.add_argument(
+            '--to',
+            default=None,
+            help='Last day to rebuild, ISO 8601.'
+        )
+
+    def parse(self, value):
+        if value is None:
+            return None
+        try:
+            return pendulum.parse(value)._datetime
+        except ValueError:
+            raise CommandError('Invalid date: {}'.format(value))
+
+    def handle(self, *args, **options):
+        frm = self.parse(options['frm'])
+        to = self.parse(options['to'])
+
+        for model in (CountedOrder, OrderStatistic, FoodStatistic,):
+            model.rebuild(
+                store_id=options['store'],
+                frm=frm,
+                to=to
+            )
+            self.stdout.write(
+                'Rebuilt {name}.'.format(
+                    name=model._meta.verbose_name_plural
+                )
+            )
@@ -1,9 +1,12 @@
+from collections import defaultdict
 from decimal import Decimal
 
 from django.apps import apps
 from django.contrib.auth.base_user import BaseUserManager
-from django.db import models
-from lunch.models import Ingredient
+from django.db import models, transaction
+from django.utils.translation import ugettext as _
+from lunch.exceptions import LinkingError
+from lunch.models import Food, Ingredient
 from payconiq.models import Transaction
 from pendulum import Pendulum
 
@@ -95,58 +98,55 @@ class OrderManager(models.Manager):
 
         Order = apps.get_model('customers.Order')
 
+        if not save:
+            return Order(**kwargs)
+
+        OrderedFood = apps.get_model('customers.OrderedFood')
         try:
-            if not save:
-                instance = Order(**kwargs)
-            elif self.model == Order:
-                instance = self.create(**kwargs)
-            else:
-                instance, created = self.get_or_create(**kwargs)
-                if not created:
-                    instance.orderedfood.all().delete()
+            with transaction.atomic():
+                # Built and validated in memory, nothing is saved yet.
+                orderedfood_list = OrderedFood.objects.assemble(orderedfood)
+
+                if self.model == Order:
+                    instance = self.model(**kwargs)
+                    # The order is validated once with the assembled
+                    # OrderedFood, the status signal is sent when everything
+                    # has been saved.
+                    instance.assembled_orderedfood = orderedfood_list
+                    instance.save(send_status_signal=False)
+                    instance.assembled_orderedfood = None
+                else:
+                    instance, created = self.get_or_create(**kwargs)
+                    if not created:
+                        instance.orderedfood.all().delete()
+
+                OrderedFood.objects.bulk_create_for_order(
+                    order=instance,
+                    orderedfood=orderedfood_list
+                )
+
+                if self.model != Order:
+                    instance.save()
         except Exception:
-            if save and group_order_created and group_order is not None:
+            if group_order_created and group_order is not None:
                 group_order.delete()
             raise
 
-        if save:
-            OrderedFood = apps.get_model('customers.OrderedFood')
-            try:
-                for f in orderedfood:
-                    if isinstance(f, dict):
-                        OrderedFood.objects.create_for_order(
-                            order=instance,
-                            **f
-                        )
-                    elif isinstance(f, OrderedFood):
-                        # Clone the OrderedFood so the TemporaryOrder remains intact.
-                        old_pk = f.pk
-                        f.pk = None
-                        f.order = instance
-                        f.save()
-                        f.ingredients.add(
-                            *Ingredient.objects.filter(
-                                orderedfood__pk=old_pk
-                            )
-                        )
-
-            except Exception:
-                if instance.group_order is not None \
-                        and instance.group_order.orders.count() == 1:
-                    instance.group_order.delete()
-                instance.delete()
-                raise
-
-            instance.save()
-
+        if self.model == Order:
             payment_method = kwargs.get('payment_method')
             if payment_method == PAYMENT_METHOD_PAYCONIQ and create_transaction:
                 instance.transaction = Transaction.start(
                     amount=instance.total,
                     merchant=store.staff.payconiq
                 )
+                # Only the transaction changed, no need to validate again.
+                self.filter(
+                    pk=instance.pk
+                ).update(
+                    transaction=instance.transaction
+                )
 
-            instance.save()
+            instance.send_status_signal()
         return instance
 
 
@@ -219,6 +219,171 @@ class OrderedFoodManager(models.Manager):
 
         return result.filter(or_queries)
 
+    def assemble(self, orderedfood):
+        """Build and validate OrderedFood in memory without saving them.
+
+        All of the food, ingredients and quantities are loaded at once, see
+        ``Food.in_bulk_for_ordering``. The ingredients of the returned
+        OrderedFood are set on ``OrderedFood.assembled_ingredients``, use
+        ``bulk_create_for_order`` to save them.
+
+        Args:
+            orderedfood (list): Dicts with the arguments of
+            ``create_for_order`` or OrderedFood that need to be cloned.
+
+        Returns:
+            list: Unsaved OrderedFood.
+        """
+        clones = [f for f in orderedfood if isinstance(f, self.model)]
+        through = self.model.ingredients.through
+        clone_ingredients = defaultdict(list)
+        for orderedfood_id, ingredient_id in through.objects.filter(
+            orderedfood_id__in=[f.pk for f in clones]
+        ).values_list('orderedfood_id', 'ingredient_id'):
+            clone_ingredients[orderedfood_id].append(ingredient_id)
+
+        food_ids = set()
+        ingredient_ids = set()
+        for f in orderedfood:
+            if isinstance(f, dict):
+                food_ids.add(f['original'].id)
+                for ingredient in f.get('ingredients') or []:
+                    ingredient_ids.add(
+                        ingredient.id if isinstance(ingredient, Ingredient) else ingredient
+                    )
+            elif f.original_id is not None:
+                food_ids.add(f.original_id)
+
+        foods = Food.in_bulk_for_ordering(food_ids)
+        ingredients = Ingredient.objects.select_related(
+            'group'
+        ).in_bulk(ingredient_ids)
+
+        result = []
+        for f in orderedfood:
+            if isinstance(f, dict):
+                f = dict(f)
+                f['original'] = foods.get(f['original'].id, f['original'])
+                if f.get('ingredients') is not None:
+                    selected_ids = [
+                        ingredient.id if isinstance(ingredient, Ingredient) else ingredient
+                        for ingredient in f['ingredients']
+                    ]
+                    # Unknown or deleted ingredients
+                    if not set(selected_ids) <= ingredients.keys():
+                        raise LinkingError(
+                            _('Ingrediënten zijn niet toegelaten voor het gegeven etenswaar.')
+                        )
+                    f['ingredients'] = [
+                        ingredients[ingredient_id]
+                        for ingredient_id in selected_ids
+                    ]
+                instance = self.build_for_order(**f)
+            else:
+                # Clone the OrderedFood so the TemporaryOrder remains intact.
+                instance = self.model(
+                    amount=f.amount,
+                    cost=f.cost,
+                    original=foods.get(f.original_id) or f.original,
+                    is_original=f.is_original,
+                    comment=f.comment,
+                    status=f.status,
+                    total=f.total
+                )
+                instance.assembled_ingredients = clone_ingredients[f.pk]
+            instance.clean_total()
+            result.append(instance)
+        return result
+
+    def build_for_order(self, original, amount, total, ingredients=None, **kwargs):
+        """Build an unsaved OrderedFood, see ``create_for_order``.
+
+        The ingredients are set on ``OrderedFood.assembled_ingredients``.
+        """
+        if not isinstance(amount, Decimal):
+            amount = Decimal(amount).quantize(Decimal('1.' + ('0' * 3)))
+
+        original.foodtype.is_valid_amount(
+            amount=amount,
+            quantity=original.quantity
+        )
+
+        # It's still the original if the ingredients are the same
+        is_original = ingredients is None
+        if not is_original:
+            original_ingredients, deselected_ingredients = original.all_ingredients
+            if set(ingredients) == set(original_ingredients):
+                is_original = True
+
+        if not is_original:
+            original.check_ingredients(
+                ingredients=ingredients
+            )
+            instance = self.model(
+                amount=amount,
+                original=original,
+                cost=self.model.calculate_cost(
+                    ingredients=ingredients,
+                    food=original
+                ),
+                is_original=False,
+                **kwargs
+            )
+            instance.assembled_ingredients = [
+                ingredient.id for ingredient in ingredients
+            ]
+        else:
+            instance = self.model(
+                amount=amount,
+                original=original,
+                cost=original.cost,
+                is_original=True,
+                **kwargs
+            )
+            instance.assembled_ingredients = []
+        return instance
+
+    def bulk_create_for_order(self, order, orderedfood):
+        """Save assembled OrderedFood for a saved order.
+
+        Every OrderedFood is validated against the order before they are all
+        inserted at once together with their ingredients. The order is not
+        saved again, OrderedFood.post_save is not called.
+
+        Args:
+            order: Saved Order or TemporaryOrder.
+            orderedfood (list): OrderedFood returned by ``assemble``.
+
+        Returns:
+            list: Saved OrderedFood.
+        """
+        for f in orderedfood:
+            f.order = order
+            # The original food and order were just loaded, validating them
+            # would query their existence for every OrderedFood.
+            f.full_clean(
+                exclude=[
+                    'original',
+                    'placed_order',
+                    'temporary_order',
+                ]
+            )
+
+        orderedfood = self.bulk_create(orderedfood)
+
+        through = self.model.ingredients.through
+        through.objects.bulk_create([
+            through(
+                orderedfood_id=f.pk,
+                ingredient_id=ingredient_id
+            ) for f in orderedfood
+            for ingredient_id in f.assembled_ingredients
+        ])
+
+        for f in orderedfood:
+            f.send_status_signal(status_changed=False)
+        return orderedfood
+
     def create_for_order(self, original, amount, total, ingredients=None, **kwargs):
         if not isinstance(amount, Decimal):
             amount = Decimal(amount).quantize(Decimal('1.' + ('0' * 3)))
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from lunch.geo import grid_cell
+
+
+def fill_grid_cell(apps, schema_editor):
+    Address = apps.get_model('customers', 'Address')
+    addresses = Address.objects.exclude(
+        models.Q(
+            latitude=None
+        ) | models.Q(
+            longitude=None
+        )
+    ).values_list(
+        'id',
+        'latitude',
+        'longitude',
+    )
+    for address_id, latitude, longitude in addresses:
+        Address.objects.filter(
+            id=address_id
+        ).update(
+            grid_cell=grid_cell(latitude, longitude)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0006_usertoken_identifier_digest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='grid_cell',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, help_text='Rastercel van de coördinaten, zie lunch.geo.grid_cell.', null=True, verbose_name='rastercel'),
+        ),
+        migrations.RunPython(
+            fill_grid_cell,
+            migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lunch', '0005_store_grid_cell'),
+        ('customers', '0007_address_grid_cell'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderSequence',
+            fields=[
+                ('store', models.OneToOneField(help_text='Winkel.', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='order_sequence', serialize=False, to='lunch.Store', verbose_name='winkel')),
+                ('value', models.BigIntegerField(default=0, help_text='Volgnummer van de laatste wijziging van een bestelling.', verbose_name='volgnummer')),
+            ],
+            options={
+                'verbose_name': 'volgnummer bestellingen',
+                'verbose_name_plural': 'volgnummers bestellingen',
+            },
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='sequence',
+            field=models.BigIntegerField(default=0, editable=False, help_text='Volgnummer van de laatste wijziging in de wijzigingen van de bestellingen van de winkel.', verbose_name='volgnummer'),
+        ),
+        migrations.AlterIndexTogether(
+            name='order',
+            index_together=set([('store', 'sequence')]),
+        ),
+        # Number the existing orders of every store by id
+        migrations.RunSQL(
+            '''
+            UPDATE customers_order
+            SET sequence = numbered.sequence
+            FROM (
+                SELECT id, row_number() OVER (PARTITION BY store_id ORDER BY id) AS sequence
+                FROM customers_order
+            ) AS numbered
+            WHERE customers_order.id = numbered.id;
+
+            INSERT INTO customers_ordersequence (store_id, value)
+            SELECT store_id, MAX(sequence)
+            FROM customers_order
+            GROUP BY store_id;
+            ''',
+            migrations.RunSQL.noop
+        ),
+    ]
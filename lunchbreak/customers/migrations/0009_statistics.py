@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+import Lunchbreak.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lunch', '0005_store_grid_cell'),
+        ('customers', '0008_order_sequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FoodStatistic',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.PositiveSmallIntegerField(choices=[(0, 'Uur'), (1, 'Dag')], help_text='Uur of dag.', verbose_name='periode')),
+                ('start', models.DateTimeField(help_text='Begin van het uur of de dag in UTC.', verbose_name='begin')),
+                ('amount', models.PositiveIntegerField(default=0, help_text='Aantal.', verbose_name='aantal')),
+                ('food', models.ForeignKey(help_text='Etenswaar.', on_delete=django.db.models.deletion.CASCADE, to='lunch.Food', verbose_name='etenswaar')),
+                ('store', models.ForeignKey(help_text='Winkel.', on_delete=django.db.models.deletion.CASCADE, to='lunch.Store', verbose_name='winkel')),
+            ],
+            options={
+                'verbose_name': 'etenswaarstatistiek',
+                'verbose_name_plural': 'etenswaarstatistieken',
+            },
+        ),
+        migrations.CreateModel(
+            name='OrderStatistic',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.PositiveSmallIntegerField(choices=[(0, 'Uur'), (1, 'Dag')], help_text='Uur of dag.', verbose_name='periode')),
+                ('start', models.DateTimeField(help_text='Begin van het uur of de dag in UTC.', verbose_name='begin')),
+                ('amount', models.PositiveIntegerField(default=0, help_text='Aantal.', verbose_name='aantal')),
+                ('total', Lunchbreak.fields.MoneyField(default=0, help_text='Som van de totale prijzen van de bestellingen.', verbose_name='totale prijs')),
+                ('store', models.ForeignKey(help_text='Winkel.', on_delete=django.db.models.deletion.CASCADE, to='lunch.Store', verbose_name='winkel')),
+            ],
+            options={
+                'verbose_name': 'bestellingsstatistiek',
+                'verbose_name_plural': 'bestellingsstatistieken',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='orderstatistic',
+            unique_together=set([('store', 'period', 'start')]),
+        ),
+        migrations.AlterUniqueTogether(
+            name='foodstatistic',
+            unique_together=set([('food', 'period', 'start')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='foodstatistic',
+            index_together=set([('store', 'period', 'start')]),
+        ),
+    ]
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('customers', '0009_statistics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderedfood',
+            name='placed_order',
+            field=models.ForeignKey(blank=True, help_text='Geplaatste bestelling.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='orderedfood', to='customers.Order', verbose_name='bestelling'),
+        ),
+        migrations.AddField(
+            model_name='orderedfood',
+            name='temporary_order',
+            field=models.ForeignKey(blank=True, help_text='Tijdelijke bestelling.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='orderedfood', to='customers.TemporaryOrder', verbose_name='tijdelijke bestelling'),
+        ),
+        migrations.AlterField(
+            model_name='orderedfood',
+            name='content_type',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='contenttypes.ContentType'),
+        ),
+        migrations.AlterField(
+            model_name='orderedfood',
+            name='object_id',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        # Move the generic relation to the typed ones, ordered food of which
+        # the order no longer exists is removed.
+        migrations.RunSQL(
+            '''
+            UPDATE customers_orderedfood
+            SET placed_order_id = customers_orderedfood.object_id
+            FROM django_content_type, customers_order
+            WHERE customers_orderedfood.content_type_id = django_content_type.id
+            AND django_content_type.app_label = 'customers'
+            AND django_content_type.model = 'order'
+            AND customers_order.id = customers_orderedfood.object_id;
+
+            UPDATE customers_orderedfood
+            SET temporary_order_id = customers_orderedfood.object_id
+            FROM django_content_type, customers_temporaryorder
+            WHERE customers_orderedfood.content_type_id = django_content_type.id
+            AND django_content_type.app_label = 'customers'
+            AND django_content_type.model = 'temporaryorder'
+            AND customers_temporaryorder.id = customers_orderedfood.object_id;
+
+            DELETE FROM customers_orderedfood_ingredients
+            USING customers_orderedfood
+            WHERE customers_orderedfood_ingredients.orderedfood_id = customers_orderedfood.id
+            AND customers_orderedfood.placed_order_id IS NULL
+            AND customers_orderedfood.temporary_order_id IS NULL;
+
+            DELETE FROM customers_orderedfood
+            WHERE placed_order_id IS NULL
+            AND temporary_order_id IS NULL;
+
+            -- Deferred constraint checks would block altering the table
+            SET CONSTRAINTS ALL IMMEDIATE;
+            SET CONSTRAINTS ALL DEFERRED;
+            ''',
+            '''
+            UPDATE customers_orderedfood
+            SET
+                content_type_id = django_content_type.id,
+                object_id = COALESCE(
+                    customers_orderedfood.placed_order_id,
+                    customers_orderedfood.temporary_order_id
+                )
+            FROM django_content_type
+            WHERE django_content_type.app_label = 'customers'
+            AND django_content_type.model = CASE
+                WHEN customers_orderedfood.placed_order_id IS NOT NULL
+                THEN 'order'
+                ELSE 'temporaryorder'
+            END;
+
+            SET CONSTRAINTS ALL IMMEDIATE;
+            SET CONSTRAINTS ALL DEFERRED;
+            '''
+        ),
+        migrations.RemoveField(
+            model_name='orderedfood',
+            name='content_type',
+        ),
+        migrations.RemoveField(
+            model_name='orderedfood',
+            name='object_id',
+        ),
+        # Ordered food belongs to exactly one order
+        migrations.RunSQL(
+            '''
+            ALTER TABLE customers_orderedfood
+            ADD CONSTRAINT customers_orderedfood_one_order
+            CHECK ((placed_order_id IS NULL) <> (temporary_order_id IS NULL));
+            ''',
+            '''
+            ALTER TABLE customers_orderedfood
+            DROP CONSTRAINT customers_orderedfood_one_order;
+            '''
+        ),
+    ]
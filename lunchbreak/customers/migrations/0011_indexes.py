@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0010_orderedfood_typed_order'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='order',
+            index_together=set([('store', 'sequence'), ('store', 'status', 'receipt'), ('store', 'status', 'placed'), ('user', 'receipt')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='usertoken',
+            index_together=set([('user', 'device')]),
+        ),
+    ]
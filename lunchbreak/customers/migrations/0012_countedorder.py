@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+import Lunchbreak.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0011_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CountedOrder',
+            fields=[
+                ('order', models.OneToOneField(help_text='Bestelling.', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='counted', serialize=False, to='customers.Order', verbose_name='bestelling')),
+                ('receipt', models.DateTimeField(help_text='Tijd van afhalen of levering waarmee geteld werd.', verbose_name='tijd afgave')),
+                ('total', Lunchbreak.fields.MoneyField(default=0, help_text='Totale prijs waarmee geteld werd.', verbose_name='totale prijs')),
+            ],
+            options={
+                'verbose_name': 'getelde bestelling',
+                'verbose_name_plural': 'getelde bestellingen',
+            },
+        ),
+        # The rollups contain every completed order
+        migrations.RunSQL(
+            '''
+            INSERT INTO customers_countedorder (order_id, receipt, total)
+            SELECT id, receipt, total
+            FROM customers_order
+            WHERE status = 5;
+            ''',
+            migrations.RunSQL.noop
+        ),
+    ]
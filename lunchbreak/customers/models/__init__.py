@@ -1,10 +1,15 @@
 from .abstract_order import AbstractOrder  # noqa
+from .abstract_statistic import AbstractStatistic  # noqa
 from .address import Address  # noqa
 from .confirmed_order import ConfirmedOrder  # noqa
+from .counted_order import CountedOrder  # noqa
+from .food_statistic import FoodStatistic  # noqa
 from .group import Group  # noqa
 from .group_order import GroupOrder  # noqa
 from .heart import Heart  # noqa
 from .order import Order  # noqa
+from .order_sequence import OrderSequence  # noqa
+from .order_statistic import OrderStatistic  # noqa
 from .ordered_food import OrderedFood  # noqa
 from .payment_link import PaymentLink  # noqa
 from .temporary_order import TemporaryOrder  # noqa
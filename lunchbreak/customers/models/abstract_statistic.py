@@ -0,0 +1,295 @@
+from datetime import timedelta
+
+from django.db import connection, models, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.translation import ugettext as _
+
+from ..config import (STATISTIC_PERIOD_DAY, STATISTIC_PERIOD_HOUR,
+                      STATISTIC_PERIODS)
+
+PERIOD_NAMES = {
+    STATISTIC_PERIOD_HOUR: 'hour',
+    STATISTIC_PERIOD_DAY: 'day',
+}
+
+
+class AbstractStatistic(models.Model):
+    """Rollup of the completed orders of a store per hour and per day.
+
+    Rollups are incremented when an order is completed and decremented when
+    it no longer is, see ``CountedOrder``. They can be rebuilt from the orders
+    with the ``rebuild_statistics`` command. Hours and days
+    are in UTC, like the time zone of the database connection.
+    """
+
+    class Meta:
+        abstract = True
+
+    store = models.ForeignKey(
+        'lunch.Store',
+        on_delete=models.CASCADE,
+        verbose_name=_('winkel'),
+        help_text=_('Winkel.')
+    )
+    period = models.PositiveSmallIntegerField(
+        choices=STATISTIC_PERIODS,
+        verbose_name=_('periode'),
+        help_text=_('Uur of dag.')
+    )
+    start = models.DateTimeField(
+        verbose_name=_('begin'),
+        help_text=_('Begin van het uur of de dag in UTC.')
+    )
+    amount = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('aantal'),
+        help_text=_('Aantal.')
+    )
+
+    # Columns identifying a rollup, used by upsert.
+    conflict_columns = ()
+
+    @staticmethod
+    def truncate(moment, period):
+        """Start of the hour or day containing the given moment."""
+        moment = moment.astimezone(timezone.utc).replace(
+            minute=0,
+            second=0,
+            microsecond=0
+        )
+        if period == STATISTIC_PERIOD_DAY:
+            moment = moment.replace(hour=0)
+        return moment
+
+    @classmethod
+    def split(cls, frm, to, days=True):
+        """Split the range between the given moments into rollups and edges.
+
+        Complete hours and, if days is True, complete days are read from the
+        rollups. The partial hours at the edges of the range are read from the
+        orders.
+
+        Args:
+            frm (datetime): Exclusive start.
+            to (datetime): Exclusive end.
+            days (bool): Whether daily rollups can be used.
+
+        Returns:
+            tuple: List of ``(period, start, end)`` rollups, of which the start
+            is in ``[start, end)``, and a list of ``(lower, upper, inclusive)``
+            edges of which the receipt is in ``(lower, upper)`` or
+            ``[lower, upper)`` if inclusive.
+        """
+        hour = timedelta(hours=1)
+        hour_start = cls.truncate(frm, STATISTIC_PERIOD_HOUR) + hour
+        hour_end = cls.truncate(to, STATISTIC_PERIOD_HOUR)
+        if hour_start >= hour_end:
+            return [], [(frm, to, False,)]
+
+        rollups = []
+        day_start = cls.truncate(hour_start, STATISTIC_PERIOD_DAY)
+        if day_start < hour_start:
+            day_start += timedelta(days=1)
+        day_end = cls.truncate(hour_end, STATISTIC_PERIOD_DAY)
+        if days and day_start < day_end:
+            rollups.append((STATISTIC_PERIOD_DAY, day_start, day_end,))
+            hours = [(hour_start, day_start,), (day_end, hour_end,)]
+        else:
+            hours = [(hour_start, hour_end,)]
+        for start, end in hours:
+            if start < end:
+                rollups.append((STATISTIC_PERIOD_HOUR, start, end,))
+
+        edges = [
+            (frm, hour_start, False,),
+            (hour_end, to, True,),
+        ]
+        return rollups, edges
+
+    @staticmethod
+    def rollups_sql(rollups, table):
+        """SQL condition and parameters matching the rollups of ``split``."""
+        conditions = []
+        params = []
+        for period, start, end in rollups:
+            conditions.append(
+                '({table}.period = %s AND {table}.start >= %s AND {table}.start < %s)'.format(
+                    table=table
+                )
+            )
+            params.extend([period, start, end])
+        return ' OR '.join(conditions) or 'FALSE', params
+
+    @staticmethod
+    def edges_sql(edges, column):
+        """SQL condition and parameters matching the edges of ``split``."""
+        conditions = []
+        params = []
+        for lower, upper, inclusive in edges:
+            conditions.append(
+                '({column} {operator} %s AND {column} < %s)'.format(
+                    column=column,
+                    operator='>=' if inclusive else '>'
+                )
+            )
+            params.extend([lower, upper])
+        return ' OR '.join(conditions) or 'FALSE', params
+
+    @staticmethod
+    def edges_q(edges, field):
+        """Q object matching the edges of ``split``."""
+        result = None
+        for lower, upper, inclusive in edges:
+            edge = models.Q(
+                **{
+                    field + ('__gte' if inclusive else '__gt'): lower,
+                    field + '__lt': upper,
+                }
+            )
+            result = edge if result is None else result | edge
+        return result
+
+    @classmethod
+    def upsert(cls, rows):
+        """Add the given rows to their rollups, creating them if needed.
+
+        Args:
+            rows (list): Dicts with the values of the columns.
+        """
+        if not rows:
+            return
+
+        columns = list(rows[0].keys())
+        table = cls._meta.db_table
+        counters = [
+            column for column in columns
+            if column not in cls.conflict_columns and column != 'store_id'
+        ]
+        sql = '''
+            INSERT INTO {table} ({columns})
+            VALUES ({values})
+            ON CONFLICT ({conflict}) DO UPDATE
+            SET {counters}
+        '''.format(
+            table=table,
+            columns=', '.join(columns),
+            values=', '.join(['%s'] * len(columns)),
+            conflict=', '.join(cls.conflict_columns),
+            counters=', '.join(
+                '{column} = {table}.{column} + EXCLUDED.{column}'.format(
+                    table=table,
+                    column=column
+                ) for column in counters
+            )
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                sql,
+                [[row[column] for column in columns] for row in rows]
+            )
+
+    @classmethod
+    def subtract(cls, rows):
+        """Subtract the given rows from their rollups, the opposite of ``upsert``.
+
+        Rollups that no longer count anything are removed, like they would be
+        after a rebuild.
+
+        Args:
+            rows (list): Dicts with the values of the columns.
+        """
+        for row in rows:
+            rollups = cls.objects.filter(
+                **{
+                    column: row[column]
+                    for column in cls.conflict_columns
+                }
+            )
+            rollups.update(
+                **{
+                    column: F(column) - value
+                    for column, value in row.items()
+                    if column not in cls.conflict_columns and column != 'store_id'
+                }
+            )
+            rollups.filter(
+                amount__lte=0
+            ).delete()
+
+    @classmethod
+    def add_order(cls, order, counted):
+        """Add the order to the rollups, see ``CountedOrder``."""
+        cls.upsert(cls.order_rows(order, counted))
+
+    @classmethod
+    def remove_order(cls, order, counted):
+        """Subtract the order from the rollups, see ``CountedOrder``."""
+        cls.subtract(cls.order_rows(order, counted))
+
+    @classmethod
+    def order_rows(cls, order, counted):
+        """Rows of the rollups the order is part of.
+
+        Args:
+            order (Order): Completed order.
+            counted (CountedOrder): Values the order is counted with.
+
+        Returns:
+            list: Dicts with the values of the columns.
+        """
+        raise NotImplementedError()
+
+    @classmethod
+    def rebuild(cls, store_id=None, frm=None, to=None):
+        """Rebuild the rollups of the given days from the orders.
+
+        Args:
+            store_id (int, optional): Only rebuild the rollups of this store.
+            frm (datetime, optional): Rebuild starting from the day of this
+            moment.
+            to (datetime, optional): Rebuild until the end of the day of this
+            moment.
+        """
+        conditions = []
+        params = []
+        if store_id is not None:
+            conditions.append('{order}.store_id = %s')
+            params.append(store_id)
+        if frm is not None:
+            frm = cls.truncate(frm, STATISTIC_PERIOD_DAY)
+            conditions.append('{order}.receipt >= %s')
+            params.append(frm)
+        if to is not None:
+            to = cls.truncate(to, STATISTIC_PERIOD_DAY) + timedelta(days=1)
+            conditions.append('{order}.receipt < %s')
+            params.append(to)
+
+        rollups = cls.objects.all()
+        if store_id is not None:
+            rollups = rollups.filter(store_id=store_id)
+        if frm is not None:
+            rollups = rollups.filter(start__gte=frm)
+        if to is not None:
+            rollups = rollups.filter(start__lt=to)
+
+        with transaction.atomic():
+            rollups.delete()
+            with connection.cursor() as cursor:
+                for period, name in PERIOD_NAMES.items():
+                    sql, sql_params = cls.rebuild_sql(period, name, conditions)
+                    cursor.execute(sql, sql_params + params)
+
+    @classmethod
+    def rebuild_sql(cls, period, name, conditions):
+        """SQL and its leading parameters inserting the rollups of a period.
+
+        Args:
+            period (int): Period of the rollups.
+            name (str): Name of the period for ``date_trunc``.
+            conditions (list): Extra conditions on ``{order}``.
+
+        Returns:
+            tuple: SQL and parameters.
+        """
+        raise NotImplementedError()
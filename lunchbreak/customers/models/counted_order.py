@@ -0,0 +1,144 @@
+from datetime import timedelta
+
+from django.db import models, transaction
+from django.utils.translation import ugettext as _
+from Lunchbreak.fields import MoneyField
+
+from ..config import ORDER_STATUS_COMPLETED, STATISTIC_PERIOD_DAY
+from .food_statistic import FoodStatistic
+from .order_statistic import OrderStatistic
+
+
+class CountedOrder(models.Model):
+    """Completed order that is part of the statistics.
+
+    An order is only added to the statistics once, even if it is completed
+    again. It is subtracted with the values it was added with when it is no
+    longer completed or deleted.
+    """
+
+    class Meta:
+        verbose_name = _('getelde bestelling')
+        verbose_name_plural = _('getelde bestellingen')
+
+    def __str__(self):
+        return str(self.order_id)
+
+    order = models.OneToOneField(
+        'Order',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='counted',
+        verbose_name=_('bestelling'),
+        help_text=_('Bestelling.')
+    )
+    receipt = models.DateTimeField(
+        verbose_name=_('tijd afgave'),
+        help_text=_('Tijd van afhalen of levering waarmee geteld werd.')
+    )
+    total = MoneyField(
+        default=0,
+        verbose_name=_('totale prijs'),
+        help_text=_('Totale prijs waarmee geteld werd.')
+    )
+
+    statistics = (OrderStatistic, FoodStatistic,)
+
+    @classmethod
+    def count(cls, order):
+        """Add the completed order to the statistics unless it already is."""
+        with transaction.atomic():
+            counted, created = cls.objects.get_or_create(
+                order=order,
+                defaults={
+                    'receipt': order.receipt,
+                    'total': order.total,
+                }
+            )
+            if created:
+                for statistic in cls.statistics:
+                    statistic.add_order(order, counted)
+
+    @classmethod
+    def uncount(cls, order):
+        """Subtract the order from the statistics if it is part of them."""
+        with transaction.atomic():
+            counted = cls.objects.select_for_update().filter(
+                order_id=order.pk
+            ).first()
+            if counted is None:
+                return
+
+            for statistic in cls.statistics:
+                statistic.remove_order(order, counted)
+            counted.delete()
+
+    @classmethod
+    def sync(cls, orders):
+        """Count or subtract the orders of which the status was updated
+        without saving them, like ``GroupOrder.save`` does.
+
+        Args:
+            orders (QuerySet): Orders.
+        """
+        completed = orders.filter(
+            status=ORDER_STATUS_COMPLETED,
+            counted__isnull=True
+        )
+        for order in completed:
+            cls.count(order)
+
+        uncompleted = orders.exclude(
+            status=ORDER_STATUS_COMPLETED
+        ).filter(
+            counted__isnull=False
+        )
+        for order in uncompleted:
+            cls.uncount(order)
+
+    @classmethod
+    def rebuild(cls, store_id=None, frm=None, to=None):
+        """Count the completed orders of the given days again, like the
+        rollups, see ``AbstractStatistic.rebuild``."""
+        from .order import Order
+
+        counted = cls.objects.all()
+        orders = Order.objects.filter(
+            status=ORDER_STATUS_COMPLETED
+        )
+        if store_id is not None:
+            counted = counted.filter(order__store_id=store_id)
+            orders = orders.filter(store_id=store_id)
+        if frm is not None:
+            frm = OrderStatistic.truncate(frm, STATISTIC_PERIOD_DAY)
+            counted = counted.filter(receipt__gte=frm)
+            orders = orders.filter(receipt__gte=frm)
+        if to is not None:
+            to = OrderStatistic.truncate(to, STATISTIC_PERIOD_DAY) + timedelta(days=1)
+            counted = counted.filter(receipt__lt=to)
+            orders = orders.filter(receipt__lt=to)
+
+        with transaction.atomic():
+            cls.objects.filter(
+                models.Q(pk__in=counted.values('pk')) |
+                models.Q(order__in=orders)
+            ).delete()
+            cls.objects.bulk_create([
+                cls(
+                    order_id=order_id,
+                    receipt=receipt,
+                    total=total
+                ) for order_id, receipt, total in orders.values_list(
+                    'id',
+                    'receipt',
+                    'total'
+                )
+            ])
+
+    @staticmethod
+    def order_completed(sender, order, **kwargs):
+        CountedOrder.count(order)
+
+    @staticmethod
+    def order_deleted(sender, instance, **kwargs):
+        CountedOrder.uncount(instance)
@@ -0,0 +1,164 @@
+from collections import Counter
+
+from django.db import models
+from django.db.models import Count, Sum
+from django.utils.translation import ugettext as _
+
+from ..config import ORDER_STATUS_COMPLETED
+from .abstract_statistic import PERIOD_NAMES, AbstractStatistic
+
+
+class FoodStatistic(AbstractStatistic):
+
+    class Meta:
+        unique_together = ('food', 'period', 'start',)
+        index_together = ('store', 'period', 'start',)
+        verbose_name = _('etenswaarstatistiek')
+        verbose_name_plural = _('etenswaarstatistieken')
+
+    def __str__(self):
+        return '{food}, {start}: {amount}'.format(
+            food=self.food,
+            start=self.start,
+            amount=self.amount
+        )
+
+    food = models.ForeignKey(
+        'lunch.Food',
+        on_delete=models.CASCADE,
+        verbose_name=_('etenswaar'),
+        help_text=_('Etenswaar.')
+    )
+
+    conflict_columns = ('food_id', 'period', 'start',)
+
+    @classmethod
+    def order_rows(cls, order, counted):
+        """Rows of the order counted with the given values, see ``CountedOrder``."""
+        amounts = Counter(
+            order.orderedfood.filter(
+                original__isnull=False
+            ).values_list(
+                'original_id',
+                flat=True
+            )
+        )
+        return [
+            {
+                'store_id': order.store_id,
+                'food_id': food_id,
+                'period': period,
+                'start': cls.truncate(counted.receipt, period),
+                'amount': amount,
+            } for food_id, amount in amounts.items()
+            for period in PERIOD_NAMES
+        ]
+
+    @classmethod
+    def rebuild_sql(cls, period, name, conditions):
+        from .order import Order
+        from .ordered_food import OrderedFood
+
+        order = Order._meta.db_table
+        orderedfood = OrderedFood._meta.db_table
+        sql = '''
+            INSERT INTO {table} (store_id, food_id, period, start, amount)
+            SELECT
+                {order}.store_id,
+                {orderedfood}.original_id,
+                %s,
+                date_trunc(%s, {order}.receipt),
+                COUNT({orderedfood}.id)
+            FROM
+                {orderedfood}
+                INNER JOIN {order}
+                ON {orderedfood}.placed_order_id = {order}.id
+            WHERE
+                {conditions}
+            GROUP BY
+                1,
+                2,
+                4;
+        '''.format(
+            table=cls._meta.db_table,
+            order=order,
+            orderedfood=orderedfood,
+            conditions=' AND '.join(
+                [
+                    '{order}.status = %s',
+                    '{orderedfood}.original_id IS NOT NULL',
+                ] + conditions
+            ).format(
+                order=order,
+                orderedfood=orderedfood
+            )
+        )
+        return sql, [
+            period,
+            name,
+            ORDER_STATUS_COMPLETED,
+        ]
+
+    @classmethod
+    def popular(cls, store_id, frm, to):
+        """Amount of completed ordered food per food of the given store.
+
+        Complete days and hours are read from the rollups, the partial hours
+        at the edges of the range from the ordered food, see ``split``.
+
+        Args:
+            store_id (int): Store id.
+            frm (datetime): Exclusive start of the receipt.
+            to (datetime): Exclusive end of the receipt.
+
+        Returns:
+            Counter: Food ids mapped to their amount.
+        """
+        from .ordered_food import OrderedFood
+
+        rollups, edges = cls.split(frm, to)
+        result = Counter()
+
+        rollups_q = None
+        for period, start, end in rollups:
+            rollup_q = models.Q(
+                period=period,
+                start__gte=start,
+                start__lt=end
+            )
+            rollups_q = rollup_q if rollups_q is None else rollups_q | rollup_q
+        if rollups_q is not None:
+            result.update(
+                dict(
+                    cls.objects.filter(
+                        rollups_q,
+                        store_id=store_id
+                    ).values(
+                        'food_id'
+                    ).annotate(
+                        amount_sum=Sum('amount')
+                    ).values_list(
+                        'food_id',
+                        'amount_sum'
+                    )
+                )
+            )
+
+        result.update(
+            dict(
+                OrderedFood.objects.filter(
+                    cls.edges_q(edges, 'placed_order__receipt'),
+                    placed_order__store_id=store_id,
+                    placed_order__status=ORDER_STATUS_COMPLETED,
+                    original__isnull=False
+                ).values(
+                    'original_id'
+                ).annotate(
+                    amount=Count('id')
+                ).values_list(
+                    'original_id',
+                    'amount'
+                )
+            )
+        )
+        return result
@@ -9,6 +9,7 @@ from pendulum import Pendulum
 
 from ..config import GROUP_ORDER_STATUSES, ORDER_STATUS_PLACED
 from ..tasks import send_group_order_email
+from .counted_order import CountedOrder
 
 
 class GroupOrder(StatusSignalModel):
@@ -102,11 +103,13 @@ class GroupOrder(StatusSignalModel):
                 self._paid_total += order.total
 
     def save(self, *args, **kwargs):
-        self.full_clean()
+        self.clean_for_save(kwargs.get('update_fields'))
         super().save(*args, **kwargs)
         self.orders.update(
             status=self.status
         )
+        # The update does not send the status signals of the orders
+        CountedOrder.sync(self.orders.all())
 
     @classmethod
     def created(cls, sender, group_order, **kwargs):
@@ -1,9 +1,8 @@
 from decimal import Decimal
 
 from business.models import Staff
-from django.contrib.contenttypes.fields import GenericRelation
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.translation import ugettext as _
@@ -27,6 +26,7 @@ from ..config import (ORDER_STATUS_COMPLETED, ORDER_STATUS_DENIED,
 from ..exceptions import (CashDisabled, NoPaymentLink, OnlinePaymentRequired,
                           PaymentLinkNotConfirmed, PreorderTimeExceeded)
 from .abstract_order import AbstractOrder
+from .counted_order import CountedOrder
 from .group_order import GroupOrder
 from .payment_link import PaymentLink
 
@@ -34,9 +34,18 @@ from .payment_link import PaymentLink
 class Order(StatusSignalModel, AbstractOrder):
 
     class Meta:
+        index_together = (
+            ('store', 'sequence',),
+            ('store', 'status', 'receipt',),
+            ('store', 'status', 'placed',),
+            ('user', 'receipt',),
+        )
         verbose_name = _('bestelling')
         verbose_name_plural = _('bestellingen')
 
+    FIELDS_TO_CHECK = ('status', 'receipt',)
+    FAST_PATH_FIELDS = ('status', 'total_confirmed',)
+
     def __str__(self):
         return _('%(user)s, %(store)s op %(receipt)s') % {
             'user': self.user.name,
@@ -113,12 +122,6 @@ class Order(StatusSignalModel, AbstractOrder):
         verbose_name=_('leveringsadres'),
         help_text=_('Leveringsadres.')
     )
-    orderedfood = GenericRelation(
-        'OrderedFood',
-        related_query_name='placed_order',
-        verbose_name=_('bestelde etenswaren'),
-        help_text=_('Bestelde etenswaren.')
-    )
     group_order = models.ForeignKey(
         'GroupOrder',
         on_delete=models.SET_NULL,
@@ -134,6 +137,20 @@ class Order(StatusSignalModel, AbstractOrder):
         null=True,
         blank=True
     )
+    sequence = models.BigIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('volgnummer'),
+        help_text=_(
+            'Volgnummer van de laatste wijziging in de wijzigingen van de '
+            'bestellingen van de winkel.'
+        )
+    )
+
+    # OrderedFood built in memory while placing the order, they are used
+    # instead of the saved OrderedFood until the order is saved.
+    # See OrderManager.create_with_orderedfood.
+    assembled_orderedfood = None
 
     @cached_property
     def get_placed_display(self):
@@ -161,7 +178,9 @@ class Order(StatusSignalModel, AbstractOrder):
         """Total without discount"""
         if self.discount == Decimal(100):
             total = 0
-            orderedfood = self.orderedfood.all()
+            orderedfood = self.assembled_orderedfood \
+                if self.assembled_orderedfood is not None \
+                else self.orderedfood.all()
             for f in orderedfood:
                 total += f.total
             return total
@@ -202,8 +221,16 @@ class Order(StatusSignalModel, AbstractOrder):
         return self.payment_method == PAYMENT_METHOD_PAYCONIQ
 
     def save(self, *args, **kwargs):
-        self.full_clean()
+        update_fields = kwargs.get('update_fields')
+        self.clean_for_save(update_fields)
+        # Completed orders are counted in the statistics
+        uncompleted = self.pk is not None \
+            and self.status != ORDER_STATUS_COMPLETED \
+            and (update_fields is None or 'status' in update_fields) \
+            and 'status' in self.get_dirty_fields()
         super(Order, self).save(*args, **kwargs)
+        if uncompleted:
+            CountedOrder.uncount(self)
 
     def delete(self, *args, **kwargs):
         super(Order, self).delete(*args, **kwargs)
@@ -212,17 +239,18 @@ class Order(StatusSignalModel, AbstractOrder):
     def update_hard_delete(self):
         """Update whether the orderedfood can be deleted.
 
-        Calls all of the linked OrderedFood's update_hard_delete methods.
+        Calls all of the linked OrderedFood's update_hard_delete methods, food
+        shared by several of them is checked once.
         """
         orderedfood_list = self.orderedfood.select_related(
             'original',
-        ).prefetch_related(
-            'ingredients',
-            'order',
         ).all()
 
+        checked_food = set()
         for orderedfood in orderedfood_list:
-            orderedfood.update_hard_delete()
+            orderedfood.update_hard_delete(
+                checked_food=checked_food
+            )
 
     def clean_placed(self):
         if self.placed is None:
@@ -243,11 +271,17 @@ class Order(StatusSignalModel, AbstractOrder):
                 and self.group_order.status != self.status:
             # This will also change the status on all of the orders
             self.group_order.status = ORDER_STATUS_STARTED
-            self.group_order.save()
+            self.group_order.save(
+                update_fields=[
+                    'status',
+                ]
+            )
 
     def clean_total(self):
         self.total = 0
-        orderedfood = self.orderedfood.all()
+        orderedfood = self.assembled_orderedfood \
+            if self.assembled_orderedfood is not None \
+            else self.orderedfood.all()
         for f in orderedfood:
             self.total += f.total
 
@@ -408,6 +442,64 @@ class Order(StatusSignalModel, AbstractOrder):
             )
             self.save()
 
+    @classmethod
+    def mark_changed(cls, **filters):
+        """Give the matching orders the next values of the change sequences
+        of their stores, see ``OrderSequence``.
+
+        Args:
+            **filters: Filters of the orders.
+
+        Returns:
+            dict: Order ids mapped to their new sequence.
+        """
+        from .order_sequence import OrderSequence
+
+        result = {}
+        with transaction.atomic():
+            # Ordered by store to lock the sequences in the same order
+            orders = cls.objects.filter(
+                **filters
+            ).order_by(
+                'store_id',
+                'id',
+            ).values_list(
+                'id',
+                'store_id',
+            )
+            for order_id, store_id in orders:
+                result[order_id] = OrderSequence.next(store_id)
+                cls.objects.filter(
+                    id=order_id
+                ).update(
+                    sequence=result[order_id]
+                )
+        return result
+
+    @staticmethod
+    def changed(sender, instance, raw=False, **kwargs):
+        """Mark the order of a changed order, ordered food or transaction as
+        changed, see ``Order.mark_changed``."""
+        from .ordered_food import OrderedFood
+
+        if raw:
+            return
+
+        if isinstance(instance, Order):
+            sequences = Order.mark_changed(
+                id=instance.id
+            )
+            instance.sequence = sequences.get(instance.id, instance.sequence)
+        elif isinstance(instance, OrderedFood):
+            if instance.placed_order_id is not None:
+                Order.mark_changed(
+                    id=instance.placed_order_id
+                )
+        else:
+            Order.mark_changed(
+                transaction_id=instance.pk
+            )
+
     @classmethod
     def created(cls, sender, order, **kwargs):
         Staff.objects.filter(
@@ -455,7 +547,11 @@ class Order(StatusSignalModel, AbstractOrder):
             transaction=transaction
         )
         order.status = ORDER_STATUS_DENIED
-        order.save()
+        order.save(
+            update_fields=[
+                'status',
+            ]
+        )
 
     @classmethod
     def transaction_timedout(cls, sender, transaction, **kwargs):
@@ -0,0 +1,135 @@
+import time
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.utils.translation import ugettext as _
+from Lunchbreak.broker import get_broker
+
+
+class OrderSequence(models.Model):
+    """Change sequence of the orders of a store.
+
+    The value is incremented whenever an order of the store changes, see
+    ``Order.mark_changed``. It is kept out of ``Store`` so saving a store never
+    writes an outdated value. New values are published to the broker once
+    they are committed, see ``OrderSequence.wait``.
+    """
+
+    CHANNEL = 'orders.{store_id}'
+
+    class Meta:
+        verbose_name = _('volgnummer bestellingen')
+        verbose_name_plural = _('volgnummers bestellingen')
+
+    def __str__(self):
+        return '{store}: {value}'.format(
+            store=self.store,
+            value=self.value
+        )
+
+    store = models.OneToOneField(
+        'lunch.Store',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='order_sequence',
+        verbose_name=_('winkel'),
+        help_text=_('Winkel.')
+    )
+    value = models.BigIntegerField(
+        default=0,
+        verbose_name=_('volgnummer'),
+        help_text=_('Volgnummer van de laatste wijziging van een bestelling.')
+    )
+
+    @classmethod
+    def channel(cls, store_id):
+        return cls.CHANNEL.format(
+            store_id=store_id
+        )
+
+    @classmethod
+    def next(cls, store_id):
+        """Increment the sequence of the given store.
+
+        The row of the sequence stays locked until the current transaction
+        ends, changes of the orders of a store are therefore committed in the
+        order of their sequence.
+
+        Args:
+            store_id (int): Store id.
+
+        Returns:
+            int: Incremented value.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                '''
+                INSERT INTO {table} (store_id, value)
+                VALUES (%s, 1)
+                ON CONFLICT (store_id) DO UPDATE
+                SET value = {table}.value + 1
+                RETURNING value
+                '''.format(
+                    table=cls._meta.db_table
+                ),
+                [store_id]
+            )
+            value = cursor.fetchone()[0]
+
+        transaction.on_commit(
+            lambda: get_broker().publish(cls.channel(store_id), value)
+        )
+        return value
+
+    @classmethod
+    def current(cls, store_id):
+        """Current value of the sequence of the given store.
+
+        Args:
+            store_id (int): Store id.
+
+        Returns:
+            int: Current value, 0 if no order of the store changed yet.
+        """
+        value = cls.objects.filter(
+            store_id=store_id
+        ).values_list(
+            'value',
+            flat=True
+        ).first()
+        return value if value is not None else 0
+
+    @classmethod
+    def wait(cls, store_id, after, timeout):
+        """Wait until the sequence of the given store exceeds the given value.
+
+        Changes in this process wake up the waiting request through the
+        broker. Changes in other processes are noticed by reading the sequence
+        every ``ORDER_LONG_POLL_INTERVAL`` seconds. Outside of a transaction
+        the database connection is closed while waiting, so waiting requests
+        do not hold on to connections.
+
+        Args:
+            store_id (int): Store id.
+            after (int): Value known by the client.
+            timeout (float): Maximum seconds to wait.
+
+        Returns:
+            int: Current value of the sequence.
+        """
+        deadline = time.monotonic() + timeout
+        published = after
+        value = cls.current(store_id)
+        while value <= after:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if not connection.in_atomic_block:
+                connection.close()
+            published = get_broker().wait(
+                channel=cls.channel(store_id),
+                after=published,
+                timeout=min(remaining, settings.ORDER_LONG_POLL_INTERVAL)
+            ) or published
+            value = cls.current(store_id)
+        return value
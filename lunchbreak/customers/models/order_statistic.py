@@ -0,0 +1,161 @@
+from collections import defaultdict
+
+from django.db import connection
+from django.utils.translation import ugettext as _
+from Lunchbreak.fields import MoneyField
+
+from ..config import ORDER_STATUS_COMPLETED
+from .abstract_statistic import PERIOD_NAMES, AbstractStatistic
+
+
+class OrderStatistic(AbstractStatistic):
+
+    class Meta:
+        unique_together = ('store', 'period', 'start',)
+        verbose_name = _('bestellingsstatistiek')
+        verbose_name_plural = _('bestellingsstatistieken')
+
+    def __str__(self):
+        return '{store}, {start}: {amount}'.format(
+            store=self.store,
+            start=self.start,
+            amount=self.amount
+        )
+
+    total = MoneyField(
+        default=0,
+        verbose_name=_('totale prijs'),
+        help_text=_('Som van de totale prijzen van de bestellingen.')
+    )
+
+    conflict_columns = ('store_id', 'period', 'start',)
+
+    @classmethod
+    def order_rows(cls, order, counted):
+        """Rows of the order counted with the given values, see ``CountedOrder``."""
+        return [
+            {
+                'store_id': order.store_id,
+                'period': period,
+                'start': cls.truncate(counted.receipt, period),
+                'amount': 1,
+                'total': counted.total,
+            } for period in PERIOD_NAMES
+        ]
+
+    @classmethod
+    def rebuild_sql(cls, period, name, conditions):
+        from .order import Order
+
+        order = Order._meta.db_table
+        sql = '''
+            INSERT INTO {table} (store_id, period, start, amount, total)
+            SELECT
+                {order}.store_id,
+                %s,
+                date_trunc(%s, {order}.receipt),
+                COUNT({order}.id),
+                SUM({order}.total)
+            FROM
+                {order}
+            WHERE
+                {conditions}
+            GROUP BY
+                1,
+                3;
+        '''.format(
+            table=cls._meta.db_table,
+            order=order,
+            conditions=' AND '.join(
+                ['{order}.status = %s'] + conditions
+            ).format(
+                order=order
+            )
+        )
+        return sql, [period, name, ORDER_STATUS_COMPLETED]
+
+    @classmethod
+    def spread(cls, store_id, unit, frm, to):
+        """Amount, sum and average of the completed orders of the given store
+        per unit of their receipt.
+
+        Complete hours and days are read from the rollups, the partial hours
+        at the edges of the range from the orders, see ``split``.
+
+        Args:
+            store_id (int): Store id.
+            unit (str): Field of ``EXTRACT``, assumed to be safe.
+            frm (datetime): Exclusive start of the receipt.
+            to (datetime): Exclusive end of the receipt.
+
+        Returns:
+            list: Dicts with the amount, sum, average and unit ordered by unit.
+        """
+        from .order import Order
+
+        rollups, edges = cls.split(
+            frm,
+            to,
+            # The hour of the day is lost in daily rollups
+            days=unit != 'hour'
+        )
+        table = cls._meta.db_table
+        order = Order._meta.db_table
+        rollups_condition, rollups_params = cls.rollups_sql(rollups, table)
+        edges_condition, edges_params = cls.edges_sql(
+            edges,
+            '{order}.receipt'.format(
+                order=order
+            )
+        )
+
+        result = defaultdict(lambda: [0, 0])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                '''
+                SELECT
+                    EXTRACT({unit} FROM {table}.start) AS unit,
+                    SUM({table}.amount),
+                    SUM({table}.total)
+                FROM
+                    {table}
+                WHERE
+                    {table}.store_id = %s
+                    AND ({condition})
+                GROUP BY
+                    unit
+                UNION ALL
+                SELECT
+                    EXTRACT({unit} FROM {order}.receipt) AS unit,
+                    COUNT({order}.id),
+                    SUM({order}.total)
+                FROM
+                    {order}
+                WHERE
+                    {order}.store_id = %s
+                    AND {order}.status = %s
+                    AND ({edges})
+                GROUP BY
+                    unit;
+                '''.format(
+                    unit=unit,
+                    table=table,
+                    order=order,
+                    condition=rollups_condition,
+                    edges=edges_condition
+                ),
+                [store_id] + rollups_params + [store_id, ORDER_STATUS_COMPLETED] + edges_params
+            )
+            for unit_value, amount, total in cursor.fetchall():
+                result[unit_value][0] += amount
+                result[unit_value][1] += total
+
+        return [
+            {
+                'unit': unit_value,
+                'amount': amount,
+                'sum': total,
+                'average': total / amount,
+            } for unit_value, (amount, total) in sorted(result.items())
+            if amount
+        ]
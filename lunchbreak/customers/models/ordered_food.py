@@ -1,7 +1,6 @@
 import math
 from decimal import Decimal
 
-from django.contrib.contenttypes.fields import GenericForeignKey
 from django.db import models
 from django.utils.functional import cached_property
 from django.utils.translation import ugettext as _
@@ -48,18 +47,23 @@ class OrderedFood(CleanModelMixin, StatusSignalModel):
         verbose_name=_('kostprijs'),
         help_text=_('Kostprijs.')
     )
-    content_type = models.ForeignKey(
-        'contenttypes.ContentType',
+    placed_order = models.ForeignKey(
+        'Order',
         on_delete=models.CASCADE,
-        limit_choices_to=(
-            models.Q(app_label='customers', model='order') |
-            models.Q(app_label='customers', model='temporaryorder')
-        )
+        null=True,
+        blank=True,
+        related_name='orderedfood',
+        verbose_name=_('bestelling'),
+        help_text=_('Geplaatste bestelling.')
     )
-    object_id = models.PositiveIntegerField()
-    order = GenericForeignKey(
-        'content_type',
-        'object_id',
+    temporary_order = models.ForeignKey(
+        'TemporaryOrder',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='orderedfood',
+        verbose_name=_('tijdelijke bestelling'),
+        help_text=_('Tijdelijke bestelling.')
     )
     original = models.ForeignKey(
         'lunch.Food',
@@ -94,6 +98,22 @@ class OrderedFood(CleanModelMixin, StatusSignalModel):
         help_text=_('Totale prijs exclusief korting.')
     )
 
+    @property
+    def order(self):
+        """Placed or temporary order of the ordered food."""
+        return self.placed_order or self.temporary_order
+
+    @order.setter
+    def order(self, order):
+        from .order import Order
+
+        if isinstance(order, Order):
+            self.placed_order = order
+            self.temporary_order = None
+        else:
+            self.placed_order = None
+            self.temporary_order = order
+
     @cached_property
     def ingredientgroups(self):
         return self.original.ingredientgroups
@@ -122,13 +142,24 @@ class OrderedFood(CleanModelMixin, StatusSignalModel):
             return int(self.total * Decimal(100 - self.order.discount) / Decimal(100))
 
     def save(self, *args, **kwargs):
-        self.full_clean()
+        self.clean_for_save(kwargs.get('update_fields'))
         super().save(*args, **kwargs)
 
-    def update_hard_delete(self):
-        """Check whether Food and Ingredients scheduled for deletion can be deleted."""
+    def update_hard_delete(self, checked_food=None):
+        """Check whether Food and Ingredients scheduled for deletion can be deleted.
+
+        Args:
+            checked_food (set): Ids of the food that were already checked,
+                the food is added to it. Used to check food shared by
+                several ordered food once.
+        """
+        check_food = checked_food is None \
+            or self.original_id not in checked_food
+        if checked_food is not None:
+            checked_food.add(self.original_id)
+
         try:
-            if self.original.deleted:
+            if check_food and self.original.deleted:
                 inactive_food = not OrderedFood.objects.active_with(
                     food=self.original
                 ).exists()
@@ -161,14 +192,12 @@ class OrderedFood(CleanModelMixin, StatusSignalModel):
                 )
             )
 
-    def clean_order(self):
-        from .order import Order
-
+    def clean_placed_order(self):
         if self.original is not None \
-                and isinstance(self.order, Order) \
+                and self.placed_order is not None \
                 and not self.original.is_orderable(
-                    self.order.receipt,
-                    now=self.order.placed
+                    self.placed_order.receipt,
+                    now=self.placed_order.placed
                 ):
             raise MinDaysExceeded()
 
@@ -258,6 +287,8 @@ class OrderedFood(CleanModelMixin, StatusSignalModel):
         """
 
         food_selected_ingredients, food_deselected_ingredients = food.all_ingredients
+        food_selected_ingredients = set(food_selected_ingredients)
+        ingredients = set(ingredients)
         food_selected_groups = {ingredient.group for ingredient in food_selected_ingredients}
 
         added_ingredients = {
@@ -1,4 +1,3 @@
-from django.contrib.contenttypes.fields import GenericRelation
 from django.utils.translation import ugettext as _
 
 from .abstract_order import AbstractOrder
@@ -12,13 +11,6 @@ class TemporaryOrder(AbstractOrder):
         verbose_name = _('tijdelijke bestelling')
         verbose_name_plural = _('tijdelijke bestellingen')
 
-    orderedfood = GenericRelation(
-        'OrderedFood',
-        related_query_name='temporary_order',
-        verbose_name=_('bestelde etenswaren'),
-        help_text=_('Bestelde etenswaren.')
-    )
-
     def place(self, **kwargs):
         save = kwargs.get('save')
         order = Order.objects.create_with_orderedfood(
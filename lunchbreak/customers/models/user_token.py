@@ -9,6 +9,7 @@ from rest_framework.response import Response
 class UserToken(BaseToken):
 
     class Meta:
+        index_together = ('user', 'device',)
         verbose_name = _('gebruikerstoken')
         verbose_name_plural = _('gebruikerstokens')
 
@@ -1,7 +1,10 @@
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import post_delete, post_save, pre_delete
+from lunch.authentication import TokenCache
+from payconiq.models import Transaction
 from payconiq.signals import *  # NOQA
 
-from .models import Group, GroupOrder, Order, OrderedFood, PaymentLink
+from .models import (ConfirmedOrder, CountedOrder, Group, GroupOrder, Order,
+                     OrderedFood, PaymentLink, User, UserToken)
 from .signals import *  # NOQA
 
 post_delete.connect(
@@ -16,6 +19,48 @@ post_save.connect(
     weak=False
 )
 
+post_save.connect(
+    Order.changed,
+    sender=Order,
+    weak=False
+)
+post_save.connect(
+    Order.changed,
+    sender=ConfirmedOrder,
+    weak=False
+)
+post_delete.connect(
+    Order.changed,
+    sender=OrderedFood,
+    weak=False
+)
+post_save.connect(
+    Order.changed,
+    sender=Transaction,
+    weak=False
+)
+
+post_save.connect(
+    TokenCache.changed,
+    sender=UserToken,
+    weak=False
+)
+post_delete.connect(
+    TokenCache.changed,
+    sender=UserToken,
+    weak=False
+)
+post_save.connect(
+    TokenCache.changed,
+    sender=User,
+    weak=False
+)
+post_delete.connect(
+    TokenCache.changed,
+    sender=User,
+    weak=False
+)
+
 order_created.connect(
     Order.created,
     dispatch_uid='customers_order_created'
@@ -28,6 +73,16 @@ order_completed.connect(
     Order.completed,
     dispatch_uid='customers_order_completed'
 )
+order_completed.connect(
+    CountedOrder.order_completed,
+    dispatch_uid='customers_order_statistic_completed'
+)
+for sender in (Order, ConfirmedOrder,):
+    pre_delete.connect(
+        CountedOrder.order_deleted,
+        sender=sender,
+        weak=False
+    )
 order_denied.connect(
     Order.denied,
     dispatch_uid='customers_order_denied'
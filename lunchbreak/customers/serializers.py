@@ -1,8 +1,10 @@
 from django_gocardless.serializers import RedirectFlowSerializer
 from django_sms.models import Phone
 from lunch import serializers as lunch_serializers
+from lunch.models import Food, Ingredient
 from lunch.serializers import FoodSerializer
-from Lunchbreak.serializers import MoneyField, PrimaryModelSerializer
+from Lunchbreak.serializers import (MoneyField, PreloadedPrimaryKeyRelatedField,
+                                    PrimaryModelSerializer)
 from payconiq.serializers import TransactionSerializer
 from phonenumber_field.validators import validate_international_phonenumber
 from rest_framework import serializers
@@ -47,8 +49,51 @@ class OrderedFoodSerializer(serializers.ModelSerializer):
         }
 
 
+class OrderedFoodPriceListSerializer(serializers.ListSerializer):
+    """Loads all of the food and ingredients of the given lines at once.
+
+    The ingredients of the food are read from their menu snapshot, see
+    ``Food.menu_snapshot``, so pricing does not query per line.
+    """
+
+    def to_internal_value(self, data):
+        food_ids = []
+        ingredient_ids = []
+        if isinstance(data, list):
+            for item in data:
+                if not isinstance(item, dict):
+                    continue
+                food_ids.append(item.get('original'))
+                ingredients = item.get('ingredients')
+                if isinstance(ingredients, list):
+                    ingredient_ids.extend(ingredients)
+
+        food_ids = PreloadedPrimaryKeyRelatedField.primary_keys(food_ids)
+        ingredient_ids = PreloadedPrimaryKeyRelatedField.primary_keys(ingredient_ids)
+        self.preloaded = {
+            Food: Food.in_bulk_for_ordering(food_ids) if food_ids else {},
+            Ingredient: Ingredient.objects.select_related(
+                'group'
+            ).in_bulk(
+                ingredient_ids
+            ) if ingredient_ids else {},
+        }
+        return super().to_internal_value(data)
+
+
 class OrderedFoodPriceSerializer(serializers.ModelSerializer):
+    ingredients = PreloadedPrimaryKeyRelatedField(
+        queryset=Ingredient.objects.all(),
+        many=True,
+        required=False,
+        write_only=True
+    )
+    original = PreloadedPrimaryKeyRelatedField(
+        queryset=Food.objects.all(),
+        write_only=True
+    )
     food = FoodSerializer(read_only=True)
+    total = MoneyField(read_only=True)
 
     class Meta:
         model = OrderedFood
@@ -57,39 +102,54 @@ class OrderedFoodPriceSerializer(serializers.ModelSerializer):
             'amount',
             'original',
             'cost',
+            'total',
             'food',
         )
         extra_kwargs = {
-            'ingredients': {
-                'write_only': True,
-            },
             'amount': {
                 'write_only': True,
             },
-            'original': {
-                'write_only': True,
-            },
         }
         read_only_fields = (
             'cost',
+            'total',
             'food',
         )
+        list_serializer_class = OrderedFoodPriceListSerializer
 
-    def to_representation(self, obj):
-        original = obj['original']
-        if 'ingredients' in obj:
-            ingredients = obj['ingredients']
+    def validate(self, data):
+        original = data['original']
+        if 'ingredients' in data:
+            ingredients = data['ingredients']
             original.check_ingredients(
                 ingredients=ingredients
             )
-
-            obj['cost'] = OrderedFood.calculate_cost(ingredients, original)
-            obj['food'] = original
+            cost = OrderedFood.calculate_cost(ingredients, original)
         else:
-            obj['cost'] = original.cost
-            obj['food'] = original
+            cost = original.cost
 
-        return super().to_representation(obj)
+        orderedfood = OrderedFood(
+            original=original,
+            amount=data.get('amount', 1),
+            cost=cost
+        )
+        orderedfood.clean_total()
+
+        data['cost'] = cost
+        data['total'] = orderedfood.total
+        data['food'] = original
+        return data
+
+
+class OrderedFoodQuoteSerializer(serializers.Serializer):
+    orderedfood = OrderedFoodPriceSerializer(many=True)
+    total = MoneyField(read_only=True)
+
+    def validate(self, data):
+        data['total'] = sum(
+            orderedfood['total'] for orderedfood in data['orderedfood']
+        )
+        return data
 
 
 class PrimaryAddressSerializer(PrimaryModelSerializer):
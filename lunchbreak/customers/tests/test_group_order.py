@@ -1,3 +1,4 @@
+from datetime import timedelta
 from decimal import Decimal
 
 import mock
@@ -8,7 +9,7 @@ from ..config import (ORDER_STATUS_COMPLETED, ORDER_STATUS_PLACED,
                       ORDER_STATUS_RECEIVED, ORDER_STATUS_STARTED,
                       ORDER_STATUS_WAITING)
 from ..exceptions import OnlinePaymentRequired
-from ..models import Group, GroupOrder, Order
+from ..models import Group, GroupOrder, Order, OrderStatistic
 from ..tasks import send_group_order_email
 from .test_group import BaseGroupTestCase
 
@@ -251,6 +252,42 @@ class GroupOrderTestCase(BaseGroupTestCase):
         group_order.save()
         assert_same_status()
 
+    @mock.patch('lunch.models.Store.is_open')
+    @mock.patch('customers.tasks.send_group_order_email.apply_async')
+    def test_statistics(self, mock_task, mock_is_open):
+        """Test whether orders completed through the group order are part of
+        the statistics."""
+        group_order = GroupOrder.objects.create(
+            group=self.group,
+            date=self.midday.date()
+        )
+        self.create_order(group_order)
+        self.create_order(group_order)
+        receipt = group_order.receipt._datetime
+
+        def amount():
+            return sum(
+                row['amount']
+                for row in OrderStatistic.spread(
+                    store_id=self.store.id,
+                    unit='dow',
+                    frm=receipt - timedelta(days=2),
+                    to=receipt + timedelta(days=2)
+                )
+            )
+
+        group_order.status = ORDER_STATUS_COMPLETED
+        group_order.save()
+        self.assertEqual(amount(), 2)
+
+        # Saving it again does not count the orders twice
+        group_order.save()
+        self.assertEqual(amount(), 2)
+
+        group_order.status = ORDER_STATUS_RECEIVED
+        group_order.save()
+        self.assertEqual(amount(), 0)
+
     @mock.patch('lunch.models.Store.is_open')
     @mock.patch('customers.tasks.send_group_order_email.apply_async')
     def test_completed_change(self, mock_task, mock_is_open):
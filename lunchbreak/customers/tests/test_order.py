@@ -2,7 +2,10 @@ import json
 from decimal import Decimal
 
 import mock
+from django.core.exceptions import ValidationError
 from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django_gocardless.exceptions import MerchantAccessError
 from django_gocardless.models import Merchant as GoCardlessMerchant
 from django_gocardless.models import RedirectFlow
@@ -12,6 +15,7 @@ from payconiq.models import Transaction
 from payconiq.views import WebhookView
 from rest_framework import status
 from rest_framework.exceptions import NotFound
+from webhooks.models import WebhookEvent
 
 from . import CustomersTestCase
 from .. import views
@@ -222,6 +226,113 @@ class OrderTestCase(CustomersTestCase):
         self.assertTrue(of.is_original)
         self.assertFalse(of.ingredients.all().exists())
 
+    @mock.patch('lunch.models.Store.is_open')
+    def test_order_bulk_orderedfood(self, mock_is_open):
+        """Test whether the amount of OrderedFood does not affect the queries."""
+        selected_ingredients = [
+            r.ingredient for r in self.food.ingredientrelations.filter(
+                selected=True
+            )
+        ]
+        unselected_ingredients = [
+            r.ingredient for r in self.food.ingredientrelations.filter(
+                selected=False
+            )
+        ]
+        ingredients = selected_ingredients[1:] + unselected_ingredients[:1]
+
+        def place(size):
+            orderedfood = [
+                {
+                    'original': self.food,
+                    'amount': 1,
+                    'total': self.food.cost,
+                    'ingredients': ingredients
+                } for i in range(size)
+            ]
+            with CaptureQueriesContext(connection) as context:
+                order = Order.objects.create_with_orderedfood(
+                    orderedfood=orderedfood,
+                    user=self.user,
+                    store=self.store,
+                    receipt=self.midday.add(hours=1)
+                )
+            return order, len(context)
+
+        # Builds the menu snapshot of the store
+        place(1)
+
+        order, single_queries = place(1)
+        self.assertEqual(order.orderedfood.count(), 1)
+
+        with mock.patch('customers.models.Order.save', autospec=True,
+                        side_effect=Order.save) as mock_save:
+            order, multiple_queries = place(5)
+            self.assertEqual(mock_save.call_count, 1)
+
+        self.assertEqual(single_queries, multiple_queries)
+        self.assertEqual(order.orderedfood.count(), 5)
+        self.assertEqual(
+            order.total,
+            sum(f.total for f in order.orderedfood.all())
+        )
+        for f in order.orderedfood.all():
+            self.assertEqual(
+                set(f.ingredients.all()),
+                set(ingredients)
+            )
+
+    def test_quote(self):
+        """Test whether the size of the basket does not affect the queries."""
+        ingredients = [self.ingredient.id, self.deselected_ingredient.id]
+        food = Food.objects.get(id=self.food.id)
+        expected = OrderedFood(
+            original=food,
+            amount=2,
+            cost=OrderedFood.calculate_cost(
+                [self.ingredient, self.deselected_ingredient],
+                food
+            )
+        )
+        expected.clean_total()
+
+        def quote(size):
+            url = reverse('customers:order-quote')
+            content = {
+                'orderedfood': [
+                    {
+                        'original': self.food.id,
+                        'amount': 2,
+                        'ingredients': ingredients
+                    } for i in range(size)
+                ]
+            }
+            request = self.factory.post(url, content, HTTP_X_VERSION='2.3.0')
+            with CaptureQueriesContext(connection) as context:
+                response = self.as_view(
+                    request,
+                    views.OrderViewSet,
+                    view_actions={
+                        'post': 'quote'
+                    }
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return response, len(context)
+
+        # Builds the menu snapshot of the store
+        quote(1)
+
+        response, single_queries = quote(1)
+        response, multiple_queries = quote(5)
+        self.assertEqual(single_queries, multiple_queries)
+
+        self.assertEqual(len(response.data['orderedfood']), 5)
+        for orderedfood in response.data['orderedfood']:
+            self.assertEqual(orderedfood['cost'], expected.cost)
+            self.assertEqual(orderedfood['total'], expected.total)
+            self.assertEqual(orderedfood['food']['id'], self.food.id)
+        self.assertEqual(response.data['total'], expected.total * 5)
+
     def test_order_signals(self):
         """Test whether all order status signals are sent."""
 
@@ -260,6 +371,49 @@ class OrderTestCase(CustomersTestCase):
                 order.save()
                 self.assertEqual(mock_signal.call_count, 1)
 
+    def test_status_fast_path(self):
+        """Test whether status-only saves skip the full clean."""
+        order = Order.objects.create(
+            store=self.store,
+            receipt=self.midday.add(days=1)._datetime,
+            user=self.user
+        )
+        sequence = order.sequence
+
+        with mock.patch.object(Order, 'full_clean') as mock_full_clean, \
+                mock.patch('customers.signals.order_received.send') as mock_signal, \
+                CaptureQueriesContext(connection) as context:
+            order.status = ORDER_STATUS_RECEIVED
+            order.save(update_fields=['status'])
+
+            self.assertFalse(mock_full_clean.called)
+            self.assertEqual(mock_signal.call_count, 1)
+
+        updates = [
+            query['sql']
+            for query in context.captured_queries
+            if query['sql'].startswith('UPDATE "customers_order" SET "status"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('"receipt"', updates[0])
+        self.assertEqual(
+            Order.objects.get(pk=order.pk).status,
+            ORDER_STATUS_RECEIVED
+        )
+        self.assertGreater(order.sequence, sequence)
+
+        # The fields are still validated
+        order.status = 100
+        with self.assertRaises(ValidationError):
+            order.save(update_fields=['status'])
+
+        # Other fields take the full clean
+        order.status = ORDER_STATUS_STARTED
+        order.description = 'Extra mayonaise'
+        with mock.patch.object(Order, 'full_clean') as mock_full_clean:
+            order.save(update_fields=['status', 'description'])
+            self.assertTrue(mock_full_clean.called)
+
     @mock.patch('customers.serializers.OrderSerializer.create')
     def test_ignore_floating_errors(self, mock_create):
         self.food, original = self.clone_model(self.food)
@@ -363,6 +517,7 @@ class OrderTestCase(CustomersTestCase):
             response.status_code,
             status.HTTP_200_OK
         )
+        WebhookEvent.process_batch()
         assert_confirmed(order, confirmed, not confirmed)
         Transaction.objects.all().delete()
 
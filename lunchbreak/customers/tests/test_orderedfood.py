@@ -1,9 +1,10 @@
 import mock
+from lunch.exceptions import LinkingError
 from lunch.models import Food, Ingredient, IngredientRelation
 
 from . import CustomersTestCase
 from ..config import ORDEREDFOOD_STATUS_OK, ORDEREDFOOD_STATUS_OUT_OF_STOCK
-from ..models import Order, OrderedFood
+from ..models import Order, OrderedFood, TemporaryOrder
 
 
 class OrderedFoodTestCase(CustomersTestCase):
@@ -265,3 +266,76 @@ class OrderedFoodTestCase(CustomersTestCase):
                 mock_order_save.call_count,
                 1
             )
+
+    @mock.patch('lunch.models.Food.is_orderable')
+    @mock.patch('lunch.models.Store.is_open')
+    def test_typed_order(self, mock_is_open, mock_is_orderable):
+        """Test whether the order is a typed relation that can be joined."""
+        mock_is_orderable.return_value = True
+
+        orderedfood_data = [
+            {
+                'original': self.food,
+                'amount': 1,
+                'total': self.food.cost
+            }
+        ]
+
+        order = Order.objects.create_with_orderedfood(
+            orderedfood=orderedfood_data,
+            user=self.user,
+            store=self.store,
+            receipt=self.midday
+        )
+        temporary_order = TemporaryOrder.objects.create_with_orderedfood(
+            orderedfood=orderedfood_data,
+            user=self.user,
+            store=self.store
+        )
+
+        placed = order.orderedfood.get()
+        self.assertEqual(placed.order, order)
+        self.assertIsNone(placed.temporary_order)
+        temporary = temporary_order.orderedfood.get()
+        self.assertEqual(temporary.order, temporary_order)
+        self.assertIsNone(temporary.placed_order)
+
+        # Switching the order clears the other relation
+        temporary.order = order
+        self.assertEqual(temporary.placed_order_id, order.id)
+        self.assertIsNone(temporary.temporary_order_id)
+
+        with self.assertNumQueries(1):
+            orderedfood = OrderedFood.objects.select_related(
+                'placed_order__user',
+            ).get(
+                placed_order__user=self.user
+            )
+            self.assertEqual(orderedfood.order.user, self.user)
+
+        with self.assertNumQueries(2):
+            orders = list(
+                Order.objects.prefetch_related(
+                    'orderedfood',
+                ).filter(
+                    id=order.id
+                )
+            )
+            self.assertEqual(len(orders[0].orderedfood.all()), 1)
+
+    def test_assemble_unknown_ingredient(self):
+        """Test whether unknown ingredients are refused instead of dropped."""
+        unknown_id = Ingredient.objects.order_by('-id').first().id + 1
+
+        self.assertRaises(
+            LinkingError,
+            OrderedFood.objects.assemble,
+            [
+                {
+                    'original': self.food,
+                    'amount': 1,
+                    'total': self.food.cost,
+                    'ingredients': [self.deselected_ingredient.id, unknown_id]
+                }
+            ]
+        )
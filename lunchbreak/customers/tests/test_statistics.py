@@ -0,0 +1,188 @@
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+import mock
+from django.utils import timezone
+
+from . import CustomersTestCase
+from ..config import (ORDER_STATUS_COMPLETED, ORDER_STATUS_NOT_COLLECTED,
+                      STATISTIC_PERIOD_DAY, STATISTIC_PERIOD_HOUR)
+from ..models import (CountedOrder, FoodStatistic, Order, OrderedFood,
+                      OrderStatistic)
+
+
+class StatisticsTestCase(CustomersTestCase):
+
+    def test_split(self):
+        """Test whether only complete hours and days are read from rollups."""
+        frm = datetime(2017, 1, 1, 10, 30, tzinfo=timezone.utc)
+        to = datetime(2017, 1, 3, 14, 15, tzinfo=timezone.utc)
+        day = datetime(2017, 1, 2, tzinfo=timezone.utc)
+        last_day = datetime(2017, 1, 3, tzinfo=timezone.utc)
+
+        rollups, edges = OrderStatistic.split(frm, to)
+        self.assertEqual(
+            rollups,
+            [
+                (STATISTIC_PERIOD_DAY, day, last_day,),
+                (STATISTIC_PERIOD_HOUR, frm.replace(hour=11, minute=0), day,),
+                (STATISTIC_PERIOD_HOUR, last_day, to.replace(minute=0),),
+            ]
+        )
+        self.assertEqual(
+            edges,
+            [
+                (frm, frm.replace(hour=11, minute=0), False,),
+                (to.replace(minute=0), to, True,),
+            ]
+        )
+
+        rollups, edges = OrderStatistic.split(frm, to, days=False)
+        self.assertEqual(
+            rollups,
+            [
+                (STATISTIC_PERIOD_HOUR, frm.replace(hour=11, minute=0), to.replace(minute=0),),
+            ]
+        )
+
+        rollups, edges = OrderStatistic.split(frm, frm + timedelta(minutes=40))
+        self.assertEqual(rollups, [])
+        self.assertEqual(edges, [(frm, frm + timedelta(minutes=40), False,)])
+
+    @mock.patch('customers.models.User.notify')
+    @mock.patch('lunch.models.Store.is_open')
+    def test_rollups(self, mock_is_open, mock_notify):
+        """Test whether the rollups match the completed orders."""
+        start = self.midday.add(days=1)._datetime
+        receipts = [
+            start + timedelta(hours=hours, minutes=minutes)
+            for hours in (0, 1, 5, 26, 27, 50)
+            for minutes in (0, 20, 45)
+        ]
+        for i, receipt in enumerate(receipts):
+            order = Order.objects.create_with_orderedfood(
+                orderedfood=[
+                    {
+                        'original': self.food if i % 2 else self.other_food,
+                        'amount': 1,
+                        'total': self.food.cost
+                    },
+                    {
+                        'original': self.food,
+                        'amount': 1,
+                        'total': self.food.cost
+                    },
+                ],
+                user=self.user,
+                store=self.store,
+                receipt=receipt
+            )
+            # The last one is not completed
+            if i < len(receipts) - 1:
+                order.status = ORDER_STATUS_COMPLETED
+                order.save()
+
+        frm = start + timedelta(minutes=10)
+        to = start + timedelta(hours=50, minutes=30)
+        completed = Order.objects.filter(
+            store=self.store,
+            status=ORDER_STATUS_COMPLETED,
+            receipt__gt=frm,
+            receipt__lt=to
+        )
+
+        for unit, extract in (('hour', 'hour',), ('day', 'day',),):
+            expected = defaultdict(lambda: [0, 0])
+            for order in completed:
+                value = getattr(order.receipt.astimezone(timezone.utc), extract)
+                expected[value][0] += 1
+                expected[value][1] += order.total
+
+            spread = OrderStatistic.spread(
+                store_id=self.store.id,
+                unit=unit,
+                frm=frm,
+                to=to
+            )
+            self.assertEqual(
+                {
+                    row['unit']: [row['amount'], row['sum']]
+                    for row in spread
+                },
+                dict(expected)
+            )
+
+        self.assertEqual(
+            FoodStatistic.popular(
+                store_id=self.store.id,
+                frm=frm,
+                to=to
+            ),
+            Counter(
+                OrderedFood.objects.filter(
+                    placed_order__in=completed
+                ).values_list(
+                    'original_id',
+                    flat=True
+                )
+            )
+        )
+
+        # Rebuilding results in the same rollups
+        for model in (OrderStatistic, FoodStatistic,):
+            fields = [
+                field.attname for field in model._meta.concrete_fields
+                if field.name != 'id'
+            ]
+            incremental = sorted(model.objects.values_list(*fields))
+            model.rebuild()
+            self.assertEqual(
+                sorted(model.objects.values_list(*fields)),
+                incremental
+            )
+
+    @mock.patch('customers.models.User.notify')
+    @mock.patch('lunch.models.Store.is_open')
+    def test_counted_once(self, mock_is_open, mock_notify):
+        """Test whether orders are counted once and subtracted again."""
+        order = Order.objects.create_with_orderedfood(
+            orderedfood=[
+                {
+                    'original': self.food,
+                    'amount': 1,
+                    'total': self.food.cost
+                },
+            ],
+            user=self.user,
+            store=self.store,
+            receipt=self.midday.add(days=1)._datetime
+        )
+
+        def amounts():
+            return (
+                sorted(OrderStatistic.objects.values_list('period', 'amount')),
+                sorted(FoodStatistic.objects.values_list('period', 'amount')),
+            )
+
+        counted = (
+            [(STATISTIC_PERIOD_HOUR, 1,), (STATISTIC_PERIOD_DAY, 1,)],
+            [(STATISTIC_PERIOD_HOUR, 1,), (STATISTIC_PERIOD_DAY, 1,)],
+        )
+        for i in range(2):
+            order.status = ORDER_STATUS_COMPLETED
+            order.save()
+            self.assertEqual(amounts(), counted)
+
+            order.status = ORDER_STATUS_NOT_COLLECTED
+            order.save()
+            self.assertEqual(amounts(), ([], [],))
+            self.assertFalse(CountedOrder.objects.exists())
+
+        order.status = ORDER_STATUS_COMPLETED
+        order.save()
+        # Completing it again is not counted twice
+        order.send_status_signal(status_changed=False)
+        self.assertEqual(amounts(), counted)
+
+        order.delete()
+        self.assertEqual(amounts(), ([], [],))
@@ -1,13 +1,17 @@
 import mock
 from django.core.urlresolvers import reverse
 from django_sms.models import Phone
+from lunch.authentication import token_cache
 from lunch.models import Store
 from push_notifications.models import BareDevice
 from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
 
 from . import CustomersTestCase
 from .. import views
+from ..authentication import CustomerAuthentication
 from ..config import DEMO_PHONE
+from ..exceptions import UserDisabled
 from ..models import Heart, User, UserToken
 from ..views import StoreViewSet
 
@@ -349,3 +353,72 @@ class UserTestCase(CustomersTestCase):
 
         for store_repr in response.data:
             self.assertTrue(store_repr['cash_enabled'])
+
+    def test_token_authentication(self):
+        """Test the digest lookup, the token cache and its invalidation."""
+        token_cache.clear()
+        authentication = CustomerAuthentication()
+
+        def authenticate(identifier='something'):
+            request = self.factory.get(
+                '/',
+                HTTP_X_IDENTIFIER=identifier,
+                HTTP_X_USER=self.user.id,
+                HTTP_X_DEVICE=self.usertoken.device
+            )
+            return authentication.authenticate(request)
+
+        with self.assertNumQueries(1):
+            user, usertoken = authenticate()
+        self.assertEqual(user, self.user)
+        self.assertEqual(usertoken, self.usertoken)
+
+        with self.assertNumQueries(0):
+            user, usertoken = authenticate()
+        self.assertEqual(usertoken, self.usertoken)
+
+        self.assertRaises(
+            AuthenticationFailed,
+            authenticate,
+            identifier='something else'
+        )
+
+        # Disabling the user invalidates its cached tokens
+        self.user.enabled = False
+        self.user.save()
+        self.assertRaises(UserDisabled, authenticate)
+        self.user.enabled = True
+        self.user.save()
+
+        # Rotating the identifier invalidates the cached token
+        self.usertoken.identifier = 'rotated'
+        self.usertoken.save()
+        self.assertRaises(AuthenticationFailed, authenticate)
+        authenticate(identifier='rotated')
+
+        self.usertoken.delete()
+        self.assertRaises(AuthenticationFailed, authenticate, identifier='rotated')
+
+    def test_token_digest_migration(self):
+        """Test whether tokens without a digest are migrated when used."""
+        token_cache.clear()
+        UserToken.objects.filter(
+            pk=self.usertoken.pk
+        ).update(
+            identifier_digest=''
+        )
+
+        user, usertoken = CustomerAuthentication()._authenticate(
+            identifier='something',
+            device=self.usertoken.device,
+            filter_args={
+                'user_id': self.user.id
+            }
+        )
+        self.assertEqual(usertoken, self.usertoken)
+
+        self.usertoken.refresh_from_db()
+        self.assertEqual(
+            self.usertoken.identifier_digest,
+            UserToken.digest('something')
+        )
@@ -29,6 +29,19 @@ class VersioningTestCase(CustomersTestCase):
             3
         )
 
+    def test_stores_cash_enabled_forced(self):
+        """Test whether listed stores accept cash for User.cash_enabled_forced."""
+
+        self.store.cash_enabled = False
+        self.store.save()
+        self.user.cash_enabled_forced = True
+        self.user.save()
+
+        response = self.request_stores(HTTP_X_VERSION='2.2.1')
+        self.assertEqual(len(response.data), 3)
+        for store in response.data:
+            self.assertTrue(store['cash_enabled'])
+
     def request_stores(self, **kwargs):
         url = reverse('customers:store-list')
         request = self.factory.get(url, **kwargs)
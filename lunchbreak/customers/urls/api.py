@@ -125,6 +125,12 @@ urlpatterns = [
         lunch_views.StoreHeaderView.as_view(),
         name='store-header'
     ),
+    url(
+        r'^store/(?P<store_id>\d+)/header/(?P<width>\d+)/(?P<height>\d+)'
+        r'/(?P<digest>[0-9a-f]{16})/?$',
+        lunch_views.StoreHeaderView.as_view(),
+        name='store-header-digest'
+    ),
     url(
         r'^store/nearby'
         r'/(?P<latitude>-?\d+(.?\d+)?)'
@@ -19,7 +19,8 @@ from .config import DEMO_PHONE
 from .models import (ConfirmedOrder, Group, Heart, Order, PaymentLink, User,
                      UserToken)
 from .serializers import (GroupSerializer, OrderDetailSerializer,
-                          OrderedFoodPriceSerializer, OrderSerializer,
+                          OrderedFoodPriceSerializer,
+                          OrderedFoodQuoteSerializer, OrderSerializer,
                           PaymentLinkSerializer, UserLoginSerializer,
                           UserRegisterSerializer, UserTokenSerializer,
                           UserTokenUpdateSerializer)
@@ -38,15 +39,13 @@ class FoodViewSet(TargettedViewSet,
 
     @property
     def queryset_retrieve(self):
+        # The ingredients are read from Food.menu_snapshot
         result = Food.objects.filter(
             enabled=True,
             deleted__isnull=True
         ).select_related(
             'foodtype',
-            'menu',
-        ).prefetch_related(
-            'ingredientrelations__ingredient',
-            'ingredientgroups',
+            'menu__store',
         )
 
         return result
@@ -61,10 +60,8 @@ class FoodViewSet(TargettedViewSet,
             menu_id=self.kwargs['menu_id'],
             deleted__isnull=True
         ).select_related(
-            'menu',
+            'menu__store',  # Food.menu_snapshot
             'foodtype',
-        ).prefetch_related(
-            'ingredients',  # Food.has_ingredients
         ).order_by(
             '-menu__priority',
             'menu__name',
@@ -148,6 +145,18 @@ class OrderViewSet(TargettedViewSet,
         serializer.is_valid(raise_exception=True)
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
+    @list_route(methods=['post'], authentication_classes=())
+    def quote(self, request):
+        """Return the price of every line and the total of the basket."""
+        serializer = OrderedFoodQuoteSerializer(
+            data=request.data,
+            context={
+                'request': request
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        return Response(data=serializer.data, status=status.HTTP_200_OK)
+
 
 class StoreViewSet(TargettedViewSet,
                    mixins.ListModelMixin,
@@ -26,6 +26,9 @@ class BaseDatabaseFeatures(object):
     can_return_id_from_insert = False
     can_return_ids_from_bulk_insert = False
     has_bulk_insert = False
+    # Does the backend need CASE expressions in an UPDATE to be cast to the
+    # type of the column? (See QuerySet.bulk_update.)
+    requires_casted_case_in_updates = False
     uses_savepoints = False
     can_release_savepoints = False
 
@@ -14,6 +14,7 @@ class DatabaseFeatures(BaseDatabaseFeatures):
     has_select_for_update = True
     has_select_for_update_nowait = True
     has_bulk_insert = True
+    requires_casted_case_in_updates = True
     uses_savepoints = True
     can_release_savepoints = True
     supports_tablespaces = True
@@ -6,4 +6,13 @@ class DjangoGoCardlessAppConfig(AppConfig):
     verbose_name = 'Django GoCardless'
 
     def ready(self):
+        from webhooks.models import WebhookEvent
+
         from . import receivers, signals  # NOQA
+        from .handlers import handle_webhook_event, prepare_webhook_events
+
+        WebhookEvent.register_handler(
+            WebhookEvent.GOCARDLESS,
+            handle_webhook_event,
+            prepare=prepare_webhook_events
+        )
@@ -2,7 +2,7 @@ from gocardless_pro.resources import Event
 
 from .exceptions import UnsupportedEventError, UnsupportedLinksError
 from .signals import *  # NOQA
-from .utils import model_from_links
+from .utils import LinksResolver, model_from_links
 
 
 class EventHandler(object):
@@ -47,18 +47,36 @@ class EventHandler(object):
         }
     }
 
-    def __init__(self, event):
+    def __init__(self, event, resolver=None):
+        signal = self.get_signal(event)
+        arguments = {}
+
+        for arg in signal.providing_args:
+            try:
+                arguments[arg] = model_from_links(event.links, arg) \
+                    if resolver is None else resolver.get(event.links, arg)
+            except UnsupportedLinksError:
+                continue
+
+        signal.send(
+            sender=self.__class__,
+            event=event,
+            **arguments
+        )
+
+    @classmethod
+    def get_signal(cls, event):
         if not isinstance(event, Event):
             raise ValueError('The EventHandler needs to be provided with an Event object.')
 
-        if event.resource_type not in self.ACTIONS:
+        if event.resource_type not in cls.ACTIONS:
             raise UnsupportedEventError(
                 'Unsupported resource_type: {type}'.format(
                     type=event.resource_type
                 )
             )
 
-        actions = self.ACTIONS[event.resource_type]
+        actions = cls.ACTIONS[event.resource_type]
 
         if event.action not in actions:
             raise UnsupportedEventError(
@@ -67,17 +85,40 @@ class EventHandler(object):
                 )
             )
 
-        signal = actions[event.action]
-        arguments = {}
+        return actions[event.action]
 
-        for arg in signal.providing_args:
-            try:
-                arguments[arg] = model_from_links(event.links, arg)
-            except UnsupportedLinksError:
-                continue
 
-        signal.send(
-            sender=self.__class__,
-            event=event,
-            **arguments
-        )
+def prepare_webhook_events(webhook_events):
+    """Resolve the links of a batch of webhook events at once.
+
+    Args:
+        webhook_events (list): GoCardless webhook events.
+
+    Returns:
+        Resolver to pass to `handle_webhook_event`.
+        LinksResolver
+    """
+    resolver = LinksResolver()
+    for webhook_event in webhook_events:
+        event = Event(webhook_event.payload, None)
+        try:
+            signal = EventHandler.get_signal(event)
+        except UnsupportedEventError:
+            continue
+        resolver.add(event.links, signal.providing_args)
+    resolver.resolve()
+    return resolver
+
+
+def handle_webhook_event(webhook_event, resolver=None):
+    """Handle a GoCardless event received through the webhook.
+
+    Args:
+        webhook_event (WebhookEvent): GoCardless webhook event.
+        resolver (LinksResolver): Resolved links of the batch.
+    """
+    try:
+        EventHandler(Event(webhook_event.payload, None), resolver)
+    except UnsupportedEventError:
+        # Nothing to do, retrying will not change that
+        pass
@@ -0,0 +1,113 @@
+import pendulum
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import Merchant
+from ...reconciliation import Reconciliation
+from ...tasks import reconcile
+from ...utils import FETCH_ORDER
+
+
+class Command(BaseCommand):
+    help = (
+        'Reconcile the cached GoCardless models of a merchant with the '
+        'GoCardless API. Without a merchant the account in the settings is '
+        'reconciled.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--merchant',
+            type=int,
+            default=None,
+            help='Id of the merchant to reconcile.'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Reconcile every confirmed merchant and the settings account.'
+        )
+        parser.add_argument(
+            '--since',
+            default=None,
+            help='Only reconcile resources created since, ISO 8601.'
+        )
+        parser.add_argument(
+            '--model',
+            dest='model_names',
+            action='append',
+            choices=FETCH_ORDER,
+            default=None,
+            help='Model to reconcile, can be repeated. Defaults to all.'
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=Reconciliation.PAGE_SIZE,
+            help='Resources per request.'
+        )
+        parser.add_argument(
+            '--async',
+            dest='run_async',
+            action='store_true',
+            help='Queue a Celery task per merchant instead.'
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since'] is not None:
+            try:
+                since = pendulum.parse(options['since'])._datetime
+            except ValueError:
+                raise CommandError('Invalid date: {}'.format(options['since']))
+
+        if options['all']:
+            merchants = [None] + list(
+                Merchant.objects.exclude(
+                    organisation_id=''
+                )
+            )
+        elif options['merchant'] is not None:
+            try:
+                merchants = [Merchant.objects.get(pk=options['merchant'])]
+            except Merchant.DoesNotExist:
+                raise CommandError(
+                    'Merchant {} does not exist.'.format(options['merchant'])
+                )
+        else:
+            merchants = [None]
+
+        for merchant in merchants:
+            if options['run_async']:
+                reconcile.delay(
+                    merchant_id=merchant.pk if merchant is not None else None,
+                    since=since.isoformat() if since is not None else None,
+                    model_names=options['model_names']
+                )
+                continue
+
+            stats = Reconciliation(
+                merchant=merchant,
+                since=since,
+                page_size=options['page_size'],
+                model_names=options['model_names']
+            ).run()
+            self.report(merchant, stats)
+
+    def report(self, merchant, stats):
+        self.stdout.write(
+            'Merchant {merchant}'.format(
+                merchant=merchant if merchant is not None else '(settings)'
+            )
+        )
+        for model_name, model_stats in stats.items():
+            seconds = model_stats['seconds']
+            self.stdout.write(
+                '  {model_name:<20} {fetched:>7} fetched {created:>7} created '
+                '{updated:>7} updated {skipped:>7} skipped {pages:>5} pages '
+                '{seconds:>8.2f}s {throughput:>8.0f}/s'.format(
+                    model_name=model_name,
+                    throughput=model_stats['fetched'] / seconds
+                    if seconds > 0 else 0,
+                    **model_stats
+                )
+            )
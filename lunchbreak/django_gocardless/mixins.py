@@ -11,6 +11,9 @@ from .config import CLIENT_PROPERTIES
 from .exceptions import DjangoGoCardlessException
 from .utils import field_default, model_from_links
 
+# (access token, environment) -> gocardless_pro.Client
+clients = {}
+
 
 class GCCacheMixin(object):
 
@@ -48,6 +51,8 @@ class GCCacheMixin(object):
         """Get GoCardless Client from token and environment.
 
         Uses access_token and environment by default if nothing was given.
+        Clients are reused per access token and environment, so their
+        connections are too.
         """
         access_token = settings.GOCARDLESS['access_token'] \
             if access_token is None else access_token
@@ -55,10 +60,13 @@ class GCCacheMixin(object):
         environment = settings.GOCARDLESS['environment'] \
             if environment is None else environment
 
-        return gocardless_pro.Client(
-            access_token=access_token,
-            environment=environment
-        )
+        key = (access_token, environment,)
+        if key not in clients:
+            clients[key] = gocardless_pro.Client(
+                access_token=access_token,
+                environment=environment
+            )
+        return clients[key]
 
     @cached_property
     def api(self):
@@ -0,0 +1,236 @@
+import time
+from collections import OrderedDict
+
+from django.apps import apps
+from django.db import transaction
+from gocardless_pro.errors import GoCardlessProError
+
+from .exceptions import DjangoGoCardlessException
+from .mixins import GCCacheMixin
+from .utils import FETCH_ORDER, field_default
+
+
+class Reconciliation(object):
+
+    """
+    Synchronises the cached models of a merchant, or of the GoCardless account
+    in the settings, with the GoCardless API in bulk.
+
+    Every model is listed page by page using cursors. The resources of a page
+    are compared with the local rows in memory, after which the new rows are
+    inserted with one query and the changed ones updated with another.
+    Contrary to `GCCacheMixin.fetch`, links are not resolved recursively, they
+    are only set if the linked row exists locally. New rows of which a
+    required link does not exist locally are skipped. Models are reconciled
+    in the order of `FETCH_ORDER`, so links to rows of earlier models are
+    found.
+    """
+
+    # Maximum of the GoCardless API
+    PAGE_SIZE = 500
+
+    def __init__(self, merchant=None, client=None, since=None,
+                 page_size=PAGE_SIZE, model_names=None):
+        """
+        Args:
+            merchant (Merchant): Merchant to reconcile, defaults to the
+                account in the settings.
+            client (gocardless_pro.Client): Defaults to the client of the
+                merchant.
+            since (datetime): Only reconcile resources created since.
+            page_size (int): Resources per request.
+            model_names (list): Models to reconcile, defaults to all of them.
+        """
+        self.merchant = merchant
+        self.client = client if client is not None \
+            else GCCacheMixin.client_from_settings(
+                access_token=merchant.access_token
+                if merchant is not None else None
+            )
+        self.since = since
+        self.page_size = page_size
+        self.model_names = [
+            model_name
+            for model_name in FETCH_ORDER
+            if model_names is None or model_name in model_names
+        ]
+        self.stats = OrderedDict()
+
+    def run(self):
+        """Reconcile every model.
+
+        Returns:
+            Statistics per model name, see `reconcile`.
+            OrderedDict
+        """
+        for model_name in self.model_names:
+            self.stats[model_name] = self.reconcile(
+                apps.get_model('django_gocardless', model_name)
+            )
+        return self.stats
+
+    def pages(self, model):
+        """Resources of the model, page by page."""
+        api = model.api_from_client(self.client)
+        params = {
+            'limit': self.page_size,
+        }
+        if self.since is not None:
+            params['created_at[gte]'] = self.since.isoformat()
+
+        while True:
+            try:
+                response = api.list(params=params)
+            except GoCardlessProError as e:
+                raise DjangoGoCardlessException.from_gocardless_exception(e)
+
+            yield response.records
+
+            if response.after is None:
+                break
+            params['after'] = response.after
+
+    @staticmethod
+    def values(model, resource):
+        """Field values of a resource, by attname.
+
+        The same values `GCCacheMixin.from_resource` would set, except for the
+        links which are only given as identifiers.
+        """
+        values = {}
+        for field in model._meta.concrete_fields:
+            if field.is_relation:
+                if hasattr(resource, 'links') \
+                        and hasattr(resource.links, field.name):
+                    values[field.attname] = getattr(resource.links, field.name)
+            elif hasattr(resource, field.name):
+                value = getattr(resource, field.name)
+                values[field.attname] = field.to_python(value) \
+                    if value is not None else field_default(field)
+        return values
+
+    def existing_links(self, model, pages_values):
+        """Identifiers of the linked rows that exist locally, by attname."""
+        existing = {}
+        for field in model._meta.concrete_fields:
+            if not field.is_relation or field.attname not in pages_values[0]:
+                continue
+            identifiers = {
+                values[field.attname]
+                for values in pages_values
+                if values[field.attname] is not None
+            }
+            existing[field.attname] = set(
+                field.related_model.objects.filter(
+                    pk__in=identifiers
+                ).values_list(
+                    'pk',
+                    flat=True
+                )
+            ) if identifiers else set()
+        return existing
+
+    def reconcile(self, model):
+        """Reconcile a model.
+
+        Returns:
+            Amount of resources fetched, rows created, rows updated and new
+            rows skipped, the amount of pages and the duration in seconds.
+            dict
+        """
+        stats = OrderedDict([
+            ('fetched', 0),
+            ('created', 0),
+            ('updated', 0),
+            ('skipped', 0),
+            ('pages', 0),
+            ('seconds', 0.0),
+        ])
+        start = time.monotonic()
+        has_merchant = any(
+            field.name == 'merchant'
+            for field in model._meta.concrete_fields
+        )
+        # Links without which a row cannot be created
+        required_links = [
+            field.attname
+            for field in model._meta.concrete_fields
+            if field.is_relation and not field.null
+        ]
+
+        for resources in self.pages(model):
+            stats['pages'] += 1
+            stats['fetched'] += len(resources)
+            if not resources:
+                continue
+
+            pages_values = [
+                self.values(model, resource)
+                for resource in resources
+            ]
+            existing_links = self.existing_links(model, pages_values)
+            instances = model.objects.in_bulk(
+                [values['id'] for values in pages_values]
+            )
+
+            created = []
+            updated = {}
+            for values in pages_values:
+                # Links are never removed, only set if they exist locally
+                for attname, identifiers in existing_links.items():
+                    if values[attname] not in identifiers:
+                        del values[attname]
+
+                instance = instances.get(values['id'])
+                if instance is None:
+                    if any(
+                            attname not in values
+                            for attname in required_links):
+                        stats['skipped'] += 1
+                        continue
+
+                    instance = model(**values)
+                    if has_merchant and self.merchant is not None:
+                        instance.merchant = self.merchant
+                    created.append(instance)
+                    continue
+
+                for attname, value in values.items():
+                    if getattr(instance, attname) != value:
+                        setattr(instance, attname, value)
+                        updated.setdefault(attname, []).append(instance)
+
+            with transaction.atomic():
+                model.objects.bulk_create(created)
+                self.bulk_update(model, updated)
+
+            stats['created'] += len(created)
+            stats['updated'] += len({
+                instance.pk
+                for instances in updated.values()
+                for instance in instances
+            })
+
+        stats['seconds'] = time.monotonic() - start
+        return stats
+
+    @staticmethod
+    def bulk_update(model, updated):
+        """Update the changed fields of the instances in one query.
+
+        Args:
+            model: Model of the instances.
+            updated (dict): Changed instances by attname.
+        """
+        if not updated:
+            return
+
+        instances = {
+            instance.pk: instance
+            for attname_instances in updated.values()
+            for instance in attname_instances
+        }
+        model.objects.bulk_update(
+            instances.values(),
+            list(updated)
+        )
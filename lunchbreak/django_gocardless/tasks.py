@@ -0,0 +1,43 @@
+import logging
+
+from celery import shared_task
+from django.utils.dateparse import parse_datetime
+from Lunchbreak.tasks import DebugLoggingTask
+
+from .reconciliation import Reconciliation
+
+logger = logging.getLogger('lunchbreak')
+
+
+@shared_task(base=DebugLoggingTask)
+def reconcile(merchant_id=None, since=None, model_names=None):
+    """Reconcile the cached models of a merchant with GoCardless.
+
+    Args:
+        merchant_id (int): Merchant, defaults to the account in the settings.
+        since (str): ISO 8601, only reconcile resources created since.
+        model_names (list): Models to reconcile, defaults to all of them.
+    """
+    from .models import Merchant
+
+    merchant = Merchant.objects.get(
+        pk=merchant_id
+    ) if merchant_id is not None else None
+
+    stats = Reconciliation(
+        merchant=merchant,
+        since=parse_datetime(since) if since is not None else None,
+        model_names=model_names
+    ).run()
+
+    for model_name, model_stats in stats.items():
+        logger.info(
+            'Reconciled GoCardless {model_name}.'.format(
+                model_name=model_name
+            ),
+            extra=dict(
+                model_stats,
+                merchant_id=merchant_id
+            )
+        )
+    return stats
@@ -0,0 +1,95 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlparse
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StandInAPI:
+    """Local HTTP server standing in for the list endpoints of GoCardless.
+
+    Attributes:
+        resources (dict): Lists of resources by name, e.g. 'payments'.
+        requests (list): Paths and query parameters of the requests received.
+    """
+
+    def __init__(self):
+        self.resources = {}
+        self.requests = []
+
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                name = url.path.strip('/')
+                params = {
+                    key: values[0]
+                    for key, values in parse_qs(url.query).items()
+                }
+                api.requests.append((url.path, params,))
+
+                content = json.dumps(
+                    api.page(name, params)
+                ).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever,
+            daemon=True
+        )
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return 'http://{host}:{port}'.format(
+            host=host,
+            port=port
+        )
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def page(self, name, params):
+        resources = [
+            resource
+            for resource in self.resources.get(name, [])
+            if 'created_at[gte]' not in params
+            or resource['created_at'] >= params['created_at[gte]']
+        ]
+        start = 0
+        if 'after' in params:
+            ids = [resource['id'] for resource in resources]
+            start = ids.index(params['after']) + 1
+        limit = int(params.get('limit', 50))
+        records = resources[start:start + limit]
+        after = records[-1]['id'] \
+            if records and start + limit < len(resources) else None
+
+        return {
+            name: records,
+            'meta': {
+                'cursors': {
+                    'before': None,
+                    'after': after,
+                },
+                'limit': limit,
+            },
+        }
@@ -1,10 +1,12 @@
 import mock
+from gocardless_pro import resources
 from gocardless_pro.resources.event import Event
 
 from . import GCTestCase
 from ..handlers import EventHandler
-from ..models import Merchant
-from ..utils import model_from_links
+from ..mixins import GCCacheMixin
+from ..models import Mandate, Merchant
+from ..utils import LinksResolver, model_from_links
 
 
 class EventsTestCase(GCTestCase):
@@ -36,3 +38,75 @@ class EventsTestCase(GCTestCase):
 
         self.assertTrue(mock_fetch.called)
         self.assertTrue(mock_client.called)
+
+    def test_links_resolver(self):
+        """Test whether the links of multiple events are loaded at once."""
+        Merchant.objects.create(
+            organisation_id='OR123',
+            access_token='access_token'
+        )
+        mandate = Mandate.objects.create(
+            id='MD123'
+        )
+        links = [
+            Event.Links({
+                'mandate': mandate.id,
+                'organisation': 'OR123',
+            })
+            for i in range(10)
+        ]
+
+        resolver = LinksResolver()
+        for event_links in links:
+            resolver.add(event_links, ['mandate', 'event'])
+        with self.assertNumQueries(2):
+            resolver.resolve()
+
+        with self.assertNumQueries(0):
+            for event_links in links:
+                self.assertEqual(
+                    resolver.get(event_links, 'mandate'),
+                    mandate
+                )
+
+    @mock.patch('gocardless_pro.services.MandatesService.get')
+    def test_links_resolver_fetch(self, mock_get):
+        """Test whether missing links are fetched once each."""
+        mock_get.side_effect = lambda identity, *args, **kwargs: \
+            resources.Mandate(
+                {
+                    'id': identity,
+                    'links': {},
+                },
+                None
+            )
+        links = [
+            Event.Links({
+                'mandate': 'MD{}'.format(i % 5),
+            })
+            for i in range(10)
+        ]
+
+        resolver = LinksResolver(max_workers=2)
+        for event_links in links:
+            resolver.add(event_links, ['mandate'])
+        resolver.resolve()
+
+        self.assertEqual(mock_get.call_count, 5)
+        self.assertEqual(Mandate.objects.count(), 5)
+        mandate = Mandate.objects.get(id='MD0')
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                resolver.get(links[0], 'mandate'),
+                mandate
+            )
+
+    def test_client_reused(self):
+        self.assertIs(
+            GCCacheMixin.client_from_settings(access_token='access_token'),
+            GCCacheMixin.client_from_settings(access_token='access_token')
+        )
+        self.assertIsNot(
+            GCCacheMixin.client_from_settings(access_token='access_token'),
+            GCCacheMixin.client_from_settings(access_token='other')
+        )
@@ -0,0 +1,165 @@
+import copy
+from datetime import datetime
+
+import gocardless_pro
+from django.utils import timezone
+
+from . import GCTestCase
+from .. import models
+from ..reconciliation import Reconciliation
+from .api import StandInAPI
+
+
+class ReconciliationTestCase(GCTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.api = StandInAPI()
+        cls.api.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.api.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        self.api.resources = {}
+        del self.api.requests[:]
+        self.client = gocardless_pro.Client(
+            access_token='access_token',
+            base_url=self.api.url
+        )
+
+    def reconcile(self, **kwargs):
+        return Reconciliation(
+            client=self.client,
+            **kwargs
+        ).run()
+
+    def customers(self, amount):
+        customers = []
+        for i in range(amount):
+            customer = copy.deepcopy(self.CUSTOMER_INFO)
+            customer['id'] = 'CU{}'.format(i)
+            customer['created_at'] = '2016-01-{:02d}T12:00:00.000Z'.format(
+                i + 1
+            )
+            customers.append(customer)
+        return customers
+
+    def test_pages(self):
+        """Test whether all pages are reconciled with bulk writes."""
+        customers = self.customers(5)
+        self.api.resources['customers'] = customers
+
+        models.Customer.objects.create(
+            id='CU0',
+            city='Outdated'
+        )
+        unchanged = models.Customer(
+            **Reconciliation.values(
+                models.Customer,
+                gocardless_pro.resources.Customer(customers[1], None)
+            )
+        )
+        unchanged.save()
+
+        stats = self.reconcile(
+            page_size=2,
+            model_names=['Customer']
+        )
+
+        self.assertEqual(len(self.api.requests), 3)
+        self.assertEqual(stats['Customer']['fetched'], 5)
+        self.assertEqual(stats['Customer']['created'], 3)
+        self.assertEqual(stats['Customer']['updated'], 1)
+        self.assertEqual(stats['Customer']['pages'], 3)
+
+        for customer in customers:
+            instance = models.Customer.objects.get(id=customer['id'])
+            self.assertEqual(instance.city, customer['city'])
+            self.assertEqual(instance.email, customer['email'])
+            self.assertEqual(
+                instance.created_at.isoformat(),
+                customer['created_at'].replace('.000Z', '+00:00')
+            )
+
+        # Nothing changed the second time
+        stats = self.reconcile(model_names=['Customer'])
+        self.assertEqual(stats['Customer']['created'], 0)
+        self.assertEqual(stats['Customer']['updated'], 0)
+
+    def test_since(self):
+        """Test whether only resources created since are listed."""
+        self.api.resources['customers'] = self.customers(5)
+
+        stats = self.reconcile(
+            since=datetime(2016, 1, 4, tzinfo=timezone.utc),
+            model_names=['Customer']
+        )
+
+        self.assertEqual(stats['Customer']['fetched'], 2)
+        self.assertEqual(
+            sorted(models.Customer.objects.values_list('id', flat=True)),
+            ['CU3', 'CU4']
+        )
+
+    def test_links(self):
+        """Test whether links are set if they exist locally."""
+        self.api.resources['customers'] = [self.CUSTOMER_INFO]
+        self.api.resources['customer_bank_accounts'] = [
+            self.CUSTOMER_BANK_ACCOUNT_INFO
+        ]
+        mandate = copy.deepcopy(self.MANDATE_INFO)
+        mandate['status'] = 'active'
+        orphan = copy.deepcopy(self.MANDATE_INFO)
+        orphan['id'] = 'MD999'
+        orphan['links']['customer_bank_account'] = 'BA999'
+        self.api.resources['mandates'] = [mandate, orphan]
+
+        merchant = models.Merchant.objects.create(
+            organisation_id='OR123',
+            access_token='access_token'
+        )
+        stats = Reconciliation(
+            merchant=merchant,
+            client=self.client,
+            model_names=['Customer', 'CustomerBankAccount', 'Mandate']
+        ).run()
+
+        self.assertEqual(stats['Mandate']['created'], 2)
+        self.assertEqual(
+            models.Customer.objects.get().merchant,
+            merchant
+        )
+        self.assertEqual(
+            models.Mandate.objects.get(id=mandate['id']).customer_bank_account_id,
+            self.CUSTOMER_BANK_ACCOUNT_INFO['id']
+        )
+        self.assertIsNone(
+            models.Mandate.objects.get(id=orphan['id']).customer_bank_account_id
+        )
+
+    def test_required_links(self):
+        """Test whether new rows of which a required link does not exist
+        locally are skipped."""
+        self.api.resources['mandates'] = [self.MANDATE_INFO]
+        orphan = copy.deepcopy(self.SUBSCRIPTION_INFO)
+        orphan['id'] = 'SU999'
+        orphan['links']['mandate'] = 'MD999'
+        self.api.resources['subscriptions'] = [
+            self.SUBSCRIPTION_INFO,
+            orphan,
+        ]
+
+        stats = self.reconcile(model_names=['Mandate', 'Subscription'])
+
+        self.assertEqual(stats['Subscription']['fetched'], 2)
+        self.assertEqual(stats['Subscription']['created'], 1)
+        self.assertEqual(stats['Subscription']['skipped'], 1)
+        self.assertEqual(
+            models.Subscription.objects.get().mandate_id,
+            self.MANDATE_INFO['id']
+        )
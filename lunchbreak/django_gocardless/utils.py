@@ -1,5 +1,10 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 from django.apps import apps
+from django.conf import settings
 from django.db import models
+from gocardless_pro.errors import GoCardlessProError
 
 from .exceptions import LinkedMerchantDoesNotExist, UnsupportedLinksError
 
@@ -18,6 +23,31 @@ LINKS_MODELS = {
     'payout': 'Payout',
     'refund': 'Refund',
 }
+# Models in the order they need to be fetched, so the links of the ones after
+# them can already be found locally.
+FETCH_ORDER = [
+    'Customer',
+    'CustomerBankAccount',
+    'Mandate',
+    'Subscription',
+    'Payout',
+    'Payment',
+    'Refund',
+]
+
+
+def get_link(links, attr):
+    if isinstance(links, dict):
+        return links.get(attr)
+    return getattr(links, attr, None)
+
+
+def links_model(attr):
+    """Model name and identifying field of a links attribute."""
+    argument_model = LINKS_MODELS[attr]
+    if isinstance(argument_model, dict):
+        return argument_model['model'], argument_model['id_field']
+    return argument_model, 'id'
 
 
 def model_from_links(links, attr, client=None):
@@ -30,11 +60,7 @@ def model_from_links(links, attr, client=None):
 
     merchant = None
     if client is None:
-        organisation = None
-        if not isinstance(links, dict):
-            organisation = links.organisation
-        else:
-            organisation = links.get('organisation')
+        organisation = get_link(links, 'organisation')
         if organisation is not None:
             from .models import Merchant
             try:
@@ -49,18 +75,10 @@ def model_from_links(links, attr, client=None):
                 )
 
     identifier = links[attr] if type(links) is dict else getattr(links, attr)
-    argument_model = LINKS_MODELS[attr]
-
-    if isinstance(argument_model, dict):
-        model_name = argument_model['model']
-        where = {
-            argument_model['id_field']: identifier
-        }
-    else:
-        model_name = argument_model
-        where = {
-            'id': identifier
-        }
+    model_name, id_field = links_model(attr)
+    where = {
+        id_field: identifier
+    }
 
     model_instance = None
     if identifier is not None:
@@ -83,6 +101,128 @@ def model_from_links(links, attr, client=None):
     return model_instance
 
 
+class LinksResolver(object):
+
+    """
+    Resolves the links of a batch of events at once, see `model_from_links`.
+
+    The identifiers of all links are collected with `add`, after which
+    `resolve` loads every model with a single query. Instances that are not
+    cached yet are fetched concurrently from the GoCardless API. Links that
+    could not be resolved fall back to `model_from_links` in `get`.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers if max_workers is not None \
+            else settings.GOCARDLESS.get('fetch_workers', 8)
+        # (model name, id field) -> {identifier: organisation}
+        self.identifiers = OrderedDict()
+        # (model name, identifier) -> instance
+        self.instances = {}
+
+    def add_identifier(self, attr, identifier, organisation=None):
+        if identifier is None:
+            return
+        identifiers = self.identifiers.setdefault(links_model(attr), {})
+        if identifiers.get(identifier) is None:
+            identifiers[identifier] = organisation
+
+    def add(self, links, attrs):
+        """Collect the links of an event.
+
+        Args:
+            links: Links of the event.
+            attrs (list): Attributes that will be requested with `get`.
+        """
+        organisation = get_link(links, 'organisation')
+        self.add_identifier('organisation', organisation)
+        for attr in attrs:
+            if attr in LINKS_MODELS:
+                self.add_identifier(attr, get_link(links, attr), organisation)
+
+    def resolve(self):
+        """Load the collected links locally or from the GoCardless API."""
+        misses = []
+        for (model_name, id_field), identifiers in self.identifiers.items():
+            model = apps.get_model('django_gocardless', model_name)
+            instances = model.objects.filter(
+                **{
+                    id_field + '__in': list(identifiers),
+                }
+            )
+            for instance in instances:
+                self.instances[
+                    (model_name, getattr(instance, id_field),)
+                ] = instance
+
+            # Merchants cannot be fetched
+            if model_name == 'Merchant':
+                continue
+            for identifier, organisation in identifiers.items():
+                if (model_name, identifier,) not in self.instances:
+                    misses.append((model, id_field, identifier, organisation,))
+
+        if misses:
+            self.fetch(misses)
+
+    def client(self, model, organisation):
+        merchant = self.instances.get(('Merchant', organisation,))
+        return model.client_from_settings(
+            access_token=merchant.access_token
+            if merchant is not None else None
+        )
+
+    def fetch(self, misses):
+        misses = [
+            (model, id_field, identifier, self.client(model, organisation),)
+            for model, id_field, identifier, organisation in misses
+            if organisation is None or ('Merchant', organisation,) in self.instances
+        ]
+        misses.sort(key=lambda miss: FETCH_ORDER.index(miss[0].__name__))
+
+        def get_resource(miss):
+            model, id_field, identifier, client = miss
+            try:
+                return model.api_from_client(client).get(identifier)
+            except GoCardlessProError:
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            resources = list(executor.map(get_resource, misses))
+
+        # Saving happens on this thread, in the order of FETCH_ORDER
+        for (model, id_field, identifier, client), resource in zip(misses, resources):
+            if resource is None:
+                continue
+            instance = model(
+                **{
+                    id_field: identifier,
+                }
+            )
+            instance.from_resource(resource, client)
+            instance.save()
+            self.instances[(model.__name__, identifier,)] = instance
+
+    def get(self, links, attr):
+        """Same as `model_from_links`, but using the resolved links."""
+        if attr not in LINKS_MODELS:
+            return model_from_links(links, attr)
+
+        organisation = get_link(links, 'organisation')
+        identifier = get_link(links, attr)
+        if organisation is not None \
+                and ('Merchant', organisation,) not in self.instances:
+            return model_from_links(links, attr)
+        if identifier is None:
+            return None
+
+        model_name, id_field = links_model(attr)
+        try:
+            return self.instances[(model_name, identifier,)]
+        except KeyError:
+            return model_from_links(links, attr)
+
+
 def field_default(field):
     cls = field.__class__
 
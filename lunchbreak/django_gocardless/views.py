@@ -9,12 +9,11 @@ from django.shortcuts import HttpResponseRedirect
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django.views.generic.base import RedirectView, View
-from gocardless_pro.resources import Event
+from webhooks.models import WebhookEvent
 
 from .exceptions import (BadRequestError, ExchangeAuthorisationError,
                          RedirectFlowAlreadyCompletedError,
                          RedirectFlowIncompleteError)
-from .handlers import EventHandler
 from .models import Merchant, RedirectFlow
 
 
@@ -103,7 +102,19 @@ class WebhookView(CSRFExemptView):
 
         if events is not None and isinstance(events, list):
             for event in events:
-                EventHandler(Event(event, None))
+                resource_type = event.get('resource_type', '')
+                # The links contain the ID of the resource under its singular
+                # name, e.g. mandates -> mandate.
+                object_id = event.get('links', {}).get(resource_type[:-1], '')
+                WebhookEvent.receive(
+                    provider=WebhookEvent.GOCARDLESS,
+                    event_id=event['id'],
+                    object_id='{resource_type}:{id}'.format(
+                        resource_type=resource_type,
+                        id=object_id
+                    ) if object_id else '',
+                    payload=event
+                )
 
             return HttpResponse(
                 status=200
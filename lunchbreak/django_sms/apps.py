@@ -4,3 +4,17 @@ from django.apps import AppConfig
 class DjangoSmsConfig(AppConfig):
     name = 'django_sms'
     verbose_name = 'SMS'
+
+    def ready(self):
+        from webhooks.models import WebhookEvent
+
+        from .models import Message
+
+        WebhookEvent.register_handler(
+            WebhookEvent.PLIVO,
+            Message.handle_webhook_event
+        )
+        WebhookEvent.register_handler(
+            WebhookEvent.TWILIO,
+            Message.handle_webhook_event
+        )
@@ -36,6 +36,66 @@ class Settings:
             3
         )
 
+    @property
+    def GATEWAY_TIMEOUT(self):
+        # Connect and read timeout in seconds
+        return self.settings.get(
+            'gateway_timeout',
+            (3.05, 10,)
+        )
+
+    @property
+    def GATEWAY_POOL_SIZE(self):
+        return self.settings.get(
+            'gateway_pool_size',
+            10
+        )
+
+    @property
+    def BREAKER_THRESHOLD(self):
+        # Consecutive failures before a gateway is skipped
+        return self.settings.get(
+            'breaker_threshold',
+            5
+        )
+
+    @property
+    def BREAKER_RESET_TIMEOUT(self):
+        return self.settings.get(
+            'breaker_reset_timeout',
+            timedelta(minutes=1)
+        )
+
+    @property
+    def STATS_WEIGHT(self):
+        # Weight of a new sample in the moving averages of DeliveryStats
+        return self.settings.get(
+            'stats_weight',
+            0.1
+        )
+
+    @property
+    def STATS_TIMEOUT(self):
+        return self.settings.get(
+            'stats_timeout',
+            timedelta(days=7)
+        )
+
+    @property
+    def ROUTING_MIN_SAMPLES(self):
+        return self.settings.get(
+            'routing_min_samples',
+            10
+        )
+
+    @property
+    def ROUTING_FAILURE_PENALTY(self):
+        # Delivery time a failure is worth when routing
+        return self.settings.get(
+            'routing_failure_penalty',
+            timedelta(minutes=2)
+        )
+
     @property
     def TEXT_TEMPLATE(self):
         # 'Hi, here is your code: {code}.'
@@ -49,6 +109,13 @@ class Settings:
     def PLIVO_SETTINGS(self):
         return self.settings['plivo']
 
+    @property
+    def PLIVO_URL(self):
+        return self.PLIVO_SETTINGS.get(
+            'url',
+            'https://api.plivo.com'
+        )
+
     @property
     def PLIVO_PHONE(self):
         return self.PLIVO_SETTINGS['phone']
@@ -69,6 +136,13 @@ class Settings:
     def TWILIO_SETTINGS(self):
         return self.settings['twilio']
 
+    @property
+    def TWILIO_URL(self):
+        return self.TWILIO_SETTINGS.get(
+            'url',
+            'https://api.twilio.com'
+        )
+
     @property
     def TWILIO_PHONE(self):
         return self.TWILIO_SETTINGS['phone']
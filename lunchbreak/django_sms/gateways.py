@@ -0,0 +1,303 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .conf import settings
+
+logger = logging.getLogger('lunchbreak')
+
+
+class CircuitBreaker:
+    """Skips a gateway while it is failing.
+
+    After ``threshold`` consecutive failures the breaker opens and no calls
+    are allowed for ``reset_timeout`` seconds. Afterwards a single trial call
+    is allowed, a success closes the breaker and a failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, threshold, reset_timeout):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def allow(self):
+        """Whether a call is allowed, reserving the trial call if half open."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at < self.reset_timeout:
+                return False
+            # Hold back other calls until the trial call finishes
+            self.opened_at = now
+            return True
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class Gateway:
+    """Long-lived client of an SMS gateway.
+
+    Requests share a pooled HTTP session and time out after
+    ``GATEWAY_TIMEOUT``. Sending does not touch the database so messages can
+    be sent from multiple threads, see ``send_many``.
+    """
+
+    name = None
+
+    def __init__(self):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=settings.GATEWAY_POOL_SIZE
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.breaker = CircuitBreaker(
+            threshold=settings.BREAKER_THRESHOLD,
+            reset_timeout=settings.BREAKER_RESET_TIMEOUT.total_seconds()
+        )
+
+    def message(self, phone, body):
+        """Send a message.
+
+        Args:
+            phone (Phone): Recipient.
+            body (str): Text of the message.
+
+        Returns:
+            Unsaved message.
+            Message
+        """
+        from .models import Message
+        message = Message(
+            phone=phone,
+            gateway=self.name
+        )
+
+        try:
+            self.deliver(message, body)
+        except requests.RequestException as e:
+            logger.exception(
+                str(e),
+                exc_info=True,
+                extra={
+                    'gateway': self.name,
+                    'phone': phone,
+                    'body': body,
+                }
+            )
+            message.status = Message.FAILED
+            message.error = str(e)
+            self.breaker.failure()
+
+        return message
+
+    def send(self, phone, body):
+        message = self.message(phone, body)
+        message.save()
+        return message
+
+    def send_many(self, messages):
+        """Send multiple messages at once over the pooled connections.
+
+        Args:
+            messages (list): ``(phone, body)`` tuples.
+
+        Returns:
+            Unsaved messages in the same order.
+            list
+        """
+        if not messages:
+            return []
+
+        workers = min(len(messages), settings.GATEWAY_POOL_SIZE)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(
+                executor.map(
+                    lambda message: self.message(*message),
+                    messages
+                )
+            )
+
+    def post(self, url, **kwargs):
+        return self.session.post(
+            url,
+            timeout=settings.GATEWAY_TIMEOUT,
+            **kwargs
+        )
+
+    def handle_status(self, status_code):
+        """Only server errors mean the gateway itself is failing."""
+        if status_code >= 500 or status_code == 429:
+            self.breaker.failure()
+        else:
+            self.breaker.success()
+
+    def deliver(self, message, body):
+        """Send the message and set its status, remote UUID or error."""
+        raise NotImplementedError()
+
+
+class PlivoGateway(Gateway):
+
+    name = 'plivo'
+
+    def deliver(self, message, body):
+        from .models import Message
+
+        response = self.post(
+            '{url}/v1/Account/{auth_id}/Message/'.format(
+                url=settings.PLIVO_URL,
+                auth_id=settings.PLIVO_AUTH_ID
+            ),
+            auth=(settings.PLIVO_AUTH_ID, settings.PLIVO_AUTH_TOKEN,),
+            json={
+                'src': settings.PLIVO_PHONE,
+                'dst': str(message.phone.phone),
+                'text': body,
+                'url': settings.PLIVO_WEBHOOK_URL,
+            }
+        )
+        self.handle_status(response.status_code)
+        try:
+            json_data = response.json()
+        except ValueError:
+            json_data = response.text
+
+        if response.status_code != 202:
+            logger.error(
+                'Failed to send Plivo message.',
+                extra={
+                    'phone': message.phone,
+                    'body': body,
+                    'plivo_message.status_code': response.status_code,
+                    'plivo_message.json_data': json_data
+                }
+            )
+
+            message.status = Message.FAILED
+            message.error = (
+                'Status code {status_code}, JSON data: \n{json_data}'.format(
+                    status_code=response.status_code,
+                    json_data=json_data
+                )
+            )
+            return
+
+        # Split messages are not supported.
+        message.remote_uuid = json_data['message_uuid'][0]
+
+
+class TwilioGateway(Gateway):
+
+    name = 'twilio'
+
+    def deliver(self, message, body):
+        from .models import Message
+
+        uri = '{url}/2010-04-01/Accounts/{account_sid}/Messages.json'.format(
+            url=settings.TWILIO_URL,
+            account_sid=settings.TWILIO_ACCOUNT_SID
+        )
+        response = self.post(
+            uri,
+            auth=(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN,),
+            data={
+                'To': str(message.phone.phone),
+                'From': settings.TWILIO_PHONE,
+                'Body': body,
+                'StatusCallback': settings.TWILIO_WEBHOOK_URL,
+            }
+        )
+        self.handle_status(response.status_code)
+        try:
+            json_data = response.json()
+        except ValueError:
+            json_data = {}
+
+        if response.status_code >= 400:
+            error = {
+                'uri': uri,
+                'status': response.status_code,
+                'msg': json_data.get('message', response.text),
+                'code': json_data.get('code', '?'),
+                'method': 'POST',
+            }
+            logger.error(
+                'Failed to send Twilio message.',
+                extra={
+                    'phone': message.phone,
+                    'body': body,
+                    'exception uri': error['uri'],
+                    'exception status': error['status'],
+                    'exception msg': error['msg'],
+                    'exception code': error['code'],
+                    'exception method': error['method'],
+                }
+            )
+
+            message.status = Message.FAILED
+            message.error = (
+                'uri: {uri}\n'
+                'status: {status}\n'
+                'msg: {msg}\n'
+                'code: {code}\n'
+                'method: {method}\n'.format(
+                    **error
+                )
+            )
+            return
+
+        message.remote_uuid = json_data['sid'][2:]
+        message.status = json_data['status']
+
+
+GATEWAY_CLASSES = {
+    PlivoGateway.name: PlivoGateway,
+    TwilioGateway.name: TwilioGateway,
+}
+gateways = {}
+gateways_lock = threading.Lock()
+
+
+def get_gateway(name):
+    """Long-lived gateway of the current process by name."""
+    with gateways_lock:
+        if name not in gateways:
+            gateways[name] = GATEWAY_CLASSES[name]()
+        return gateways[name]
+
+
+def reset_gateways():
+    with gateways_lock:
+        for gateway in gateways.values():
+            gateway.session.close()
+        gateways.clear()
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_sms', '0002_message_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeliveryStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gateway', models.CharField(choices=[('plivo', 'Plivo'), ('twilio', 'Twilio')], help_text='SMS gateway.', max_length=6, verbose_name='gateway')),
+                ('prefix', models.CharField(blank=True, help_text='Landcode, leeg voor alle landen.', max_length=4, verbose_name='landcode')),
+                ('samples', models.PositiveIntegerField(default=0, help_text='Aantal afgeleverde en gefaalde berichten.', verbose_name='berichten')),
+                ('latency', models.FloatField(blank=True, help_text='Gemiddelde aflevertijd in seconden.', null=True, verbose_name='aflevertijd')),
+                ('failure_ratio', models.FloatField(default=0.0, help_text='Gemiddeld aandeel gefaalde berichten.', verbose_name='faalratio')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Moment waarop de statistiek laatst bijgewerkt werd.', verbose_name='bijgewerkt op')),
+            ],
+            options={
+                'verbose_name': 'afleverstatistiek',
+                'verbose_name_plural': 'afleverstatistieken',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='deliverystats',
+            unique_together=set([('gateway', 'prefix')]),
+        ),
+    ]
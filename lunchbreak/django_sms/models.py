@@ -3,7 +3,7 @@ from random import randint
 
 from django.conf import settings as django_settings
 from django.core.urlresolvers import reverse
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.translation import ugettext as _
@@ -165,6 +165,10 @@ class Phone(models.Model):
 class Message(models.Model):
 
     class Meta:
+        index_together = (
+            ('phone', 'sent_at',),
+            ('gateway', 'remote_uuid',),
+        )
         verbose_name = _('bericht')
         verbose_name_plural = _('berichten')
 
@@ -259,9 +263,49 @@ class Message(models.Model):
             'Only messages sent via Twilio have an sid.'
         return 'MM' + str(self.remote_uuid)
 
-    def handle_status(self, status):
+    @classmethod
+    def handle_webhook_event(cls, event):
+        """Apply a status received through the webhook of a gateway.
+
+        Args:
+            event (WebhookEvent): Plivo or Twilio webhook event.
+        """
+        if event.provider == cls.TWILIO:
+            messages = cls.objects.filter(
+                gateway=cls.TWILIO,
+                remote_uuid=event.payload['MessageSid'][2:]
+            )
+            message_status = event.payload['MessageStatus']
+        else:
+            messages = cls.objects.filter(
+                gateway=cls.PLIVO,
+                remote_uuid=event.payload['MessageUUID']
+            )
+            message_status = event.payload['Status']
+
+        message = messages.select_related(
+            'phone',
+        ).get()
+        # Not when the event is handled, which can be after a retry
+        message.handle_status(
+            message_status,
+            at=event.received_at
+        )
+
+    def handle_status(self, status, at=None):
+        """Apply a status of the gateway.
+
+        Args:
+            status (str): Status.
+            at (datetime): Moment the gateway reported the status, defaults
+                to now.
+        """
+        finished = self.success or self.failure
         self.status = status
 
+        if not finished:
+            DeliveryStats.record(self, at=at)
+
         if self.failure:
             self.retry()
 
@@ -288,3 +332,169 @@ class Message(models.Model):
             domain=settings.DOMAIN,
             path=path
         )
+
+
+class DeliveryStats(models.Model):
+    """Rolling delivery statistics of a gateway.
+
+    Statistics are kept for every gateway overall and per country prefix as
+    exponentially weighted moving averages of the time between sending and
+    delivering a message and of the ratio of failed messages. They are kept
+    in the database so every process routes with the same statistics, rows
+    that were not updated for ``STATS_TIMEOUT`` start over.
+    """
+
+    class Meta:
+        unique_together = (('gateway', 'prefix',),)
+        verbose_name = _('afleverstatistiek')
+        verbose_name_plural = _('afleverstatistieken')
+
+    def __str__(self):
+        return '{gateway} {prefix}'.format(
+            gateway=self.gateway,
+            prefix=self.prefix
+        )
+
+    gateway = models.CharField(
+        max_length=6,
+        choices=Message.GATEWAYS,
+        verbose_name=_('gateway'),
+        help_text=_('SMS gateway.')
+    )
+    prefix = models.CharField(
+        max_length=4,
+        blank=True,
+        verbose_name=_('landcode'),
+        help_text=_('Landcode, leeg voor alle landen.')
+    )
+    samples = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('berichten'),
+        help_text=_('Aantal afgeleverde en gefaalde berichten.')
+    )
+    latency = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name=_('aflevertijd'),
+        help_text=_('Gemiddelde aflevertijd in seconden.')
+    )
+    failure_ratio = models.FloatField(
+        default=0.0,
+        verbose_name=_('faalratio'),
+        help_text=_('Gemiddeld aandeel gefaalde berichten.')
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('bijgewerkt op'),
+        help_text=_('Moment waarop de statistiek laatst bijgewerkt werd.')
+    )
+
+    @classmethod
+    def get(cls, gateway, prefix=''):
+        stats = cls.objects.filter(
+            gateway=gateway,
+            prefix=prefix
+        ).first()
+        if stats is None:
+            return cls(
+                gateway=gateway,
+                prefix=prefix
+            )
+        return stats.current()
+
+    @staticmethod
+    def get_prefix(phone):
+        """Country calling code of the given phone."""
+        country_code = getattr(phone.phone, 'country_code', None)
+        return str(country_code) if country_code is not None else ''
+
+    @property
+    def sufficient(self):
+        return self.samples >= settings.ROUTING_MIN_SAMPLES \
+            and self.latency is not None
+
+    @property
+    def score(self):
+        """Expected delivery time in seconds, failures count as a penalty."""
+        return self.latency + self.failure_ratio \
+            * settings.ROUTING_FAILURE_PENALTY.total_seconds()
+
+    def current(self):
+        """Start over if the statistics were not updated for STATS_TIMEOUT."""
+        if self.updated_at is not None \
+                and self.updated_at < timezone.now() - settings.STATS_TIMEOUT:
+            self.samples = 0
+            self.latency = None
+            self.failure_ratio = 0.0
+        return self
+
+    def add(self, failed, latency=None):
+        weight = settings.STATS_WEIGHT if self.samples > 0 else 1
+        self.failure_ratio += weight * (float(failed) - self.failure_ratio)
+        if latency is not None:
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency += weight * (latency - self.latency)
+        self.samples += 1
+
+    @classmethod
+    def record(cls, message, at=None):
+        """Add the result of a delivered or failed message.
+
+        Args:
+            message (Message): Message that was delivered or failed.
+            at (datetime): Moment the gateway reported the status, defaults
+                to now.
+        """
+        if message.success:
+            failed = False
+            at = at if at is not None else timezone.now()
+            latency = max(
+                (at - message.sent_at).total_seconds(),
+                0
+            )
+        elif message.failure:
+            failed = True
+            latency = None
+        else:
+            return
+
+        # Sorted, so concurrent updates lock the rows in the same order
+        for prefix in sorted({'', cls.get_prefix(message.phone)}):
+            with transaction.atomic():
+                stats, created = cls.objects.select_for_update().get_or_create(
+                    gateway=message.gateway,
+                    prefix=prefix
+                )
+                stats.current().add(failed=failed, latency=latency)
+                stats.save()
+
+    @classmethod
+    def best_gateway(cls, gateways, phone):
+        """Gateway with the best recent delivery time for the given phone.
+
+        Statistics of the country prefix of the phone are used if there are
+        enough samples for every gateway, otherwise the overall ones.
+
+        Args:
+            gateways (list): Names of the gateways.
+            phone (Phone): Recipient.
+
+        Returns:
+            Name of the gateway or None if not enough is known yet.
+            str
+        """
+        prefixes = (cls.get_prefix(phone), '',)
+        rows = {
+            (stats.gateway, stats.prefix,): stats.current()
+            for stats in cls.objects.filter(
+                gateway__in=gateways,
+                prefix__in=prefixes
+            )
+        }
+        for prefix in prefixes:
+            stats = [rows.get((gateway, prefix,)) for gateway in gateways]
+            if all(s is not None and s.sufficient for s in stats):
+                return min(stats, key=lambda s: s.score).gateway
+        return None
@@ -1,14 +1,8 @@
-import logging
-
-import plivo
 from celery import shared_task
 from Lunchbreak.tasks import DebugLoggingTask
-from twilio.base.exceptions import TwilioException, TwilioRestException
-from twilio.rest import Client as TwilioClient
 
 from .conf import settings
-
-logger = logging.getLogger('lunchbreak')
+from .gateways import get_gateway
 
 
 @shared_task(base=DebugLoggingTask)
@@ -28,13 +22,51 @@ def send_pin(phone_pk):
     )
 
 
-def send_message(phone, body):
-    from .models import Message
+@shared_task(base=DebugLoggingTask)
+def send_pins(phone_pks):
+    from .models import Phone
+    phones = Phone.objects.select_related(
+        'last_confirmed_message'
+    ).filter(
+        pk__in=phone_pks
+    )
+    messages = []
+    for phone in phones:
+        phone.reset_pin()
+        messages.append(
+            (
+                phone,
+                settings.TEXT_TEMPLATE.format(
+                    pin=phone.pin
+                ),
+            )
+        )
+    send_messages(messages)
+
 
-    if phone.last_confirmed_message is not None:
+def get_gateway_names(phone):
+    """Names of the gateways in the order they should be tried.
+
+    The gateway with the best recent delivery time goes first, unless the
+    last message to the phone failed on it. Without enough statistics the
+    gateway of the last (confirmed) message of the phone decides.
+    """
+    from .models import DeliveryStats, Message
+
+    last_message = phone.last_message
+    best = DeliveryStats.best_gateway(
+        [Message.PLIVO, Message.TWILIO],
+        phone
+    )
+    if best is not None and not (
+        last_message is not None and
+        last_message.gateway == best and
+        last_message.failure
+    ):
+        gateway = best
+    elif phone.last_confirmed_message is not None:
         gateway = phone.last_confirmed_message.gateway
     else:
-        last_message = phone.last_message
         use_plivo = last_message is None or (
             last_message.gateway == Message.PLIVO and
             last_message.success
@@ -44,134 +76,72 @@ def send_message(phone, body):
         )
         gateway = Message.PLIVO if use_plivo else Message.TWILIO
 
-    if gateway == Message.PLIVO:
-        message = send_message_plivo(phone, body)
-    else:
-        message = send_message_twilio(phone, body)
+    other = Message.TWILIO if gateway == Message.PLIVO else Message.PLIVO
+    return [gateway, other]
 
-    if message is None or message.failure:
-        if gateway == Message.PLIVO:
-            message = send_message_twilio(phone, body)
-        else:
-            message = send_message_plivo(phone, body)
 
+def pop_gateway(names):
+    """Remove and return the first gateway that is not being skipped.
 
-def send_message_plivo(phone, body):
-    api = plivo.RestAPI(
-        settings.PLIVO_AUTH_ID,
-        settings.PLIVO_AUTH_TOKEN
-    )
-    plivo_message = api.Message.send(
-        src=settings.PLIVO_PHONE,
-        dst=str(phone.phone),
-        text=body,
-        url=settings.PLIVO_WEBHOOK_URL
-    )
+    If the circuit breakers of all gateways are open, the first one is tried
+    anyway.
+    """
+    for i, name in enumerate(names):
+        if get_gateway(name).breaker.allow():
+            return get_gateway(names.pop(i))
+    return get_gateway(names.pop(0))
 
-    from .models import Message
-    message = Message(
-        phone=phone,
-        gateway=Message.PLIVO
-    )
 
-    if plivo_message.status_code != 202:
-        logger.exception(
-            'Failed to send Plivo message.',
-            extra={
-                'phone': phone,
-                'body': body,
-                'plivo_message.status_code': plivo_message.status_code,
-                'plivo_message.json_data': plivo_message.json_data
-            }
-        )
-
-        message.status = Message.FAILED
-        message.error = (
-            'Status code {status_code}, JSON data: \n{json_data}'.format(
-                status_code=plivo_message.status_code,
-                json_data=plivo_message.json_data
-            )
-        )
-        message.save()
-        return message
-
-    # Split messages are not supported.
-    message.remote_uuid = plivo_message.json_data['message_uuid'][0]
-    message.save()
+def send_message(phone, body):
+    from .models import DeliveryStats
+
+    names = get_gateway_names(phone)
+    message = None
+    while names:
+        message = pop_gateway(names).send(phone, body)
+        if not message.failure:
+            break
+        DeliveryStats.record(message)
     return message
 
 
-def send_message_twilio(phone, body):
-    client = TwilioClient(
-        settings.TWILIO_ACCOUNT_SID,
-        settings.TWILIO_AUTH_TOKEN
-    )
-
-    from .models import Message
-    message = Message(
-        phone=phone,
-        gateway=Message.TWILIO
-    )
-
-    try:
-        twilio_message = client.messages.create(
-            to=str(phone.phone),
-            from_=settings.TWILIO_PHONE,
-            body=body,
-            status_callback=settings.TWILIO_WEBHOOK_URL
-        )
-    except TwilioRestException as e:
-        logger.exception(
-            str(e),
-            exc_info=True,
-            extra={
-                'phone': phone,
-                'body': body,
-                'exception uri': getattr(e, 'uri', '?'),
-                'exception status': getattr(e, 'status', '?'),
-                'exception msg': getattr(e, 'msg', '?'),
-                'exception code': getattr(e, 'code', '?'),
-                'exception method': getattr(e, 'method', '?'),
-            }
-        )
-
-        message.status = Message.FAILED
-        message.error = (
-            'uri: {uri}\n'
-            'status: {status}\n'
-            'msg: {msg}\n'
-            'code: {code}\n'
-            'method: {method}\n'.format(
-                uri=getattr(e, 'uri', '?'),
-                status=getattr(e, 'status', '?'),
-                msg=getattr(e, 'msg', '?'),
-                code=getattr(e, 'code', '?'),
-                method=getattr(e, 'method', '?')
+def send_messages(messages):
+    """Send multiple messages, concurrently per gateway.
+
+    Messages that failed are retried on the next gateway.
+
+    Args:
+        messages (list): ``(phone, body)`` tuples.
+
+    Returns:
+        The last message sent to each of the phones.
+        list
+    """
+    from .models import DeliveryStats, Message
+
+    pending = [
+        (phone, body, get_gateway_names(phone),)
+        for phone, body in messages
+    ]
+    results = {}
+    while pending:
+        batches = {}
+        for phone, body, names in pending:
+            gateway = pop_gateway(names)
+            batches.setdefault(gateway, []).append((phone, body, names,))
+
+        pending = []
+        sent = []
+        for gateway, batch in batches.items():
+            batch_messages = gateway.send_many(
+                [(phone, body,) for phone, body, names in batch]
             )
-        )
-        message.save()
-        return message
-    except TwilioException as e:
-        logger.exception(
-            str(e),
-            exc_info=True,
-            extra={
-                'phone': phone,
-                'body': body,
-                'exception uri': getattr(e, 'uri', '?'),
-                'exception status': getattr(e, 'status', '?'),
-                'exception msg': getattr(e, 'msg', '?'),
-                'exception code': getattr(e, 'code', '?'),
-                'exception method': getattr(e, 'method', '?'),
-            }
-        )
-
-        message.status = Message.FAILED
-        message.error = str(e)
-        message.save()
-        return message
-
-    message.remote_uuid = twilio_message.sid[2:]
-    message.status = twilio_message.status
-    message.save()
-    return message
+            for (phone, body, names), message in zip(batch, batch_messages):
+                sent.append(message)
+                results[phone.pk] = message
+                DeliveryStats.record(message)
+                if message.failure and names:
+                    pending.append((phone, body, names,))
+        Message.objects.bulk_create(sent)
+
+    return [results[phone.pk] for phone, body in messages]
@@ -0,0 +1,113 @@
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StandInGateway:
+    """Local HTTP server standing in for an SMS gateway.
+
+    Attributes:
+        latency (float): Seconds to wait before responding.
+        status (int): Status code of the responses, a success if None.
+        json (dict): Body of the responses, a success if None.
+        requests (list): Paths and bodies of the requests received.
+    """
+
+    success_status = 200
+
+    def __init__(self):
+        self.requests = []
+        self.reset()
+
+        gateway = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                gateway.requests.append(
+                    (self.path, self.rfile.read(length),)
+                )
+                time.sleep(gateway.latency)
+
+                status = gateway.status or gateway.success_status
+                body = gateway.json if gateway.json is not None else gateway.success()
+                content = json.dumps(body).encode('utf-8')
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(content)))
+                    self.end_headers()
+                    self.wfile.write(content)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client timed out
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever,
+            daemon=True
+        )
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return 'http://{host}:{port}'.format(
+            host=host,
+            port=port
+        )
+
+    @property
+    def call_count(self):
+        return len(self.requests)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset(self):
+        self.latency = 0
+        self.status = None
+        self.json = None
+        del self.requests[:]
+
+    def success(self):
+        raise NotImplementedError()
+
+
+class PlivoStandIn(StandInGateway):
+
+    success_status = 202
+
+    def success(self):
+        return {
+            'api_id': str(uuid.uuid4()),
+            'message': 'message(s) queued',
+            'message_uuid': [
+                str(uuid.uuid4()),
+            ],
+        }
+
+
+class TwilioStandIn(StandInGateway):
+
+    success_status = 201
+
+    def success(self):
+        return {
+            'sid': 'SM' + uuid.uuid4().hex,
+            'status': 'queued',
+        }
@@ -0,0 +1,141 @@
+import time
+
+import mock
+
+from ..gateways import CircuitBreaker, get_gateway
+from ..models import Message, Phone
+from ..tasks import send_message, send_messages
+from .testcase import DjangoSmsTestCase
+
+
+class GatewayTestCase(DjangoSmsTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.phone = Phone.objects.create(
+            phone=self.PHONE
+        )
+
+    @mock.patch('time.monotonic')
+    def test_circuit_breaker(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        breaker = CircuitBreaker(threshold=2, reset_timeout=10)
+
+        breaker.failure()
+        self.assertTrue(breaker.allow())
+        breaker.failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+
+        # A single trial call is allowed after the reset timeout
+        mock_monotonic.return_value = 110
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.failure()
+        self.assertFalse(breaker.allow())
+
+        mock_monotonic.return_value = 120
+        self.assertTrue(breaker.allow())
+        breaker.success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow())
+
+    def test_pooled(self):
+        """Test whether gateways are reused."""
+        self.assertIs(get_gateway(Message.PLIVO), get_gateway(Message.PLIVO))
+        self.assertIsNot(get_gateway(Message.PLIVO), get_gateway(Message.TWILIO))
+
+    def test_timeout(self):
+        """Test whether a slow gateway fails over to the other one."""
+        self.plivo.latency = 0.5
+
+        with self.sms_settings(gateway_timeout=(1, 0.1,)):
+            message = send_message(
+                phone=self.phone,
+                body='body'
+            )
+
+        self.assertEqual(message.gateway, Message.TWILIO)
+        self.assertFalse(message.failure)
+        self.assertEqual(
+            Message.objects.get(gateway=Message.PLIVO).status,
+            Message.FAILED
+        )
+        self.assertEqual(get_gateway(Message.PLIVO).breaker.failures, 1)
+
+    def test_circuit_open(self):
+        """Test whether a failing gateway is skipped."""
+        self.plivo.status = 503
+        self.plivo.json = {}
+
+        with self.sms_settings(breaker_threshold=2):
+            for i in range(2):
+                send_message(
+                    phone=self.phone,
+                    body='body'
+                )
+            self.assertEqual(self.plivo.call_count, 2)
+            self.assertEqual(
+                get_gateway(Message.PLIVO).breaker.state,
+                CircuitBreaker.OPEN
+            )
+
+            message = send_message(
+                phone=self.phone,
+                body='body'
+            )
+
+        self.assertEqual(self.plivo.call_count, 2)
+        self.assertEqual(message.gateway, Message.TWILIO)
+
+    def test_client_errors(self):
+        """Test whether rejected messages do not open the circuit."""
+        self.plivo.status = 400
+        self.plivo.json = {}
+
+        with self.sms_settings(breaker_threshold=1):
+            send_message(
+                phone=self.phone,
+                body='body'
+            )
+
+        self.assertEqual(
+            get_gateway(Message.PLIVO).breaker.state,
+            CircuitBreaker.CLOSED
+        )
+
+    def test_send_messages(self):
+        """Test whether messages are sent concurrently and retried."""
+        phones = [self.phone] + [
+            Phone.objects.create(
+                phone='+3247290760{}'.format(i)
+            ) for i in range(4)
+        ]
+        self.plivo.latency = 0.2
+
+        start = time.monotonic()
+        messages = send_messages(
+            [(phone, 'body',) for phone in phones]
+        )
+        duration = time.monotonic() - start
+
+        self.assertLess(duration, self.plivo.latency * len(phones))
+        self.assertEqual(self.plivo.call_count, len(phones))
+        self.assertEqual(
+            [message.phone for message in messages],
+            phones
+        )
+        self.assertEqual(Message.objects.count(), len(phones))
+
+        self.plivo.reset()
+        self.plivo.status = 500
+        self.plivo.json = {}
+        messages = send_messages(
+            [(phone, 'body',) for phone in phones]
+        )
+        self.assertEqual(self.twilio.call_count, len(phones))
+        self.assertTrue(
+            all(message.gateway == Message.TWILIO for message in messages)
+        )
+        self.assertEqual(Message.objects.count(), len(phones) * 3)
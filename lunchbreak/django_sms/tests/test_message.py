@@ -1,5 +1,3 @@
-from twilio.base.exceptions import TwilioRestException
-
 from ..models import Message, Phone
 from ..tasks import send_message
 from .testcase import DjangoSmsTestCase
@@ -28,11 +26,11 @@ class MessageTestCase(DjangoSmsTestCase):
         )
 
         self.assertEqual(
-            self.mock_plivo.call_count,
+            self.plivo.call_count,
             0
         )
         self.assertEqual(
-            self.mock_twilio.call_count,
+            self.twilio.call_count,
             1
         )
         self.assertEqual(
@@ -44,8 +42,8 @@ class MessageTestCase(DjangoSmsTestCase):
         last_message.save()
         self.phone.refresh_from_db()
 
-        self.mock_plivo.reset_mock()
-        self.mock_twilio.reset_mock()
+        self.plivo.reset()
+        self.twilio.reset()
 
         send_message(
             phone=self.phone,
@@ -53,11 +51,11 @@ class MessageTestCase(DjangoSmsTestCase):
         )
 
         self.assertEqual(
-            self.mock_plivo.call_count,
+            self.plivo.call_count,
             1
         )
         self.assertEqual(
-            self.mock_twilio.call_count,
+            self.twilio.call_count,
             0
         )
         self.assertEqual(
@@ -72,8 +70,8 @@ class MessageTestCase(DjangoSmsTestCase):
             status=Message.FAILED
         )
 
-        self.plivo_message.status_code = 500
-        self.plivo_message.json_data = {
+        self.plivo.status = 500
+        self.plivo.json = {
             'some': 'error'
         }
 
@@ -83,11 +81,11 @@ class MessageTestCase(DjangoSmsTestCase):
         )
 
         self.assertEqual(
-            self.mock_plivo.call_count,
+            self.plivo.call_count,
             1
         )
         self.assertEqual(
-            self.mock_twilio.call_count,
+            self.twilio.call_count,
             1
         )
         self.assertEqual(
@@ -101,7 +99,7 @@ class MessageTestCase(DjangoSmsTestCase):
             gateway=Message.PLIVO
         )
         self.assertIn(
-            str(self.plivo_message.status_code),
+            str(self.plivo.status),
             plivo_message.error
         )
         self.assertIn(
@@ -120,14 +118,11 @@ class MessageTestCase(DjangoSmsTestCase):
             status=Message.FAILED
         )
 
-        exception = TwilioRestException(
-            status=500,
-            uri='uri',
-            msg='msg',
-            code='code',
-            method='GET'
-        )
-        self.mock_twilio.side_effect = exception
+        self.twilio.status = 500
+        self.twilio.json = {
+            'code': 20500,
+            'message': 'msg',
+        }
 
         send_message(
             phone=self.phone,
@@ -135,11 +130,11 @@ class MessageTestCase(DjangoSmsTestCase):
         )
 
         self.assertEqual(
-            self.mock_plivo.call_count,
+            self.plivo.call_count,
             1
         )
         self.assertEqual(
-            self.mock_twilio.call_count,
+            self.twilio.call_count,
             1
         )
         self.assertEqual(
@@ -158,22 +153,22 @@ class MessageTestCase(DjangoSmsTestCase):
         )
 
         self.assertIn(
-            str(exception.status),
+            str(self.twilio.status),
             twilio_message.error
         )
         self.assertIn(
-            exception.uri,
+            self.twilio.url,
             twilio_message.error
         )
         self.assertIn(
-            exception.msg,
+            self.twilio.json['message'],
             twilio_message.error
         )
         self.assertIn(
-            exception.code,
+            str(self.twilio.json['code']),
             twilio_message.error
         )
         self.assertIn(
-            exception.method,
+            'POST',
             twilio_message.error
         )
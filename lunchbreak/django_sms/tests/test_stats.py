@@ -0,0 +1,158 @@
+import uuid
+from datetime import timedelta
+
+import mock
+from django.utils import timezone
+from webhooks.models import WebhookEvent
+
+from ..models import DeliveryStats, Message, Phone
+from ..tasks import get_gateway_names
+from .testcase import DjangoSmsTestCase
+
+
+class DeliveryStatsTestCase(DjangoSmsTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.phone = Phone.objects.create(
+            phone=self.PHONE
+        )
+
+        patcher_retry = mock.patch.object(Message, 'retry')
+        self.addCleanup(patcher_retry.stop)
+        patcher_retry.start()
+
+    def deliver(self, gateway, latency, status=Message.DELIVERED, phone=None):
+        message = Message.objects.create(
+            phone=self.phone if phone is None else phone,
+            gateway=gateway,
+            status=Message.SENT,
+            sent_at=timezone.now() - timedelta(seconds=latency)
+        )
+        message.handle_status(status)
+        return message
+
+    def test_record(self):
+        """Test whether delivered and failed messages update the averages."""
+        self.deliver(Message.PLIVO, latency=10)
+        stats = DeliveryStats.get(Message.PLIVO)
+        self.assertEqual(stats.samples, 1)
+        self.assertAlmostEqual(stats.latency, 10, places=0)
+        self.assertEqual(stats.failure_ratio, 0)
+
+        self.deliver(Message.PLIVO, latency=20, status=Message.FAILED)
+        stats = DeliveryStats.get(Message.PLIVO)
+        self.assertEqual(stats.samples, 2)
+        self.assertAlmostEqual(stats.latency, 10, places=0)
+        self.assertGreater(stats.failure_ratio, 0)
+        self.assertEqual(
+            DeliveryStats.get(Message.PLIVO, '32').samples,
+            2
+        )
+        self.assertEqual(DeliveryStats.get(Message.TWILIO).samples, 0)
+
+        # Only the first final status counts
+        message = self.deliver(Message.TWILIO, latency=5)
+        message.handle_status(Message.DELIVERED)
+        self.assertEqual(DeliveryStats.get(Message.TWILIO).samples, 1)
+
+    def test_webhook_latency(self):
+        """Test whether the latency ends when the status was received, not
+        when it was handled."""
+        sent_at = timezone.now() - timedelta(minutes=10)
+        message = Message.objects.create(
+            phone=self.phone,
+            gateway=Message.TWILIO,
+            remote_uuid=uuid.uuid4(),
+            status=Message.SENT,
+            sent_at=sent_at
+        )
+        event = WebhookEvent(
+            provider=WebhookEvent.TWILIO,
+            payload={
+                'MessageSid': 'SM' + message.remote_uuid.hex,
+                'MessageStatus': Message.DELIVERED,
+            },
+            received_at=sent_at + timedelta(seconds=30)
+        )
+        Message.handle_webhook_event(event)
+
+        self.assertAlmostEqual(
+            DeliveryStats.get(Message.TWILIO).latency,
+            30,
+            places=0
+        )
+
+    def test_timeout(self):
+        """Test whether statistics that were not updated for a while start
+        over."""
+        self.deliver(Message.PLIVO, latency=10)
+        DeliveryStats.objects.update(
+            updated_at=timezone.now() - timedelta(days=8)
+        )
+        self.assertEqual(DeliveryStats.get(Message.PLIVO).samples, 0)
+
+        self.deliver(Message.PLIVO, latency=20)
+        stats = DeliveryStats.get(Message.PLIVO)
+        self.assertEqual(stats.samples, 1)
+        self.assertAlmostEqual(stats.latency, 20, places=0)
+
+    def test_routing(self):
+        """Test whether new PINs are sent through the fastest gateway."""
+        with self.sms_settings(routing_min_samples=3):
+            self.assertEqual(get_gateway_names(self.phone)[0], Message.PLIVO)
+
+            for i in range(3):
+                self.deliver(Message.PLIVO, latency=60)
+                self.deliver(Message.TWILIO, latency=5)
+            phone = Phone.objects.get(pk=self.phone.pk)
+            self.assertEqual(
+                get_gateway_names(phone),
+                [Message.TWILIO, Message.PLIVO]
+            )
+
+            # Failures are penalised
+            for i in range(10):
+                self.deliver(Message.TWILIO, latency=5, status=Message.FAILED)
+            other_phone = Phone.objects.create(
+                phone='+32472907606'
+            )
+            self.assertEqual(
+                get_gateway_names(other_phone)[0],
+                Message.PLIVO
+            )
+
+            # A gateway that just failed for the phone is not tried first
+            self.deliver(
+                Message.PLIVO,
+                latency=5,
+                status=Message.FAILED,
+                phone=other_phone
+            )
+            other_phone = Phone.objects.get(pk=other_phone.pk)
+            self.assertEqual(
+                get_gateway_names(other_phone)[0],
+                Message.TWILIO
+            )
+
+    def test_prefix(self):
+        """Test whether statistics of the country prefix come first."""
+        foreign_phone = Phone.objects.create(
+            phone='+31612345678'
+        )
+        with self.sms_settings(routing_min_samples=2):
+            for i in range(2):
+                self.deliver(Message.PLIVO, latency=5)
+                self.deliver(Message.TWILIO, latency=30)
+            for i in range(4):
+                self.deliver(Message.PLIVO, latency=60, phone=foreign_phone)
+                self.deliver(Message.TWILIO, latency=10, phone=foreign_phone)
+
+            self.assertEqual(
+                get_gateway_names(self.phone)[0],
+                Message.PLIVO
+            )
+            self.assertEqual(
+                get_gateway_names(foreign_phone)[0],
+                Message.TWILIO
+            )
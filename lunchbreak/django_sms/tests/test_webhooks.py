@@ -2,9 +2,9 @@ import uuid
 from urllib.parse import urlencode
 
 from django.core.urlresolvers import reverse
-from django.http import Http404
 from mock import patch
 from rest_framework import status
+from webhooks.models import WebhookEvent
 
 from ..models import Message, Phone
 from ..utils import validate_plivo_signature
@@ -118,6 +118,7 @@ class WebhookTestCase(DjangoSmsTestCase):
             response.status_code,
             status.HTTP_200_OK
         )
+        WebhookEvent.process_batch()
         self.assertFalse(
             mock_retry.called
         )
@@ -142,13 +143,14 @@ class WebhookTestCase(DjangoSmsTestCase):
             response.status_code,
             status.HTTP_200_OK
         )
+        WebhookEvent.process_batch()
         self.assertTrue(
             mock_retry.called
         )
 
     @patch('django_sms.views.PlivoWebhookView.is_valid')
     def test_plivo_webhook_notfound(self, mock_valid):
-        """Messages that aren't found, should return a 404."""
+        """Messages that aren't found are retried later."""
 
         mock_valid.return_value = True
 
@@ -157,12 +159,43 @@ class WebhookTestCase(DjangoSmsTestCase):
             data=urlencode(self.NOTFOUND_PLIVO_POST),
             content_type='application/x-www-form-urlencoded'
         )
-        self.assertRaises(
-            Http404,
-            self.as_view,
-            request,
-            PlivoWebhookView
+        response = self.as_view(request, PlivoWebhookView)
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK
         )
+        self.assertEqual(WebhookEvent.process_batch(), (1, 0,))
+
+        event = WebhookEvent.objects.get()
+        self.assertIsNone(event.processed_at)
+        self.assertIsNotNone(event.retry_at)
+        self.assertEqual(event.attempts, 1)
+
+    @patch('django_sms.models.Message.retry')
+    @patch('django_sms.views.PlivoWebhookView.is_valid')
+    def test_plivo_webhook_duplicate(self, mock_valid, mock_retry):
+        """Webhooks that are sent again are only handled once."""
+
+        mock_valid.return_value = True
+
+        self.message.gateway = Message.PLIVO
+        self.message.save()
+
+        for i in range(2):
+            request = self.factory.post(
+                reverse('django_sms:plivo'),
+                data=urlencode(self.REJECTED_PLIVO_POST),
+                content_type='application/x-www-form-urlencoded'
+            )
+            response = self.as_view(request, PlivoWebhookView)
+            self.assertEqual(
+                response.status_code,
+                status.HTTP_200_OK
+            )
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+
+        WebhookEvent.process_batch()
+        self.assertEqual(mock_retry.call_count, 1)
 
     @patch('django_sms.views.PlivoWebhookView.is_valid')
     def test_plivo_webhook_malformed(self, mock_valid):
@@ -1,14 +1,17 @@
 import logging
-import uuid
+from copy import deepcopy
 from datetime import timedelta
 
 import mock
+from django.conf import settings as django_settings
+from django.core.cache import cache
 from django.test.utils import override_settings
 from Lunchbreak.tests.testcase import LunchbreakTestCase
-from pendulum import Pendulum
 
-from ..models import Message
+from ..gateways import reset_gateways
+from ..models import Message  # noqa
 from ..tasks import send_pin
+from .gateways import PlivoStandIn, TwilioStandIn
 
 
 @override_settings(SMS={
@@ -36,49 +39,49 @@ class DjangoSmsTestCase(LunchbreakTestCase):
     PIN = '123456'
     INVALID_PIN = '654321'
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.plivo = PlivoStandIn()
+        cls.twilio = TwilioStandIn()
+        cls.plivo.start()
+        cls.twilio.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.plivo.stop()
+        cls.twilio.stop()
+        super().tearDownClass()
+
     def setUp(self):
         super().setUp()
 
-        # Patch requests
-        patcher_send_pin = mock.patch('django_sms.models.send_pin.delay')
-        patcher_plivo = mock.patch('plivo.Message.send')
-        patcher_twilio = mock.patch(
-            'twilio.rest.Client.messages',
-            new_callable=mock.PropertyMock
-        )
+        # Send messages to the stand-in gateways
+        sms = deepcopy(django_settings.SMS)
+        sms['plivo']['url'] = self.plivo.url
+        sms['twilio']['url'] = self.twilio.url
+        settings_override = override_settings(SMS=sms)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
 
-        self.addCleanup(patcher_send_pin.stop)
-        self.addCleanup(patcher_plivo.stop)
-        self.addCleanup(patcher_twilio.stop)
+        self.plivo.reset()
+        self.twilio.reset()
+        cache.clear()
+        reset_gateways()
+        self.addCleanup(reset_gateways)
 
+        patcher_send_pin = mock.patch('django_sms.models.send_pin.delay')
+        self.addCleanup(patcher_send_pin.stop)
         self.mock_send_pin = patcher_send_pin.start()
-        self.mock_plivo = patcher_plivo.start()
-        self.mock_twilio = patcher_twilio.start()
-
-        self.twilio_message = mock.MagicMock()
-
-        def create(*args, **kwargs):
-            message = mock.MagicMock()
-            message.sid = 'aa' + str(uuid.uuid4())
-            message.status = Message.QUEUED
-            message.date_sent = Pendulum.now().isoformat()
-            return message
-
-        self.twilio_message.create = create
-        self.mock_twilio.return_value = self.twilio_message
-
-        self.plivo_message = mock.MagicMock()
-        self.plivo_message.status_code = 202
-        self.plivo_message.json_data = {
-            'message_uuid': [
-                uuid.uuid4(),
-            ],
-        }
-        self.mock_plivo.return_value = self.plivo_message
         self.mock_send_pin.side_effect = send_pin
 
         logging.disable(logging.CRITICAL)
 
+    def sms_settings(self, **kwargs):
+        sms = deepcopy(django_settings.SMS)
+        sms.update(kwargs)
+        return override_settings(SMS=sms)
+
     def tearDown(self):
         super().tearDown()
 
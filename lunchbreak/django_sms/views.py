@@ -3,9 +3,9 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django.views.generic.base import View
 from twilio.request_validator import RequestValidator
+from webhooks.models import WebhookEvent
 
 from .conf import settings
-from .models import Message
 from .utils import validate_plivo_signature
 
 
@@ -40,18 +40,15 @@ class TwilioWebhookView(ValidatedView):
         if message_sid is None or message_status is None:
             return HttpResponseBadRequest()
 
-        message_id = message_sid[2:]
-
-        try:
-            message = Message.objects.select_related(
-                'phone',
-            ).get(
-                remote_uuid=message_id
-            )
-        except Message.DoesNotExist:
-            raise Http404()
-
-        message.handle_status(message_status)
+        WebhookEvent.receive(
+            provider=WebhookEvent.TWILIO,
+            event_id='{sid}:{status}'.format(
+                sid=message_sid,
+                status=message_status
+            ),
+            object_id=message_sid,
+            payload=request.POST.dict()
+        )
         return HttpResponse(
             status=200
         )
@@ -74,17 +71,15 @@ class PlivoWebhookView(ValidatedView):
         if message_id is None or message_status is None:
             return HttpResponseBadRequest()
 
-        try:
-            message = Message.objects.select_related(
-                'phone',
-            ).get(
-                gateway=Message.PLIVO,
-                remote_uuid=message_id
-            )
-        except Message.DoesNotExist:
-            raise Http404()
-
-        message.handle_status(message_status)
+        WebhookEvent.receive(
+            provider=WebhookEvent.PLIVO,
+            event_id='{uuid}:{status}'.format(
+                uuid=message_id,
+                status=message_status
+            ),
+            object_id=message_id,
+            payload=request.POST.dict()
+        )
         return HttpResponse(
             status=200
         )
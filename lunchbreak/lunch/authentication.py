@@ -1,7 +1,81 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
 from rest_framework import authentication
 from rest_framework.exceptions import AuthenticationFailed
 
 
+class TokenCache:
+    """Per-process LRU cache of recently verified tokens.
+
+    Entries expire after ``ttl`` seconds and the least recently used entry is
+    dropped when the cache is full. Entries are invalidated in the current
+    process when their token or its user, staff or employee is saved or
+    deleted, see ``TokenCache.changed``. Other processes rely on the TTL.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires, token, principal = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return token
+
+    def set(self, key, token, principal):
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (
+                time.monotonic() + self.ttl,
+                token,
+                (principal._meta.label, principal.pk,),
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, instance):
+        """Remove the entries of the given token or of the tokens of the given
+        user, staff or employee."""
+        label = instance._meta.label
+        with self._lock:
+            for key, (expires, token, principal) in list(self._entries.items()):
+                if (key[0] == label and token.pk == instance.pk) \
+                        or principal == (label, instance.pk,):
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def changed(sender, instance, **kwargs):
+        token_cache.invalidate(instance)
+
+
+token_cache = TokenCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.TOKEN_CACHE_TTL
+)
+
+
 class TokenAuthentication(authentication.BaseAuthentication):
 
     def authenticate(self, request):
@@ -26,22 +100,62 @@ class TokenAuthentication(authentication.BaseAuthentication):
                 'Either model_id or phone must be passed to TokenAuthentication._authenticate.'
             )
 
-        try:
-            arguments = {
-                'device': device
-            }
-            arguments.update(filter_args)
-
-            model_tokens = self.TOKEN_MODEL.objects.select_related(
-                self.MODEL_NAME
-            ).filter(
-                **arguments
+        digest = self.TOKEN_MODEL.digest(identifier)
+        cache_key = (
+            self.TOKEN_MODEL._meta.label,
+            digest,
+            device,
+            tuple(sorted(filter_args.items())),
+        )
+        model_token = token_cache.get(cache_key)
+
+        if model_token is None:
+            model_token = self._find_token(
+                identifier=identifier,
+                digest=digest,
+                device=device,
+                filter_args=filter_args
+            )
+            token_cache.set(
+                cache_key,
+                model_token,
+                getattr(model_token, self.MODEL_NAME)
             )
-            for model_token in model_tokens:
-                if model_token.check_identifier(identifier):
-                    return (getattr(model_token, self.MODEL_NAME), model_token)
-        except self.TOKEN_MODEL.DoesNotExist:
-            pass
+
+        # Requests must not share the cached instances
+        model_token = copy.copy(model_token)
+        model = copy.copy(getattr(model_token, self.MODEL_NAME))
+        setattr(model_token, self.MODEL_NAME, model)
+        return (model, model_token)
+
+    def _find_token(self, identifier, digest, device, filter_args):
+        """Look up a token by its keyed digest.
+
+        Tokens created before ``BaseToken.identifier_digest`` existed are
+        checked the old way and get their digest stored when they match.
+        """
+        arguments = {
+            'device': device
+        }
+        arguments.update(filter_args)
+        model_tokens = self.TOKEN_MODEL.objects.select_related(
+            self.MODEL_NAME
+        ).filter(
+            **arguments
+        )
+
+        model_token = model_tokens.filter(
+            identifier_digest=digest
+        ).first()
+        if model_token is not None \
+                and model_token.check_identifier(identifier, digest=digest):
+            return model_token
+
+        for model_token in model_tokens.filter(identifier_digest=''):
+            if model_token.check_identifier(identifier):
+                model_token.migrate_identifier(digest)
+                return model_token
+
         raise AuthenticationFailed(
             '{model_name}Token not found.'.format(
                 model_name=self.MODEL_NAME.capitalize()
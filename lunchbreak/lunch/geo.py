@@ -0,0 +1,82 @@
+import math
+
+EARTH_RADIUS = 6371
+# Grid cells are 0.1° high and wide, about 11km by 7km in Belgium.
+GRID_CELLS_PER_DEGREE = 10
+GRID_ROWS = 180 * GRID_CELLS_PER_DEGREE
+GRID_COLUMNS = 360 * GRID_CELLS_PER_DEGREE
+
+
+def grid_row(latitude):
+    row = int(math.floor((float(latitude) + 90) * GRID_CELLS_PER_DEGREE))
+    return min(max(row, 0), GRID_ROWS - 1)
+
+
+def grid_column(longitude):
+    column = int(math.floor((float(longitude) + 180) * GRID_CELLS_PER_DEGREE))
+    return column % GRID_COLUMNS
+
+
+def grid_cell(latitude, longitude):
+    """Grid cell containing the given coordinates.
+
+    Cells are numbered row by row starting at the south pole and the
+    antimeridian, the cells of a row are consecutive integers.
+
+    Returns:
+        int: Cell number or None if a coordinate is missing.
+    """
+    if latitude is None or longitude is None:
+        return None
+    return grid_row(latitude) * GRID_COLUMNS + grid_column(longitude)
+
+
+def grid_ranges(latitude, longitude, proximity):
+    """Ranges of grid cells covering a circle around the given coordinates.
+
+    Args:
+        latitude: Latitude of the center.
+        longitude: Longitude of the center.
+        proximity: Radius in kilometers.
+
+    Returns:
+        list: Inclusive ``(first, last)`` cell ranges, one or two per row of
+        the bounding box of the circle.
+    """
+    latitude = float(latitude)
+    longitude = float(longitude)
+    delta_latitude = math.degrees(float(proximity) / EARTH_RADIUS)
+
+    latitude_min = latitude - delta_latitude
+    latitude_max = latitude + delta_latitude
+
+    # The circle contains a pole, every longitude is in range.
+    if latitude_min <= -90 or latitude_max >= 90:
+        columns = [(0, GRID_COLUMNS - 1)]
+    else:
+        delta_longitude = math.degrees(
+            math.asin(
+                min(
+                    math.sin(float(proximity) / EARTH_RADIUS) / math.cos(math.radians(latitude)),
+                    1
+                )
+            )
+        )
+        if delta_longitude >= 180:
+            columns = [(0, GRID_COLUMNS - 1)]
+        else:
+            column_min = grid_column(longitude - delta_longitude)
+            column_max = grid_column(longitude + delta_longitude)
+            if column_min <= column_max:
+                columns = [(column_min, column_max)]
+            else:
+                # Crosses the antimeridian
+                columns = [(column_min, GRID_COLUMNS - 1), (0, column_max)]
+
+    ranges = []
+    for row in range(grid_row(latitude_min), grid_row(latitude_max) + 1):
+        for column_min, column_max in columns:
+            ranges.append(
+                (row * GRID_COLUMNS + column_min, row * GRID_COLUMNS + column_max,)
+            )
+    return ranges
@@ -0,0 +1,129 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+
+from ...geo import grid_cell
+from ...models import Store
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the latency of Store.objects.nearby with and without the grid '
+        'index. The stores are seeded in a transaction that is rolled back.'
+    )
+
+    # Belgium
+    LATITUDE = (49.5, 51.5)
+    LONGITUDE = (2.5, 6.4)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stores',
+            type=int,
+            default=100000,
+            help='Amount of stores to seed.'
+        )
+        parser.add_argument(
+            '--queries',
+            type=int,
+            default=200,
+            help='Amount of searches per method.'
+        )
+        parser.add_argument(
+            '--proximity',
+            type=float,
+            default=5,
+            help='Search radius in kilometers.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.seed(options['stores'])
+                self.benchmark(options['queries'], options['proximity'])
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def random_location(self):
+        return (
+            round(random.uniform(*self.LATITUDE), 7),
+            round(random.uniform(*self.LONGITUDE), 7),
+        )
+
+    def seed(self, amount):
+        stores = []
+        for i in range(amount):
+            latitude, longitude = self.random_location()
+            stores.append(
+                Store(
+                    name='Benchmark {}'.format(i),
+                    country='België',
+                    province='Oost-Vlaanderen',
+                    city='Wetteren',
+                    postcode='9230',
+                    street='Dendermondesteenweg',
+                    number=str(i),
+                    latitude=latitude,
+                    longitude=longitude,
+                    grid_cell=grid_cell(latitude, longitude)
+                )
+            )
+        Store.objects.bulk_create(stores, batch_size=5000)
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'ANALYZE {table}'.format(
+                        table=Store._meta.db_table
+                    )
+                )
+
+        self.stdout.write('Seeded {} stores.'.format(amount))
+
+    def scan(self, latitude, longitude, proximity):
+        """The unindexed query nearby used before the grid index."""
+        return Store.objects.filter(
+            enabled=True
+        ).exclude(
+            models.Q(
+                latitude=None
+            ) | models.Q(
+                longitude=None
+            )
+        ).with_distance(
+            latitude,
+            longitude
+        ).filter(
+            distance__lt=proximity
+        ).order_by(
+            'distance'
+        )
+
+    def benchmark(self, queries, proximity):
+        locations = [self.random_location() for i in range(queries)]
+        methods = (
+            ('scan', self.scan),
+            ('grid', Store.objects.nearby),
+        )
+        for name, method in methods:
+            durations = []
+            for latitude, longitude in locations:
+                start = time.perf_counter()
+                list(method(latitude, longitude, proximity))
+                durations.append(time.perf_counter() - start)
+
+            durations.sort()
+            self.stdout.write(
+                '{name}: p50 {p50:.2f}ms, p99 {p99:.2f}ms'.format(
+                    name=name,
+                    p50=durations[int(len(durations) * 0.50)] * 1000,
+                    p99=durations[min(int(len(durations) * 0.99), len(durations) - 1)] * 1000
+                )
+            )
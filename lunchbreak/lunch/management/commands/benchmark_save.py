@@ -0,0 +1,141 @@
+import time
+
+import dirtyfields
+from dirtyfields.compare import compare_states, raw_compare
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from ...models import Food, Ingredient, Store
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the overhead of the model save pipeline: the clean method '
+        'dispatch, dirty tracking and save loops over the food and '
+        'ingredients of a store. The saves are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--store',
+            type=int,
+            help='Store of which the food and ingredients are saved.'
+        )
+        parser.add_argument(
+            '--rounds',
+            type=int,
+            default=1000,
+            help='Amount of rounds per measurement.'
+        )
+
+    def handle(self, *args, **options):
+        stores = Store.objects.filter(
+            menus__food__isnull=False
+        ).distinct()
+        if options['store'] is not None:
+            stores = stores.filter(id=options['store'])
+        store = stores.first()
+        if store is None:
+            raise CommandError('No store with food found.')
+
+        foods = list(
+            Food.objects.select_related(
+                'foodtype',
+                'menu__store',
+            ).filter(
+                menu__store=store
+            )
+        )
+        ingredients = list(
+            Ingredient.objects.select_related(
+                'group__store',
+            ).filter(
+                group__store=store
+            )
+        )
+        rounds = options['rounds']
+
+        self.benchmark_clean_dispatch(rounds)
+        self.benchmark_dirty_tracking(store, rounds)
+        try:
+            with transaction.atomic():
+                self.benchmark_saves('food', foods, rounds)
+                self.benchmark_saves('ingredient', ingredients, rounds)
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def report(self, name, durations):
+        durations.sort()
+        self.stdout.write(
+            '{name}: p50 {p50:.1f}us, p99 {p99:.1f}us'.format(
+                name=name,
+                p50=durations[int(len(durations) * 0.50)] * 1000000,
+                p99=durations[min(int(len(durations) * 0.99), len(durations) - 1)] * 1000000
+            )
+        )
+
+    def measure(self, name, method, rounds):
+        durations = []
+        for i in range(rounds):
+            start = time.perf_counter()
+            method()
+            durations.append(time.perf_counter() - start)
+        self.report(name, durations)
+
+    @staticmethod
+    def walk_clean_methods(model):
+        """The clean method lookup done on every clean before it was cached."""
+        return [
+            getattr(model, 'clean_{}'.format(field.name))
+            for field in model._meta.get_fields()
+            if hasattr(model, 'clean_{}'.format(field.name))
+        ]
+
+    def benchmark_clean_dispatch(self, rounds):
+        self.measure(
+            'clean dispatch walk',
+            lambda: self.walk_clean_methods(Food),
+            rounds
+        )
+        self.measure(
+            'clean dispatch plan',
+            Food.get_clean_methods,
+            rounds
+        )
+
+    def benchmark_dirty_tracking(self, store, rounds):
+        def all_fields():
+            original = dirtyfields.DirtyFieldsMixin._as_dict(store, True)
+            compare_states(
+                dirtyfields.DirtyFieldsMixin._as_dict(store, False),
+                original,
+                (raw_compare, {},)
+            )
+
+        def tracked_fields():
+            original = store._as_dict(True)
+            compare_states(
+                store._as_dict(False),
+                original,
+                store.compare_function
+            )
+
+        self.measure('dirty tracking all fields', all_fields, rounds)
+        self.measure('dirty tracking tracked fields', tracked_fields, rounds)
+
+    def benchmark_saves(self, name, instances, rounds):
+        if not instances:
+            return
+
+        durations = []
+        for i in range(rounds):
+            instance = instances[i % len(instances)]
+            start = time.perf_counter()
+            instance.save()
+            durations.append(time.perf_counter() - start)
+        self.report('{} save loop'.format(name), durations)
@@ -8,11 +8,13 @@ from django.db.models.expressions import RawSQL
 from push_notifications.models import DeviceManager
 
 from .config import random_token
+from .geo import grid_ranges
 
 
 class StoreQuerySet(models.QuerySet):
 
-    def nearby(self, latitude, longitude, proximity):
+    def with_distance(self, latitude, longitude):
+        """Annotate the distance in kilometers to the given coordinates."""
         # TODO Use Pointfields instead of 2 decimalfields.
         # Haversine formule is het beste om te gebruiken bij korte afstanden.
         # d = 2 * r * asin(
@@ -44,15 +46,7 @@ class StoreQuerySet(models.QuerySet):
                 )
             )
         '''
-        return self.filter(
-            enabled=True
-        ).exclude(
-            models.Q(
-                latitude=None
-            ) | models.Q(
-                longitude=None
-            )
-        ).annotate(
+        return self.annotate(
             distance=RawSQL(
                 haversine,
                 (
@@ -61,6 +55,37 @@ class StoreQuerySet(models.QuerySet):
                     longitude,
                 ),
             )
+        )
+
+    def in_grid(self, latitude, longitude, proximity):
+        """Stores in the grid cells around the given coordinates.
+
+        Uses the index on ``AbstractAddress.grid_cell`` to skip stores that
+        are certainly further away than the given proximity.
+        """
+        query = models.Q()
+        for first, last in grid_ranges(latitude, longitude, proximity):
+            query |= models.Q(
+                grid_cell__range=(first, last,)
+            )
+        return self.filter(query)
+
+    def nearby(self, latitude, longitude, proximity):
+        return self.filter(
+            enabled=True
+        ).exclude(
+            models.Q(
+                latitude=None
+            ) | models.Q(
+                longitude=None
+            )
+        ).in_grid(
+            latitude,
+            longitude,
+            proximity
+        ).with_distance(
+            latitude,
+            longitude
         ).filter(
             distance__lt=Decimal(proximity)
         ).order_by(
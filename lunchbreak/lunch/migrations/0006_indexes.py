@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lunch', '0005_store_grid_cell'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='holidayperiod',
+            index_together=set([('store', 'end', 'start')]),
+        ),
+        # Soft deleted rows are filtered out by the default managers, only
+        # the remaining rows are indexed.
+        migrations.RunSQL(
+            '''
+            CREATE INDEX lunch_food_menu_id_enabled_live
+            ON lunch_food (menu_id, enabled)
+            WHERE deleted IS NULL;
+
+            CREATE INDEX lunch_ingredient_group_id_live
+            ON lunch_ingredient (group_id)
+            WHERE deleted IS NULL;
+            ''',
+            '''
+            DROP INDEX lunch_food_menu_id_enabled_live;
+
+            DROP INDEX lunch_ingredient_group_id_live;
+            '''
+        ),
+    ]
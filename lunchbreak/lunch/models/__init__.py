@@ -1,4 +1,4 @@
-from django.db.models.signals import m2m_changed, post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 
 from .abstract_address import AbstractAddress  # noqa
 from .base_token import BaseToken  # noqa
@@ -38,3 +38,100 @@ m2m_changed.connect(
     sender=Food.ingredientgroups.through,
     weak=False
 )
+
+post_save.connect(
+    Store.changed_periods,
+    sender=OpeningPeriod,
+    weak=False
+)
+post_save.connect(
+    Store.changed_periods,
+    sender=HolidayPeriod,
+    weak=False
+)
+post_delete.connect(
+    Store.changed_periods,
+    sender=OpeningPeriod,
+    weak=False
+)
+post_delete.connect(
+    Store.changed_periods,
+    sender=HolidayPeriod,
+    weak=False
+)
+
+post_save.connect(
+    Store.changed_menu,
+    sender=Food,
+    weak=False
+)
+post_delete.connect(
+    Store.changed_menu,
+    sender=Food,
+    weak=False
+)
+post_save.connect(
+    Store.changed_menu,
+    sender=FoodType,
+    weak=False
+)
+post_delete.connect(
+    Store.changed_menu,
+    sender=FoodType,
+    weak=False
+)
+post_save.connect(
+    Store.changed_menu,
+    sender=Ingredient,
+    weak=False
+)
+post_delete.connect(
+    Store.changed_menu,
+    sender=Ingredient,
+    weak=False
+)
+post_save.connect(
+    Store.changed_menu,
+    sender=IngredientGroup,
+    weak=False
+)
+post_delete.connect(
+    Store.changed_menu,
+    sender=IngredientGroup,
+    weak=False
+)
+post_save.connect(
+    Store.changed_menu,
+    sender=IngredientRelation,
+    weak=False
+)
+post_delete.connect(
+    Store.changed_menu,
+    sender=IngredientRelation,
+    weak=False
+)
+post_save.connect(
+    Store.changed_menu,
+    sender=Menu,
+    weak=False
+)
+post_delete.connect(
+    Store.changed_menu,
+    sender=Menu,
+    weak=False
+)
+post_save.connect(
+    Store.changed_menu,
+    sender=Quantity,
+    weak=False
+)
+post_delete.connect(
+    Store.changed_menu,
+    sender=Quantity,
+    weak=False
+)
+m2m_changed.connect(
+    Store.changed_menu,
+    sender=Food.ingredientgroups.through,
+    weak=False
+)
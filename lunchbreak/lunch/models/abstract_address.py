@@ -1,11 +1,12 @@
 import googlemaps
-from dirtyfields import DirtyFieldsMixin
 from django.conf import settings
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
 from Lunchbreak.fields import RoundingDecimalField
+from Lunchbreak.mixins import DirtyFieldsMixin
 
 from ..exceptions import AddressNotFound
+from ..geo import grid_cell
 
 
 class AbstractAddress(models.Model, DirtyFieldsMixin):
@@ -52,10 +53,29 @@ class AbstractAddress(models.Model, DirtyFieldsMixin):
         verbose_name=_('lengtegraad'),
         help_text=_('Lengtegraad.')
     )
+    grid_cell = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+        verbose_name=_('rastercel'),
+        help_text=_('Rastercel van de coördinaten, zie lunch.geo.grid_cell.')
+    )
 
     class Meta:
         abstract = True
 
+    FIELDS_TO_CHECK = (
+        'country',
+        'province',
+        'city',
+        'postcode',
+        'street',
+        'number',
+        'latitude',
+        'longitude',
+    )
+
     @classmethod
     def maps_client(cls):
         return googlemaps.Client(
@@ -85,21 +105,11 @@ class AbstractAddress(models.Model, DirtyFieldsMixin):
 
     def save(self, *args, **kwargs):
         dirty_fields = self.get_dirty_fields()
-        fields = [
-            'country',
-            'province',
-            'city',
-            'postcode',
-            'street',
-            'number',
-            'latitude',
-            'longitude'
-        ]
 
         if self.pk is None or dirty_fields:
             update_location = False
             if self.pk is not None and dirty_fields:
-                for field in fields:
+                for field in self.FIELDS_TO_CHECK:
                     if field in dirty_fields:
                         update_location = True
                         break
@@ -116,6 +126,7 @@ class AbstractAddress(models.Model, DirtyFieldsMixin):
                 self.update_location()
 
         self.full_clean()
+        self.grid_cell = grid_cell(self.latitude, self.longitude)
         super(AbstractAddress, self).save(*args, **kwargs)
 
     def update_location(self):
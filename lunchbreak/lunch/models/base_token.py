@@ -1,8 +1,12 @@
-from dirtyfields import DirtyFieldsMixin
+import hashlib
+import hmac
+
+from django.conf import settings
 from django.contrib.auth.hashers import check_password, make_password
 from django.db import models
+from django.utils.encoding import force_bytes
 from django.utils.translation import ugettext_lazy as _
-from Lunchbreak.mixins import CleanModelMixin
+from Lunchbreak.mixins import CleanModelMixin, DirtyFieldsMixin
 from push_notifications.models import BareDevice
 
 from ..managers import BaseTokenManager
@@ -19,12 +23,22 @@ class BaseToken(CleanModelMixin, BareDevice, DirtyFieldsMixin):
         verbose_name=_('identificatie'),
         help_text=_('Identificatie code die toegang geeft tot Lunchbreak.')
     )
+    identifier_digest = models.CharField(
+        max_length=64,
+        blank=True,
+        db_index=True,
+        editable=False,
+        verbose_name=_('identificatie digest'),
+        help_text=_('Sleutel-HMAC van de identificatie code.')
+    )
 
     objects = BaseTokenManager()
 
     class Meta:
         abstract = True,
 
+    FIELDS_TO_CHECK = ('identifier',)
+
     def save(self, *args, **kwargs):
         self.full_clean()
         # forced hashing can be removed when resetting migrations
@@ -34,12 +48,57 @@ class BaseToken(CleanModelMixin, BareDevice, DirtyFieldsMixin):
             identifier_dirty = self.get_dirty_fields().get('identifier', None)
 
             if self.pk is None or identifier_dirty is not None or force_hashing:
+                self.identifier_digest = self.digest(self.identifier)
                 self.identifier = make_password(self.identifier, hasher='sha1')
 
         super(BaseToken, self).save(*args, **kwargs)
 
-    def check_identifier(self, identifier_raw):
-        return check_password(identifier_raw, self.identifier)
+    @staticmethod
+    def digest(identifier_raw):
+        """Keyed digest of a raw identifier used to look up tokens.
+
+        Args:
+            identifier_raw (str): Identifier as sent by the client.
+
+        Returns:
+            str: Hexadecimal HMAC-SHA256 keyed with ``settings.SECRET_KEY``.
+        """
+        return hmac.new(
+            key=force_bytes('lunch.BaseToken' + settings.SECRET_KEY),
+            msg=force_bytes(identifier_raw),
+            digestmod=hashlib.sha256
+        ).hexdigest()
+
+    def check_identifier(self, identifier_raw, digest=None):
+        """Check the raw identifier against the token.
+
+        Tokens without ``identifier_digest`` are checked against the hashed
+        identifier, see ``migrate_identifier``.
+
+        Args:
+            identifier_raw (str): Identifier as sent by the client.
+            digest (str, optional): ``BaseToken.digest`` of the identifier if
+            it was already calculated.
+        """
+        if not self.identifier_digest:
+            return check_password(identifier_raw, self.identifier)
+
+        if digest is None:
+            digest = self.digest(identifier_raw)
+        return hmac.compare_digest(self.identifier_digest, digest)
+
+    def migrate_identifier(self, digest):
+        """Store the digest of a token created before digests existed.
+
+        Only done after the identifier was checked. The identifier itself
+        does not change so the token is not saved again.
+        """
+        self.identifier_digest = digest
+        self.__class__.objects.filter(
+            pk=self.pk
+        ).update(
+            identifier_digest=digest
+        )
 
     def clean_device(self):
         if self.device:
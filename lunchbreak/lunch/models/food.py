@@ -1,3 +1,4 @@
+from collections import Counter
 from decimal import Decimal
 
 from django.db import DatabaseError, models
@@ -15,6 +16,7 @@ from safedelete.models import SafeDeleteModel
 
 from ..exceptions import (IngredientGroupMaxExceeded,
                           IngredientGroupsMinimumNotMet, LinkingError)
+from ..snapshot import MenuSnapshot
 from ..utils import uggettext_summation
 
 
@@ -192,7 +194,11 @@ class Food(CleanModelMixin, SafeDeleteModel):
 
     @cached_property
     def has_ingredients(self):
-        return self.ingredients_count > 0 or self.ingredientgroups_count > 0
+        return self.menu_snapshot.has_ingredients(self.id)
+
+    @property
+    def menu_snapshot(self):
+        return MenuSnapshot.for_store(self.store)
 
     @cached_property
     def selected_ingredients(self):
@@ -211,66 +217,34 @@ class Food(CleanModelMixin, SafeDeleteModel):
 
     @cached_property
     def all_ingredients(self):
-        relations = self.ingredientrelations.select_related(
-            'ingredient'
-        ).all()
-
-        deselected_ingredients = []
-        selected_ingredients = []
+        """Selected and deselected ingredients, including those of the ingredientgroups.
 
-        for relation in relations:
-            if relation.selected:
-                selected_ingredients.append(relation.ingredient)
-            else:
-                deselected_ingredients.append(relation.ingredient)
+        Returns:
+            tuple: Lists of the selected and deselected ingredients.
+        """
+        return self.menu_snapshot.all_ingredients(self.id)
 
-        for ingredientgroup in self.nonempty_ingredientgroups:
-            group_ingredients = ingredientgroup.ingredients.all()
-            for ingredient in group_ingredients:
-                if ingredient not in selected_ingredients \
-                        and ingredient not in deselected_ingredients:
-                    deselected_ingredients.append(ingredient)
+    @cached_property
+    def allowed_ingredients(self):
+        """Ids of the ingredients that can be ordered with this food.
 
-        return selected_ingredients, deselected_ingredients
+        Returns:
+            set
+        """
+        return self.menu_snapshot.allowed_ingredients(self.id)
 
     @cached_property
     def all_ingredientgroups(self):
-        ingredientgroups = self.ingredientgroups.filter(
-            # Do not include empty groups
-            ingredients__isnull=False
-        ).prefetch_related(
-            'ingredients'
-        ).distinct()
-
-        ingredients = self.ingredients.all().select_related(
-            'group'
-        )
-
-        ingredientgroups_added = []
-        for ingredient in ingredients:
-            if ingredient.group not in ingredientgroups \
-                    and ingredient.group not in ingredientgroups_added:
-                ingredientgroups_added.append(
-                    ingredient.group
-                )
-
-        all_ingredientgroups = []
-        all_ingredientgroups.extend(ingredientgroups)
-        all_ingredientgroups.extend(ingredientgroups_added)
+        return self.menu_snapshot.all_ingredientgroups(self.id)
 
-        return all_ingredientgroups
+    @cached_property
+    def detail_ingredientrelations(self):
+        """Ingredient relations including the ingredients of the ingredientgroups."""
+        return self.menu_snapshot.detail_ingredientrelations(self.id)
 
     @cached_property
     def quantity(self):
-        from .quantity import Quantity
-
-        try:
-            return Quantity.objects.get(
-                foodtype_id=self.foodtype_id,
-                store_id=self.store.id
-            )
-        except Quantity.DoesNotExist:
-            return None
+        return self.menu_snapshot.quantity(self.foodtype_id)
 
     @cached_property
     def inherited_wait(self):
@@ -294,6 +268,27 @@ class Food(CleanModelMixin, SafeDeleteModel):
 
         return preorder_days, preorder_time
 
+    @classmethod
+    def in_bulk_for_ordering(cls, id_list):
+        """Load the given food with everything needed to order them.
+
+        The ingredients and quantities are read from the menu snapshot of the
+        store, see ``Food.menu_snapshot``, so validating and pricing ordered
+        food does not query per item.
+
+        Args:
+            id_list (iterable): Food ids.
+
+        Returns:
+            dict: Food ids mapped to their food.
+        """
+        return cls.objects.select_related(
+            'foodtype',
+            'menu__store',
+        ).in_bulk(
+            set(id_list)
+        )
+
     def get_cost_display(self):
         return str(
             (
@@ -314,21 +309,44 @@ class Food(CleanModelMixin, SafeDeleteModel):
         ).capitalize() + '.'
 
     def update_typical(self):
-        ingredientgroups = self.ingredientgroups.all()
+        """Mark the ingredients of groups the food does not have as typical.
+
+        The changed relations are saved with one query, after which the menu
+        of the store is marked as changed once.
+        """
+        from .ingredient_relation import IngredientRelation
+        from .store import Store
+
+        ingredientgroup_ids = set(
+            self.ingredientgroups.values_list(
+                'id',
+                flat=True
+            )
+        )
         ingredientrelations = self.ingredientrelations.select_related(
-            'ingredient__group'
+            'ingredient'
         ).all()
 
+        changed = []
         for ingredientrelation in ingredientrelations:
-            ingredient = ingredientrelation.ingredient
             # Musn't the ingredient be selected before it can be typical?
-            if ingredient.group not in ingredientgroups:
-                if not ingredientrelation.typical:
-                    ingredientrelation.typical = True
-                    ingredientrelation.save()
-            elif ingredientrelation.typical:
-                ingredientrelation.typical = False
-                ingredientrelation.save()
+            typical = ingredientrelation.ingredient.group_id \
+                not in ingredientgroup_ids
+            if ingredientrelation.typical != typical:
+                ingredientrelation.typical = typical
+                changed.append(ingredientrelation)
+
+        if changed:
+            IngredientRelation.objects.bulk_update(
+                changed,
+                [
+                    'typical',
+                ]
+            )
+            Store.changed_menu(
+                sender=Food,
+                instance=self
+            )
 
     def is_orderable(self, dt, now=None):
         """
@@ -380,41 +398,24 @@ class Food(CleanModelMixin, SafeDeleteModel):
         Check whether the given ingredients can be made into an OrderedFood.
         """
 
-        ingredientgroups = {}
-        for ingredient in ingredients:
-            group = ingredient.group
-            amount = 1
-            if group.id in ingredientgroups:
-                amount += ingredientgroups[group.id]
-            if group.maximum > 0 and amount > group.maximum:
-                raise IngredientGroupMaxExceeded()
-            ingredientgroups[group.id] = amount
-
-        from .ingredient import Ingredient
-
-        allowed_ingredients = Ingredient.objects.filter(
-            Q(food__pk=self.pk) | Q(group__food__pk=self.pk)
-        ).distinct()
+        amounts = Counter(ingredient.group_id for ingredient in ingredients)
+        ingredientgroups = {ingredient.group for ingredient in ingredients}
+        if any(group.maximum > 0 and amounts[group.id] > group.maximum
+               for group in ingredientgroups):
+            raise IngredientGroupMaxExceeded()
 
-        valid_ingredients = all(
-            ingredient in allowed_ingredients for ingredient in ingredients
-        )
-        if not valid_ingredients:
+        if not {ingredient.id for ingredient in ingredients} <= self.allowed_ingredients:
             raise LinkingError(
                 _('Ingrediënten zijn niet toegelaten voor het gegeven etenswaar.')
             )
 
-        original_ingredients = self.ingredients.all()
-
-        for ingredient in original_ingredients:
-            group = ingredient.group
-            if group.minimum > 0:
-                if group.id not in ingredientgroups:
-                    raise IngredientGroupsMinimumNotMet()
-                amount = ingredientgroups[group.id]
-
-                if amount < group.minimum:
-                    raise IngredientGroupsMinimumNotMet()
+        required_groups = {
+            ingredient.group
+            for ingredient in self.menu_snapshot.food_ingredients(self.id)
+            if ingredient.group.minimum > 0
+        }
+        if any(amounts[group.id] < group.minimum for group in required_groups):
+            raise IngredientGroupsMinimumNotMet()
 
     @staticmethod
     def changed_ingredients(sender, instance, action=None, **kwargs):
@@ -1,9 +1,8 @@
 import pendulum
-from dirtyfields import DirtyFieldsMixin
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
 from Lunchbreak.exceptions import LunchbreakException
-from Lunchbreak.mixins import CleanModelMixin
+from Lunchbreak.mixins import CleanModelMixin, DirtyFieldsMixin
 
 from ..managers import HolidayPeriodQuerySet
 from ..utils import timezone_for_store
@@ -41,9 +40,12 @@ class HolidayPeriod(CleanModelMixin, models.Model, DirtyFieldsMixin):
     objects = HolidayPeriodQuerySet.as_manager()
 
     class Meta:
+        index_together = ('store', 'end', 'start',)
         verbose_name = _('vakantieperiode')
         verbose_name_plural = _('vakantieperiodes')
 
+    FIELDS_TO_CHECK = ('start',)
+
     @property
     def period(self):
         period = pendulum.Period(
@@ -1,8 +1,8 @@
-from dirtyfields import DirtyFieldsMixin
 from django.db import models
 from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 from Lunchbreak.fields import CostField
+from Lunchbreak.mixins import DirtyFieldsMixin
 from safedelete import HARD_DELETE, SOFT_DELETE
 from safedelete.models import SafeDeleteModel
 
@@ -15,6 +15,8 @@ class Ingredient(SafeDeleteModel, DirtyFieldsMixin):
         verbose_name = _('ingrediënt')
         verbose_name_plural = _('ingrediënten')
 
+    FIELDS_TO_CHECK = ('group',)
+
     def __str__(self):
         return '{name} ({group}) #{id}'.format(
             name=self.name,
@@ -1,6 +1,6 @@
-from dirtyfields import DirtyFieldsMixin
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
+from Lunchbreak.mixins import DirtyFieldsMixin
 
 from ..exceptions import LinkingError
 
@@ -10,6 +10,8 @@ class IngredientRelation(models.Model, DirtyFieldsMixin):
     class Meta:
         unique_together = ('food', 'ingredient',)
 
+    FIELDS_TO_CHECK = ('ingredient',)
+
     def __str__(self):
         return str(self.ingredient)
 
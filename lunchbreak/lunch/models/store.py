@@ -4,6 +4,7 @@ from datetime import timedelta
 import pendulum
 from customers.exceptions import (PastOrderDenied, PreorderTimeExceeded,
                                   StoreClosed)
+from dateutil.relativedelta import relativedelta
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.utils import timezone
@@ -11,6 +12,8 @@ from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 
 from ..managers import StoreQuerySet
+from ..snapshot import MenuSnapshot
+from ..timeline import Timeline, TimelinePeriod
 from .abstract_address import AbstractAddress
 
 
@@ -198,15 +201,23 @@ class Store(AbstractAddress):
 
     def openingperiods_for_day(self, dt, **kwargs):
         """Wrapper for opening_periods where period is the whole given day."""
-        start = pendulum.instance(dt).hour_(0).minute_(0).second_(0)
-        end = start.hour_(23).minute_(59).second_(59)
-        period = pendulum.Period(
-            start=start,
-            end=end
+        start = dt.replace(
+            hour=0,
+            minute=0,
+            second=0,
+            microsecond=0
+        )
+        end = start.replace(
+            hour=23,
+            minute=59,
+            second=59
         )
 
         return self.openingperiods_for(
-            period=period,
+            period=TimelinePeriod(
+                start=start,
+                end=end
+            ),
             **kwargs
         )
 
@@ -216,18 +227,21 @@ class Store(AbstractAddress):
         Return a list of periods indicating when the store is open for the given period.
         If period is None, it will use start as the start of the period.
         If start is None, it will use the current datetime + Store.wait as the start of the period.
-        It will pass **kwargs onto pendulum.Pendulum.add calculate an end to
+        It will pass **kwargs onto dateutil.relativedelta to calculate an end to
         the period based on the start.
 
+        The periods are calculated from the compiled timeline of the store,
+        see :class:`lunch.timeline.Timeline`.
+
         Args:
-            **kwargs (dict): Passed onto pendulum.Pendulum.add to calculate the
+            **kwargs (dict): Passed onto dateutil.relativedelta to calculate the
             end of the period based off of the start.
             period (:obj:`pendulum.Period`, optional): Period for which the
-            openingperiods are requested.
-            start (:obj:`pendulum.Pendulum`, optional): Start of the period.
+            openingperiods are requested, anything with a start and end.
+            start (:obj:`datetime.datetime`, optional): Start of the period.
 
         Returns:
-            list: List of :obj:`pendulum.Period` indicating when the store is open.
+            list: List of :obj:`lunch.timeline.TimelinePeriod` indicating when the store is open.
 
         Raises:
             ValueError: A period or start or kwargs must be given.
@@ -240,7 +254,7 @@ class Store(AbstractAddress):
         if period is None:
             if start is None:
                 now = timezone.now()
-                start = pendulum.instance(now)
+                start = now
                 wait = timedelta()
                 if orderedfood is not None:
                     preorder_time = None
@@ -272,49 +286,85 @@ class Store(AbstractAddress):
                         preorder_days = preorder_days + (
                             1 if now.time() > preorder_time else 0
                         )
-                        start = start.add(
+                        start = start + timedelta(
                             days=preorder_days
                         )
                         if 'days' in kwargs:
                             kwargs['days'] = max(0, kwargs['days'] - preorder_days)
 
                 start += wait
-            end = start.add(**kwargs)
+            elif isinstance(start, pendulum.Pendulum):
+                start = start._datetime
+            end = start + relativedelta(**kwargs)
+        else:
+            start = period.start
+            end = period.end
 
-            period = pendulum.Period(
-                start=start,
-                end=end
-            )
+        return self.timeline.between(
+            start=start,
+            end=end
+        )
 
-        from .holiday_period import HolidayPeriod
-        from .opening_period import OpeningPeriod
+    @property
+    def timeline(self):
+        """Compiled opening hours of the store.
 
-        openingperiods = OpeningPeriod.objects.filter(
-            store=self
-        ).between(
-            period=period
+        Kept on the instance as long as ``last_modified`` and the timezone do
+        not change.
+
+        Returns:
+            :obj:`lunch.timeline.Timeline`
+        """
+        timeline = self.__dict__.get('_timeline')
+        if timeline is None or not timeline.is_current(self):
+            timeline = Timeline.for_store(self)
+            self._timeline = timeline
+        return timeline
+
+    @staticmethod
+    def changed_periods(sender, instance, **kwargs):
+        """Update ``last_modified`` when an opening or holiday period changes.
+
+        ``last_modified`` is the version of the ``Timeline`` of the store. It
+        is updated after the period is saved or deleted, so no process
+        compiles the new version from the old periods.
+        """
+        last_modified = timezone.now()
+        Store.objects.filter(
+            id=instance.store_id
+        ).update(
+            last_modified=last_modified
+        )
+
+        store = getattr(
+            instance,
+            sender._meta.get_field('store').get_cache_name(),
+            None
+        )
+        if store is not None:
+            store.last_modified = last_modified
+
+    @staticmethod
+    def changed_menu(sender, instance, action=None, **kwargs):
+        """Update ``last_modified`` when the menu of the store changes.
+
+        ``last_modified`` is the version of the ``MenuSnapshot`` of the store.
+        The store is updated without saving it, the related store instance is
+        updated too if it is loaded.
+        """
+        if action is not None and not action.startswith('post'):
+            return
+
+        store = MenuSnapshot.store_of(instance)
+        if store is None:
+            return
+
+        store.last_modified = timezone.now()
+        Store.objects.filter(
+            id=store.id
+        ).update(
+            last_modified=store.last_modified
         )
-        holidayperiods = HolidayPeriod.objects.filter(
-            store=self
-        ).between(
-            period=period
-        ).periods()
-
-        closingperiods = []
-        for period in holidayperiods:
-            if not period.closed:
-                openingperiods.append(period)
-            else:
-                closingperiods.append(period)
-
-        result = []
-        for openingperiod in openingperiods:
-            adjusted_openingperiod = openingperiod.exclude(
-                *closingperiods
-            )
-            if adjusted_openingperiod is not None:
-                result.extend(adjusted_openingperiod)
-        return result
 
     def delivers_to(self, address):
         return self.regions.filter(
@@ -340,38 +390,20 @@ class Store(AbstractAddress):
                 return False
             raise PreorderTimeExceeded()
 
-        from .holiday_period import HolidayPeriod
+        timeline = self.timeline
+        holiday = timeline.holiday_at(dt)
 
-        holidayperiods = HolidayPeriod.objects.filter(
-            store=self,
-            start__lte=dt,
-            end__gte=dt
-        )
-
-        closed = False
-        for holidayperiod in holidayperiods:
-            if not holidayperiod.closed:
-                break
-            else:
-                closed = True
-        else:
-            # Open stores are
-            if closed:
-                if not raise_exception:
-                    return False
-                raise StoreClosed(
-                    'De winkel is exclusief gesloten vanwege een vakantieperiode.'
-                )
-
-            periods = self.openingperiods_for_day(
-                dt=dt
-            )
-
-            for period in periods:
-                if dt in period:
-                    return True
+        if holiday is None:
+            if timeline.is_open_weekly(dt):
+                return True
 
             if not raise_exception:
                 return False
             raise StoreClosed()
+        elif not holiday:
+            if not raise_exception:
+                return False
+            raise StoreClosed(
+                'De winkel is exclusief gesloten vanwege een vakantieperiode.'
+            )
         return True
@@ -1,13 +1,22 @@
-from django.db import models
+import hashlib
+
+from django.core.cache import cache
+from django.db import models, transaction
 from django.utils.translation import ugettext_lazy as _
 from imagekit.models import ImageSpecField
 from polaroid.models import Polaroid
 from private_media.storages import PrivateMediaStorage
 
 from ..specs import HDPI, LDPI, MDPI, XHDPI, XXHDPI, XXXHDPI
+from ..tasks import render_store_header
 
 
 class StoreHeader(Polaroid):
+
+    RENDER_PENDING_KEY = 'lunch:storeheader:{id}:{attr}:pending'
+    # Seconds a missing version is not enqueued again
+    RENDER_PENDING_TIMEOUT = 60
+
     store = models.OneToOneField(
         'Store',
         on_delete=models.CASCADE,
@@ -54,6 +63,48 @@ class StoreHeader(Polaroid):
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
         self.store.save()
+        transaction.on_commit(self.render)
+
+    def digest(self, attr):
+        """Digest of a version, which changes together with its content.
+
+        Args:
+            attr (str): Name of the version or ``original``.
+
+        Returns:
+            Hexadecimal digest.
+            str
+        """
+        return hashlib.sha1(
+            '{id}:{name}'.format(
+                id=self.id,
+                name=getattr(self, attr).name
+            ).encode('utf-8')
+        ).hexdigest()[:16]
+
+    def render(self):
+        """Render all of the versions of the original in the background."""
+        render_store_header.delay(
+            store_header_id=self.id
+        )
+
+    def version_missing(self, attr):
+        """Render the missing version in the background.
+
+        Requests for the same version only enqueue it once until it has had
+        the time to render.
+        """
+        key = self.RENDER_PENDING_KEY.format(
+            id=self.id,
+            attr=attr
+        )
+        if not cache.add(key, True, self.RENDER_PENDING_TIMEOUT):
+            return
+
+        render_store_header.delay(
+            store_header_id=self.id,
+            attrs=[attr]
+        )
 
     def __str__(self):
         return _('Headerafbeelding voor %(store)s') % {
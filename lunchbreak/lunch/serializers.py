@@ -351,9 +351,12 @@ class FoodSerializer(BaseFoodSerializer):
 
 
 class FoodDetailSerializer(BaseFoodSerializer):
+    # Includes the ingredients of Food.ingredientgroups, see
+    # MenuSnapshot.detail_ingredientrelations
     ingredients = IngredientRelationDetailSerializer(
-        source='ingredientrelations',
-        many=True
+        source='detail_ingredientrelations',
+        many=True,
+        read_only=True
     )
 
     class Meta(BaseFoodSerializer.Meta):
@@ -373,50 +376,16 @@ class FoodDetailSerializer(BaseFoodSerializer):
     def to_representation(self, obj):
         result = super().to_representation(obj)
 
-        # Add ingredientgroup ingredients to Food.ingredients representation
-        ingredientrelations_added = []
-        ingredientgroups = obj.ingredientgroups.filter(
-            # Do not include empty groups
-            ingredients__isnull=False
-        ).prefetch_related(
-            'ingredients'
-        ).distinct()
-        ingredients = obj.ingredients.all().select_related(
-            'group'
-        )
-
-        for ingredientgroup in ingredientgroups:
-            group_ingredients = ingredientgroup.ingredients.all()
-            for ingredient in group_ingredients:
-                if ingredient not in ingredients:
-                    ingredientrelations_added.append(
-                        IngredientRelation(
-                            ingredient=ingredient
-                        )
-                    )
-
-        result['ingredients'] += IngredientRelationDetailSerializer(
-            many=True,
-            context=self.context
-        ).to_representation(
-            ingredientrelations_added
-        )
-
         # Add the ingredientgroups of the ingredients that are not in
         # Food.ingredientgroups to the representation.
-        ingredientgroups_added = []
-        for ingredient in ingredients:
-            if ingredient.group not in ingredientgroups \
-                    and ingredient.group not in ingredientgroups_added:
-                ingredientgroups_added.append(
-                    ingredient.group
-                )
+        ingredientgroups = obj.menu_snapshot.food_ingredientgroups(obj.id)
+        ingredientgroups_added = obj.all_ingredientgroups[len(ingredientgroups):]
 
         result['ingredientgroups'] = IngredientGroupSerializer(
             many=True,
             context=self.context
         ).to_representation(
-            ingredientgroups_added + list(ingredientgroups)
+            ingredientgroups_added + ingredientgroups
         )
 
         return result
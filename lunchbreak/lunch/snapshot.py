@@ -0,0 +1,259 @@
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+
+
+class MenuSnapshot:
+    """Read-only snapshot of the menu of a store.
+
+    Contains the food types, quantities, ingredient groups, ingredients,
+    ingredient relations and ingredient groups of the food of a store, built
+    with a fixed number of queries and looked up by id afterwards.
+
+    A snapshot is versioned by ``Store.last_modified``, which is updated
+    whenever the menu of the store changes, see ``Store.changed_menu``.
+    Snapshots are kept in-process and shared through the Django cache. The
+    model instances in a snapshot are shared between requests and must not be
+    changed.
+    """
+
+    CACHE_KEY = 'lunch:menu:{store_id}:{version}'
+
+    # Latest snapshot per store id of this process
+    _local = {}
+
+    def __init__(self, store_id, version, foodtypes, quantities,
+                 ingredientgroups, ingredients, ingredientrelations,
+                 food_ingredientgroups):
+        self.store_id = store_id
+        self.version = version
+        self.foodtypes = foodtypes
+        self.quantities = quantities
+        self.ingredientgroups = ingredientgroups
+        self.ingredients = ingredients
+        self._ingredientrelations = ingredientrelations
+        self._food_ingredientgroups = food_ingredientgroups
+
+        self._group_ingredients = defaultdict(list)
+        for ingredient in ingredients.values():
+            self._group_ingredients[ingredient.group_id].append(ingredient)
+
+    @classmethod
+    def cache_key(cls, store_id, version):
+        return cls.CACHE_KEY.format(
+            store_id=store_id,
+            version=version
+        )
+
+    @classmethod
+    def for_store(cls, store):
+        """Snapshot of the current menu of the given store.
+
+        Args:
+            store (Store): Store, its ``last_modified`` is used as version.
+
+        Returns:
+            MenuSnapshot
+        """
+        version = int(store.last_modified.timestamp() * 1000000)
+
+        snapshot = cls._local.get(store.id)
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        key = cls.cache_key(store.id, version)
+        snapshot = cache.get(key)
+        if snapshot is None:
+            snapshot = cls.build(store.id, version)
+            cache.set(key, snapshot)
+        cls._local[store.id] = snapshot
+        return snapshot
+
+    @classmethod
+    def build(cls, store_id, version):
+        from .models import (Food, FoodType, Ingredient, IngredientGroup,
+                             IngredientRelation, Quantity)
+
+        foodtypes = {
+            foodtype.id: foodtype
+            for foodtype in FoodType.objects.filter(store_id=store_id)
+        }
+        quantities = {
+            quantity.foodtype_id: quantity
+            for quantity in Quantity.objects.filter(store_id=store_id)
+        }
+        ingredientgroups = {
+            ingredientgroup.id: ingredientgroup
+            for ingredientgroup in IngredientGroup.objects.filter(
+                store_id=store_id
+            ).order_by(
+                'id'
+            )
+        }
+        ingredients = {}
+        for ingredient in Ingredient.objects.filter(
+            group__store_id=store_id
+        ).select_related(
+            'group'
+        ).order_by(
+            'id'
+        ):
+            if ingredient.group_id in ingredientgroups:
+                ingredient.group = ingredientgroups[ingredient.group_id]
+            ingredients[ingredient.id] = ingredient
+
+        ingredientrelations = defaultdict(list)
+        for ingredientrelation in IngredientRelation.objects.filter(
+            food__menu__store_id=store_id
+        ).select_related(
+            'ingredient__group'
+        ).order_by(
+            'id'
+        ):
+            if ingredientrelation.ingredient_id in ingredients:
+                ingredientrelation.ingredient = ingredients[ingredientrelation.ingredient_id]
+            ingredientrelations[ingredientrelation.food_id].append(ingredientrelation)
+
+        food_ingredientgroups = defaultdict(list)
+        through = Food.ingredientgroups.through.objects.filter(
+            food__menu__store_id=store_id
+        ).values_list(
+            'food_id',
+            'ingredientgroup_id',
+        ).order_by(
+            'ingredientgroup_id'
+        )
+        for food_id, ingredientgroup_id in through:
+            # Deleted ingredient groups are not in the snapshot
+            if ingredientgroup_id in ingredientgroups:
+                food_ingredientgroups[food_id].append(ingredientgroup_id)
+
+        return cls(
+            store_id=store_id,
+            version=version,
+            foodtypes=foodtypes,
+            quantities=quantities,
+            ingredientgroups=ingredientgroups,
+            ingredients=ingredients,
+            ingredientrelations={
+                food_id: tuple(relations)
+                for food_id, relations in ingredientrelations.items()
+            },
+            food_ingredientgroups={
+                food_id: tuple(ingredientgroup_ids)
+                for food_id, ingredientgroup_ids in food_ingredientgroups.items()
+            }
+        )
+
+    @staticmethod
+    def store_of(instance):
+        """Store of a menu related instance or None if it no longer exists."""
+        from .models import Food, Ingredient, IngredientRelation
+
+        try:
+            if isinstance(instance, Food):
+                return instance.menu.store
+            if isinstance(instance, Ingredient):
+                return instance.group.store
+            if isinstance(instance, IngredientRelation):
+                return instance.food.menu.store
+            return instance.store
+        except ObjectDoesNotExist:
+            return None
+
+    def quantity(self, foodtype_id):
+        return self.quantities.get(foodtype_id)
+
+    def ingredientrelations(self, food_id):
+        """Ingredient relations of the food, including deleted ingredients."""
+        return self._ingredientrelations.get(food_id, ())
+
+    def food_ingredients(self, food_id):
+        """Ingredients of the food that are not deleted."""
+        return [
+            self.ingredients[relation.ingredient_id]
+            for relation in self.ingredientrelations(food_id)
+            if relation.ingredient_id in self.ingredients
+        ]
+
+    def food_ingredientgroups(self, food_id):
+        """Ingredient groups of the food, excluding empty groups."""
+        return [
+            self.ingredientgroups[ingredientgroup_id]
+            for ingredientgroup_id in self._food_ingredientgroups.get(food_id, ())
+            if self._group_ingredients.get(ingredientgroup_id)
+        ]
+
+    def has_ingredients(self, food_id):
+        return bool(self.food_ingredients(food_id)) \
+            or bool(self._food_ingredientgroups.get(food_id))
+
+    def all_ingredients(self, food_id):
+        """Selected and deselected ingredients, see ``Food.all_ingredients``.
+
+        Returns:
+            tuple: Lists of the selected and deselected ingredients.
+        """
+        selected_ingredients = []
+        deselected_ingredients = []
+        for relation in self.ingredientrelations(food_id):
+            if relation.selected:
+                selected_ingredients.append(relation.ingredient)
+            else:
+                deselected_ingredients.append(relation.ingredient)
+
+        related = {ingredient.id for ingredient in selected_ingredients}
+        related.update(ingredient.id for ingredient in deselected_ingredients)
+        for ingredientgroup in self.food_ingredientgroups(food_id):
+            for ingredient in self._group_ingredients[ingredientgroup.id]:
+                if ingredient.id not in related:
+                    related.add(ingredient.id)
+                    deselected_ingredients.append(ingredient)
+
+        return selected_ingredients, deselected_ingredients
+
+    def allowed_ingredients(self, food_id):
+        """Ids of the ingredients that can be ordered with the food."""
+        result = {
+            relation.ingredient_id
+            for relation in self.ingredientrelations(food_id)
+        }
+        for ingredientgroup_id in self._food_ingredientgroups.get(food_id, ()):
+            result.update(
+                ingredient.id for ingredient in self._group_ingredients.get(ingredientgroup_id, ())
+            )
+        return result
+
+    def all_ingredientgroups(self, food_id):
+        """Ingredient groups of the food followed by the groups of its other
+        ingredients, see ``Food.all_ingredientgroups``."""
+        ingredientgroups = self.food_ingredientgroups(food_id)
+        ingredientgroup_ids = {ingredientgroup.id for ingredientgroup in ingredientgroups}
+
+        ingredientgroups_added = []
+        for ingredient in self.food_ingredients(food_id):
+            if ingredient.group_id not in ingredientgroup_ids:
+                ingredientgroup_ids.add(ingredient.group_id)
+                ingredientgroups_added.append(ingredient.group)
+
+        return ingredientgroups + ingredientgroups_added
+
+    def detail_ingredientrelations(self, food_id):
+        """Ingredient relations of the food and unsaved relations for the
+        ingredients of its ingredient groups, see ``FoodDetailSerializer``."""
+        from .models import IngredientRelation
+
+        relations = list(self.ingredientrelations(food_id))
+        food_ingredients = {
+            ingredient.id for ingredient in self.food_ingredients(food_id)
+        }
+        for ingredientgroup in self.food_ingredientgroups(food_id):
+            for ingredient in self._group_ingredients[ingredientgroup.id]:
+                if ingredient.id not in food_ingredients:
+                    relations.append(
+                        IngredientRelation(
+                            ingredient=ingredient
+                        )
+                    )
+        return relations
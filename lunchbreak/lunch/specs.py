@@ -1,62 +1,51 @@
 from imagekit import ImageSpec
-from imagekit.processors import ResizeToCover
+from polaroid.processors import DraftResizeToCover
+from polaroid.specs import JPEG_OPTIONS
 
 
 class LDPI(ImageSpec):
     processors = [
-        ResizeToCover(270, 120)
+        DraftResizeToCover(270, 120)
     ]
     format = 'JPEG'
-    options = {
-        'quality': 100
-    }
+    options = JPEG_OPTIONS
 
 
 class MDPI(ImageSpec):
     processors = [
-        ResizeToCover(360, 160)
+        DraftResizeToCover(360, 160)
     ]
     format = 'JPEG'
-    options = {
-        'quality': 100
-    }
+    options = JPEG_OPTIONS
 
 
 class HDPI(ImageSpec):
     processors = [
-        ResizeToCover(540, 240)
+        DraftResizeToCover(540, 240)
     ]
     format = 'JPEG'
-    options = {
-        'quality': 100
-    }
+    options = JPEG_OPTIONS
 
 
 class XHDPI(ImageSpec):
     processors = [
-        ResizeToCover(720, 320)
+        DraftResizeToCover(720, 320)
     ]
     format = 'JPEG'
-    options = {
-        'quality': 100
-    }
+    options = JPEG_OPTIONS
 
 
 class XXHDPI(ImageSpec):
     processors = [
-        ResizeToCover(1080, 480)
+        DraftResizeToCover(1080, 480)
     ]
     format = 'JPEG'
-    options = {
-        'quality': 100
-    }
+    options = JPEG_OPTIONS
 
 
 class XXXHDPI(ImageSpec):
     processors = [
-        ResizeToCover(1440, 640)
+        DraftResizeToCover(1440, 640)
     ]
     format = 'JPEG'
-    options = {
-        'quality': 100
-    }
+    options = JPEG_OPTIONS
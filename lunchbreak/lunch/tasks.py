@@ -0,0 +1,15 @@
+from celery import shared_task
+from Lunchbreak.tasks import DebugLoggingTask
+
+
+@shared_task(base=DebugLoggingTask)
+def render_store_header(store_header_id, attrs=None):
+    from .models import StoreHeader
+    try:
+        store_header = StoreHeader.objects.get(
+            pk=store_header_id
+        )
+    except StoreHeader.DoesNotExist:
+        return
+
+    store_header.render_versions('original', attrs=attrs)
@@ -1,3 +1,6 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from . import LunchTestCase
 from ..exceptions import LinkingError
 from ..models import Ingredient, IngredientGroup, IngredientRelation
@@ -80,3 +83,54 @@ class IngredientTestCase(LunchTestCase):
         self.food.check_ingredients(
             ingredients=[self.ingredient]
         )
+
+    def test_update_typical(self):
+        """Test whether the typical ingredients are updated in one query."""
+        ingredients = [
+            Ingredient.objects.create(
+                name='Ingredient {}'.format(i),
+                cost=1,
+                group=self.other_ingredientgroup if i % 2 else self.ingredientgroup
+            )
+            for i in range(6)
+        ]
+        self.food.ingredientgroups.add(self.ingredientgroup)
+        for ingredient in ingredients:
+            IngredientRelation.objects.create(
+                ingredient=ingredient,
+                food=self.food
+            )
+        IngredientRelation.objects.filter(
+            food=self.food
+        ).update(
+            typical=False
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            self.food.update_typical()
+
+        updates = [
+            query['sql']
+            for query in context.captured_queries
+            if query['sql'].startswith(
+                'UPDATE "{}"'.format(IngredientRelation._meta.db_table)
+            )
+        ]
+        self.assertEqual(len(updates), 1)
+        for ingredient in ingredients:
+            self.assertEqual(
+                IngredientRelation.objects.get(
+                    food=self.food,
+                    ingredient=ingredient
+                ).typical,
+                ingredient.group == self.other_ingredientgroup
+            )
+
+        with CaptureQueriesContext(connection) as context:
+            self.food.update_typical()
+        self.assertFalse(
+            any(
+                query['sql'].startswith('UPDATE')
+                for query in context.captured_queries
+            )
+        )
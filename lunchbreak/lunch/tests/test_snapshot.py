@@ -0,0 +1,125 @@
+from django.core.cache import cache
+
+from . import LunchTestCase
+from ..models import Food, Ingredient, IngredientGroup, Quantity, Store
+from ..serializers import FoodDetailSerializer
+from ..snapshot import MenuSnapshot
+from ..versioning import HeaderVersioning
+
+
+class MenuSnapshotTestCase(LunchTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        MenuSnapshot._local.clear()
+
+    def test_build(self):
+        """Test whether a snapshot is built with a fixed number of queries."""
+        with self.assertNumQueries(6):
+            snapshot = MenuSnapshot.for_store(self.store)
+
+        with self.assertNumQueries(0):
+            self.assertIs(MenuSnapshot.for_store(self.store), snapshot)
+
+        selected, deselected = snapshot.all_ingredients(self.food.id)
+        self.assertEqual(selected, [self.ingredient])
+        self.assertEqual(deselected, [self.deselected_ingredient])
+        self.assertEqual(
+            snapshot.allowed_ingredients(self.food.id),
+            {self.ingredient.id, self.deselected_ingredient.id}
+        )
+        self.assertTrue(snapshot.has_ingredients(self.food.id))
+        self.assertEqual(snapshot.all_ingredientgroups(self.food.id), [self.ingredientgroup])
+
+    def test_versioning(self):
+        """Test whether changes to the menu create a new snapshot."""
+        snapshot = MenuSnapshot.for_store(self.store)
+        last_modified = Store.objects.get(id=self.store.id).last_modified
+
+        ingredientgroup = IngredientGroup.objects.create(
+            name='IngredientGroup snapshot',
+            foodtype=self.foodtype,
+            store=self.store,
+            cost=10
+        )
+        ingredient = Ingredient.objects.create(
+            name='Ingredient snapshot',
+            group=ingredientgroup,
+            cost=10
+        )
+        self.food.ingredientgroups.add(ingredientgroup)
+        quantity = Quantity.objects.create(
+            foodtype=self.foodtype,
+            store=self.store,
+            minimum=1,
+            maximum=10
+        )
+
+        self.assertGreater(
+            Store.objects.get(id=self.store.id).last_modified,
+            last_modified
+        )
+
+        food = Food.objects.select_related(
+            'menu__store',
+        ).get(
+            id=self.food.id
+        )
+        self.assertIsNot(food.menu_snapshot, snapshot)
+        self.assertIn(ingredient.id, food.allowed_ingredients)
+        self.assertEqual(food.quantity, quantity)
+        self.assertEqual(
+            food.all_ingredientgroups,
+            [self.ingredientgroup, ingredientgroup]
+        )
+
+    def test_serializer(self):
+        """Test whether the detail representation does not query the ingredients."""
+        ingredientgroup = IngredientGroup.objects.create(
+            name='IngredientGroup snapshot',
+            foodtype=self.foodtype,
+            store=self.store,
+            cost=10
+        )
+        ingredient = Ingredient.objects.create(
+            name='Ingredient snapshot',
+            group=ingredientgroup,
+            cost=10
+        )
+        self.food.ingredientgroups.add(ingredientgroup)
+
+        food = Food.objects.select_related(
+            'foodtype',
+            'menu__store',
+        ).get(
+            id=self.food.id
+        )
+        # Build the snapshot
+        food.menu_snapshot
+
+        request = self.factory.get('/')
+        request.version = HeaderVersioning.allowed_versions[-1]
+        with self.assertNumQueries(0):
+            representation = FoodDetailSerializer(
+                food,
+                context={
+                    'request': request
+                }
+            ).data
+
+        self.assertEqual(
+            [
+                ingredientrelation['ingredient']['id']
+                for ingredientrelation in representation['ingredients']
+            ],
+            [self.ingredient.id, self.deselected_ingredient.id, ingredient.id]
+        )
+        self.assertFalse(representation['ingredients'][-1]['selected'])
+        self.assertEqual(
+            [
+                representation_group['id']
+                for representation_group in representation['ingredientgroups']
+            ],
+            [self.ingredientgroup.id, ingredientgroup.id]
+        )
@@ -5,6 +5,7 @@ from customers.exceptions import (PastOrderDenied, PreorderTimeExceeded,
                                   StoreClosed)
 from Lunchbreak.tests.testcase import LunchbreakTestCase
 
+from ..geo import grid_cell, grid_ranges
 from ..models import HolidayPeriod, OpeningPeriod, Store
 
 
@@ -97,6 +98,43 @@ class StoreTestCase(LunchbreakTestCase):
             [store_center, store_under2, store_under5, store_under8]
         )
 
+        for store in [store_center, store_under2, store_under5, store_under8]:
+            self.assertEqual(
+                store.grid_cell,
+                grid_cell(store.latitude, store.longitude)
+            )
+
+        # Stores outside of the grid cells are never returned
+        Store.objects.filter(
+            id=store_under8.id
+        ).update(
+            grid_cell=0
+        )
+        self.assertInCount(
+            Store.objects.nearby(lat, lng, 8),
+            [store_center, store_under2, store_under5]
+        )
+
+    def test_grid_ranges(self):
+        """Test whether the grid ranges cover the circle around a point."""
+
+        def covered(latitude, longitude, ranges):
+            cell = grid_cell(latitude, longitude)
+            return any(first <= cell <= last for first, last in ranges)
+
+        ranges = grid_ranges(51.0111595, 3.9075993, 8)
+        # 7,95km west and 8km north and south of the center
+        self.assertTrue(covered(51.0267939, 3.7968594, ranges))
+        self.assertTrue(covered(51.083, 3.9075993, ranges))
+        self.assertTrue(covered(50.940, 3.9075993, ranges))
+        self.assertFalse(covered(51.2, 3.9075993, ranges))
+        self.assertFalse(covered(51.0111595, 4.2, ranges))
+
+        # Circles crossing the antimeridian
+        ranges = grid_ranges(0, 179.99, 10)
+        self.assertTrue(covered(0, -179.99, ranges))
+        self.assertTrue(covered(0, 179.95, ranges))
+
     @mock.patch('googlemaps.Client.timezone')
     @mock.patch('googlemaps.Client.geocode')
     def test_last_modified(self, mock_geocode, mock_timezone):
@@ -1,6 +1,15 @@
+import mock
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils import timezone
 from lunch.models import StoreHeader
+from lunch.tasks import render_store_header
+from lunch.views import StoreHeaderView
 from Lunchbreak.tests.testcase import LunchbreakTestCase
+from PIL import Image
+from pilkit.utils import open_image
 from polaroid.tests import PolaroidTestCase
+from rest_framework import status
 
 
 class StoreHeaderTestCase(LunchbreakTestCase, PolaroidTestCase):
@@ -17,3 +26,163 @@ class StoreHeaderTestCase(LunchbreakTestCase, PolaroidTestCase):
             original_value,
             self.store.last_modified
         )
+
+    def test_polaroid_versions(self):
+        """Test whether the versions are sorted from small to large."""
+        self.assertEqual(
+            [attr for attr, version in StoreHeader.polaroid_versions['original']],
+            ['ldpi', 'mdpi', 'hdpi', 'xhdpi', 'xxhdpi', 'xxxhdpi']
+        )
+
+    @mock.patch('lunch.tasks.render_store_header.delay')
+    @mock.patch('imagekit.cachefiles.ImageCacheFile.exists')
+    def test_retrieve_generated(self, mock_exists, mock_delay):
+        """Test whether missing versions are not rendered in the request."""
+        store_header = StoreHeader.objects.create(
+            store=self.store,
+            original=self.image
+        )
+
+        mock_exists.return_value = True
+        image = store_header.retrieve_from_source(
+            'original',
+            300,
+            150,
+            generated=True
+        )
+        self.assertEqual(image.name, store_header.mdpi.name)
+        self.assertFalse(mock_delay.called)
+
+        mock_exists.return_value = False
+        image = store_header.retrieve_from_source(
+            'original',
+            1200,
+            600,
+            generated=True
+        )
+        self.assertEqual(image, store_header.original)
+        mock_delay.assert_called_once_with(
+            store_header_id=store_header.id,
+            attrs=['xxxhdpi']
+        )
+
+    @mock.patch('lunch.tasks.render_store_header.delay')
+    def test_version_missing(self, mock_delay):
+        """Test whether a missing version is only enqueued once."""
+        store_header = StoreHeader.objects.create(
+            store=self.store,
+            original=self.image
+        )
+        mock_delay.reset_mock()
+
+        for i in range(3):
+            store_header.version_missing('mdpi')
+        mock_delay.assert_called_once_with(
+            store_header_id=store_header.id,
+            attrs=['mdpi']
+        )
+
+        store_header.version_missing('hdpi')
+        self.assertEqual(mock_delay.call_count, 2)
+
+        cache.delete(
+            StoreHeader.RENDER_PENDING_KEY.format(
+                id=store_header.id,
+                attr='mdpi'
+            )
+        )
+        store_header.version_missing('mdpi')
+        self.assertEqual(mock_delay.call_count, 3)
+
+    @mock.patch('imagekit.cachefiles.ImageCacheFile.exists')
+    def test_render(self, mock_exists):
+        """Test whether all versions are rendered from a single decode."""
+        store_header = StoreHeader.objects.create(
+            store=self.store,
+            original=self.image
+        )
+
+        mock_exists.return_value = True
+        with mock.patch('polaroid.models.open_image') as mock_open_image:
+            render_store_header(store_header_id=store_header.id)
+            self.assertFalse(mock_open_image.called)
+
+        mock_exists.return_value = False
+        with mock.patch('polaroid.models.open_image', wraps=open_image) as mock_open_image:
+            render_store_header(store_header_id=store_header.id)
+            self.assertEqual(mock_open_image.call_count, 1)
+
+        for attr, version in StoreHeader.polaroid_versions['original']:
+            image = getattr(store_header, attr)
+            self.assertTrue(image.storage.exists(image.name))
+            with image.storage.open(image.name) as rendered_file:
+                width, height = Image.open(rendered_file).size
+            self.assertGreaterEqual(width, version.width)
+            self.assertGreaterEqual(height, version.height)
+            self.assertTrue(width == version.width or height == version.height)
+            image.storage.delete(image.name)
+
+        # Unknown store headers are ignored
+        render_store_header(store_header_id=-1)
+
+    @mock.patch('django.core.files.storage.FileSystemStorage.get_modified_time')
+    @mock.patch('imagekit.cachefiles.ImageCacheFile.exists')
+    @mock.patch('lunch.tasks.render_store_header.delay')
+    @mock.patch('lunch.views.sendfile')
+    def test_view_caching(self, mock_sendfile, mock_delay, mock_exists,
+                          mock_modified_time):
+        """Test whether header images can be validated and cached."""
+        mock_sendfile.side_effect = lambda *args, **kwargs: HttpResponse()
+        mock_exists.return_value = True
+        mock_modified_time.return_value = timezone.now()
+        store_header = StoreHeader.objects.create(
+            store=self.store,
+            original=self.image
+        )
+        digest = store_header.digest('mdpi')
+        url_kwargs = {
+            'store_id': self.store.id,
+            'width': '300',
+            'height': '150',
+        }
+
+        def get(digest=None, **extra):
+            request = self.factory.get('/store/header', **extra)
+            return self.as_view(
+                request,
+                StoreHeaderView,
+                digest=digest,
+                **url_kwargs
+            )
+
+        response = get()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"{}"'.format(digest))
+        self.assertEqual(response['Cache-Control'], StoreHeaderView.CACHE_CONTROL)
+        self.assertTrue(response['Content-Location'].endswith(digest))
+        self.assertIn('Last-Modified', response)
+
+        mock_sendfile.reset_mock()
+        mock_exists.reset_mock()
+        response = get(HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(mock_sendfile.called)
+        self.assertFalse(mock_exists.called)
+
+        response = get(digest=digest)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response['Cache-Control'],
+            StoreHeaderView.CACHE_CONTROL_IMMUTABLE
+        )
+
+        response = get(digest='0' * 16)
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertTrue(response['Location'].endswith(digest))
+
+        # Stand-ins for versions that are not rendered yet are not cached
+        mock_exists.return_value = False
+        response = get(digest=digest)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        self.assertNotIn('ETag', response)
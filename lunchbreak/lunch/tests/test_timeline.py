@@ -0,0 +1,168 @@
+from datetime import time, timedelta
+
+import mock
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from Lunchbreak.tests.testcase import LunchbreakTestCase
+from pendulum import Pendulum
+
+from ..config import MONDAY, SUNDAY
+from ..models import HolidayPeriod, OpeningPeriod, Store
+from ..timeline import (MINUTES_PER_WEEK, Timeline, merge_intervals,
+                        subtract_intervals)
+
+
+class TimelineTestCase(LunchbreakTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.store.timezone = 'Europe/Brussels'
+
+    def test_intervals(self):
+        self.assertEqual(
+            merge_intervals([(5, 10), (0, 3), (3, 4), (9, 12)]),
+            [(0, 4), (5, 12)]
+        )
+        self.assertEqual(
+            subtract_intervals([(0, 100)], [(10, 20), (50, 60), (95, 200)]),
+            [(0, 10), (20, 50), (60, 95)]
+        )
+
+    def test_compile(self):
+        OpeningPeriod.objects.create(
+            store=self.store,
+            day=MONDAY,
+            time=time(9, 00),
+            duration=timedelta(hours=8)
+        )
+        OpeningPeriod.objects.create(
+            store=self.store,
+            day=SUNDAY,
+            time=time(22, 00),
+            duration=timedelta(hours=4)
+        )
+
+        timeline = Timeline.compile(self.store)
+        self.assertEqual(
+            timeline.weekly,
+            [
+                (0, 2 * 60),
+                (9 * 60, 17 * 60),
+                (MINUTES_PER_WEEK - 2 * 60, MINUTES_PER_WEEK),
+            ]
+        )
+
+    def test_is_open_without_queries(self):
+        # 1996-10-07 is a monday
+        monday = Pendulum.create(
+            year=1996,
+            month=10,
+            day=7,
+            tz=self.store.timezone
+        )
+        OpeningPeriod.objects.create(
+            store=self.store,
+            day=MONDAY,
+            time=time(9, 00),
+            duration=timedelta(hours=8)
+        )
+        # Compile the timeline
+        self.store.is_open(monday.at(hour=12)._datetime, now=monday._datetime)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(
+                self.store.is_open(
+                    monday.at(hour=12)._datetime,
+                    now=monday._datetime
+                )
+            )
+            self.assertFalse(
+                self.store.is_open(
+                    monday.at(hour=18)._datetime,
+                    now=monday._datetime,
+                    raise_exception=False
+                )
+            )
+            periods = self.store.openingperiods_for_day(monday._datetime)
+            self.assertEqual(len(periods), 1)
+            self.assertEqual(periods[0].start, monday.at(hour=9)._datetime)
+            self.assertEqual(periods[0].end, monday.at(hour=17)._datetime)
+
+    def test_invalidation(self):
+        monday = Pendulum.create(
+            year=1996,
+            month=10,
+            day=7,
+            tz=self.store.timezone
+        )
+        openingperiod = OpeningPeriod.objects.create(
+            store=self.store,
+            day=MONDAY,
+            time=time(9, 00),
+            duration=timedelta(hours=8)
+        )
+        noon = monday.at(hour=12)._datetime
+        self.assertTrue(self.store.is_open(noon, now=monday._datetime))
+
+        holidayperiod = HolidayPeriod.objects.create(
+            store=self.store,
+            start=monday._datetime,
+            end=monday.add(days=1)._datetime,
+            closed=True
+        )
+        self.assertFalse(
+            self.store.is_open(noon, now=monday._datetime, raise_exception=False)
+        )
+
+        holidayperiod.delete()
+        self.assertTrue(self.store.is_open(noon, now=monday._datetime))
+
+        openingperiod.time = time(13, 00)
+        openingperiod.save()
+        self.assertFalse(
+            self.store.is_open(noon, now=monday._datetime, raise_exception=False)
+        )
+
+    def test_invalidation_other_process(self):
+        """Test whether a change is picked up by processes with another
+        cache."""
+        monday = Pendulum.create(
+            year=1996,
+            month=10,
+            day=7,
+            tz=self.store.timezone
+        )
+        self.store.save()
+        openingperiod = OpeningPeriod.objects.create(
+            store=self.store,
+            day=MONDAY,
+            time=time(9, 00),
+            duration=timedelta(hours=8)
+        )
+        noon = monday.at(hour=12)._datetime
+        other_cache = LocMemCache('other', {})
+
+        def is_open():
+            with mock.patch('lunch.timeline.cache', other_cache):
+                store = Store.objects.get(id=self.store.id)
+                return store.is_open(
+                    noon,
+                    now=monday._datetime,
+                    raise_exception=False
+                )
+
+        self.assertTrue(is_open())
+
+        openingperiod.time = time(13, 00)
+        openingperiod.save()
+        self.assertFalse(is_open())
+
+        openingperiod.delete()
+        OpeningPeriod.objects.create(
+            store=Store.objects.get(id=self.store.id),
+            day=MONDAY,
+            time=time(12, 00),
+            duration=timedelta(hours=1)
+        )
+        self.assertTrue(is_open())
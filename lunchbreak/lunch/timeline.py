@@ -0,0 +1,316 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+import pytz
+from django.core.cache import cache
+from django.utils import timezone
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+def merge_intervals(intervals):
+    """Merge overlapping or touching ``(start, end)`` intervals.
+
+    Args:
+        intervals (iterable): ``(start, end)`` tuples of integers.
+
+    Returns:
+        list: Sorted and merged ``(start, end)`` tuples.
+    """
+    result = []
+    for start, end in sorted(intervals):
+        if result and start <= result[-1][1]:
+            if end > result[-1][1]:
+                result[-1] = (result[-1][0], end)
+        else:
+            result.append((start, end))
+    return result
+
+
+def subtract_intervals(intervals, excluded):
+    """Remove the excluded ``(start, end)`` intervals from the given intervals.
+
+    Both lists need to be sorted and merged, see :func:`merge_intervals`.
+    Bounds are inclusive, an interval touching an excluded interval keeps its
+    shared bound like ``pendulum.Period.exclude`` does.
+    """
+    result = []
+    for start, end in intervals:
+        for excluded_start, excluded_end in excluded:
+            if excluded_end < start or excluded_start > end:
+                continue
+            if excluded_start > start:
+                result.append((start, excluded_start))
+            start = excluded_end
+            if start >= end:
+                break
+        else:
+            result.append((start, end))
+    return result
+
+
+class TimelinePeriod:
+    """Period in which a store is open, returned by :class:`Timeline`.
+
+    Behaves like the ``pendulum.Period`` used by the templates, ``start`` and
+    ``end`` are aware datetimes in the store's timezone and both are included
+    in the period.
+    """
+
+    __slots__ = ('start', 'end',)
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+    def __contains__(self, dt):
+        return self.start <= dt <= self.end
+
+    def __eq__(self, other):
+        return isinstance(other, TimelinePeriod) \
+            and self.start == other.start \
+            and self.end == other.end
+
+    def __hash__(self):
+        return hash((self.start, self.end,))
+
+    def __repr__(self):
+        return '<TimelinePeriod [{start} -> {end}]>'.format(
+            start=self.start,
+            end=self.end
+        )
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+
+class Timeline:
+    """Opening hours of a store compiled to integer intervals.
+
+    The weekly opening periods are stored as sorted and merged
+    ``(start, end)`` minute-of-week intervals in the local time of the store,
+    0 being monday 00:00. Opening periods running past sunday midnight are split
+    at the end of the week. Holiday periods are not weekly, they are kept as
+    ``(start, end)`` UTC timestamps split into open and closed ones.
+
+    A timeline is compiled once with 2 queries and shared through the Django
+    cache. Like ``MenuSnapshot`` it is versioned by ``Store.last_modified``,
+    which is updated whenever an ``OpeningPeriod`` or ``HolidayPeriod`` of the
+    store changes, see ``Store.changed_periods``. Processes that still hold a
+    timeline of an earlier version do not use it anymore. A change of
+    ``Store.timezone`` is picked up because the timezone is part of the
+    compiled timeline.
+    """
+
+    CACHE_KEY = 'lunch:timeline:{store_id}:{version}'
+
+    def __init__(self, timezone, weekly, holidays_open, holidays_closed,
+                 version=None):
+        self.timezone = timezone
+        self.weekly = weekly
+        self.holidays_open = holidays_open
+        self.holidays_closed = holidays_closed
+        self.version = version
+
+        self._tzinfo = pytz.timezone(timezone)
+        self._weekly_starts = [start * 60 for start, end in weekly]
+
+    def __getstate__(self):
+        return (
+            self.timezone,
+            self.weekly,
+            self.holidays_open,
+            self.holidays_closed,
+            self.version,
+        )
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    @classmethod
+    def cache_key(cls, store_id, version):
+        return cls.CACHE_KEY.format(
+            store_id=store_id,
+            version=version
+        )
+
+    @staticmethod
+    def version_of(store):
+        return int(store.last_modified.timestamp() * 1000000)
+
+    def is_current(self, store):
+        """Whether the timeline is compiled from the current periods and
+        timezone of the given store."""
+        return self.version == self.version_of(store) \
+            and self.timezone == store.timezone
+
+    @classmethod
+    def for_store(cls, store):
+        """Compiled timeline of the given store from cache if available.
+
+        Args:
+            store (Store): Store, its ``last_modified`` is used as version.
+
+        Returns:
+            Timeline
+        """
+        version = cls.version_of(store)
+        key = cls.cache_key(store.id, version)
+        timeline = cache.get(key)
+        if timeline is None or not timeline.is_current(store):
+            timeline = cls.compile(store)
+            cache.set(key, timeline)
+        return timeline
+
+    @classmethod
+    def compile(cls, store):
+        from .models import HolidayPeriod, OpeningPeriod
+
+        intervals = []
+        openingperiods = OpeningPeriod.objects.filter(
+            store_id=store.id
+        ).values_list(
+            'day',
+            'time',
+            'duration',
+        )
+        for day, time, duration in openingperiods:
+            start = (day - 1) * MINUTES_PER_DAY + time.hour * 60 + time.minute
+            end = start + min(
+                int(duration.total_seconds()) // 60,
+                MINUTES_PER_WEEK
+            )
+            if end > MINUTES_PER_WEEK:
+                intervals.append((start, MINUTES_PER_WEEK))
+                intervals.append((0, end - MINUTES_PER_WEEK))
+            else:
+                intervals.append((start, end))
+
+        holidays_open = []
+        holidays_closed = []
+        holidayperiods = HolidayPeriod.objects.filter(
+            store_id=store.id,
+            end__gte=timezone.now()
+        ).values_list(
+            'start',
+            'end',
+            'closed',
+        )
+        for start, end, closed in holidayperiods:
+            interval = (int(start.timestamp()), int(end.timestamp()),)
+            if closed:
+                holidays_closed.append(interval)
+            else:
+                holidays_open.append(interval)
+
+        return cls(
+            timezone=store.timezone,
+            weekly=merge_intervals(intervals),
+            holidays_open=merge_intervals(holidays_open),
+            holidays_closed=merge_intervals(holidays_closed),
+            version=cls.version_of(store)
+        )
+
+    def holiday_at(self, dt):
+        """Whether a holiday period opens or closes the store at the given time.
+
+        Args:
+            dt (datetime.datetime): Aware datetime.
+
+        Returns:
+            True if an open holiday period contains the datetime, False if
+            only closed ones do and None if no holiday period does.
+        """
+        timestamp = dt.timestamp()
+        for start, end in self.holidays_open:
+            if start <= timestamp <= end:
+                return True
+        for start, end in self.holidays_closed:
+            if start <= timestamp <= end:
+                return False
+        return None
+
+    def is_open_weekly(self, dt):
+        """Whether the weekly opening periods contain the given aware datetime."""
+        if not self.weekly:
+            return False
+
+        local = dt.astimezone(self._tzinfo)
+        second = (
+            (local.weekday() * 24 + local.hour) * 60 + local.minute
+        ) * 60 + local.second
+
+        index = bisect_right(self._weekly_starts, second) - 1
+        if index >= 0 and second <= self.weekly[index][1] * 60:
+            return True
+        # The end of sunday is included in a period ending at midnight.
+        return second == 0 and self.weekly[-1][1] == MINUTES_PER_WEEK
+
+    def _localize(self, naive):
+        return int(
+            self._tzinfo.localize(naive).timestamp()
+        )
+
+    def _weekly_between(self, start, end):
+        """Weekly opening periods as UTC timestamps overlapping [start, end]."""
+        result = []
+        if not self.weekly:
+            return result
+
+        local = datetime.fromtimestamp(start, self._tzinfo)
+        week = datetime(
+            year=local.year,
+            month=local.month,
+            day=local.day
+        ) - timedelta(days=local.weekday())
+
+        while self._localize(week) <= end:
+            for weekly_start, weekly_end in self.weekly:
+                period_start = self._localize(
+                    week + timedelta(minutes=weekly_start)
+                )
+                if period_start > end:
+                    break
+                period_end = self._localize(
+                    week + timedelta(minutes=weekly_end)
+                )
+                if period_end >= start:
+                    result.append((period_start, period_end))
+            week += timedelta(days=7)
+        return result
+
+    def between(self, start, end):
+        """Periods in which the store is open overlapping the given period.
+
+        Args:
+            start (datetime.datetime): Aware start of the period.
+            end (datetime.datetime): Aware end of the period.
+
+        Returns:
+            list: Chronological list of :class:`TimelinePeriod`.
+        """
+        start = int(start.timestamp())
+        end = int(end.timestamp())
+
+        def overlapping(intervals):
+            return [
+                interval for interval in intervals
+                if interval[0] <= end and interval[1] >= start
+            ]
+
+        intervals = merge_intervals(
+            self._weekly_between(start, end) + overlapping(self.holidays_open)
+        )
+        intervals = subtract_intervals(
+            intervals,
+            overlapping(self.holidays_closed)
+        )
+
+        return [
+            TimelinePeriod(
+                start=datetime.fromtimestamp(period_start, self._tzinfo),
+                end=datetime.fromtimestamp(period_end, self._tzinfo)
+            ) for period_start, period_end in overlapping(intervals)
+        ]
@@ -1,8 +1,10 @@
 import datetime
 
 from django.http import Http404
-from django.shortcuts import get_object_or_404
+from django.shortcuts import redirect
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.http import http_date, parse_etags, quote_etag
 from Lunchbreak.views import TargettedViewSet
 from rest_framework import generics, mixins, status
 from rest_framework.response import Response
@@ -11,7 +13,7 @@ from rest_framework_extensions.mixins import NestedViewSetMixin
 from sendfile import sendfile
 
 from .exceptions import UnsupportedAPIVersion
-from .models import HolidayPeriod, OpeningPeriod, Store, StoreCategory
+from .models import HolidayPeriod, OpeningPeriod, StoreCategory, StoreHeader
 from .renderers import JPEGRenderer
 from .serializers import (HolidayPeriodSerializer, OpeningPeriodSerializer,
                           StoreCategorySerializer)
@@ -94,31 +96,91 @@ class StorePeriodsViewSet(TargettedViewSet,
 
 
 class StoreHeaderView(APIView):
+    """Smallest version of the header of a store covering the given size.
+
+    Responses carry an ETag of the version served and conditional requests
+    are answered without touching the storage. Under the URL containing the
+    digest of the version, it can be cached indefinitely.
+    """
 
     renderer_classes = (JPEGRenderer,)
 
-    def get(self, request, store_id, width=None, height=None):
-        store = get_object_or_404(Store, id=store_id)
+    CACHE_CONTROL = 'public, max-age=0, must-revalidate'
+    CACHE_CONTROL_IMMUTABLE = 'public, max-age=31536000, immutable'
 
+    def get(self, request, store_id, width=None, height=None, digest=None):
         width = width if width is not None else request.query_params.get('width')
         height = height if height is not None else request.query_params.get('height')
 
         if height is None or width is None:
             raise Http404()
 
-        if not hasattr(store, 'header'):
+        try:
+            store_header = StoreHeader.objects.get(
+                store_id=store_id
+            )
+        except StoreHeader.DoesNotExist:
             raise Http404('That store does not have a header.')
 
-        image = store.header.retrieve_from_source(
+        width = int(width)
+        height = int(height)
+        attr = store_header.best_version('original', width, height)
+        current_digest = store_header.digest(attr)
+
+        if digest is not None and digest != current_digest:
+            return redirect(
+                'customers:store-header-digest',
+                store_id=store_id,
+                width=width,
+                height=height,
+                digest=current_digest
+            )
+
+        headers = {
+            'ETag': quote_etag(current_digest),
+            'Cache-Control': self.CACHE_CONTROL
+            if digest is None
+            else self.CACHE_CONTROL_IMMUTABLE,
+            'Content-Location': reverse(
+                'customers:store-header-digest',
+                kwargs={
+                    'store_id': store_id,
+                    'width': width,
+                    'height': height,
+                    'digest': current_digest,
+                }
+            ),
+        }
+
+        if headers['ETag'] in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED,
+                headers=headers
+            )
+
+        image = store_header.retrieve_from_source(
             'original',
-            int(width),
-            int(height)
+            width,
+            height,
+            generated=True
         )
         try:
-            return sendfile(request, image.path)
+            response = sendfile(request, image.path)
         except FileNotFoundError:
             raise Http404('File was not found.')
 
+        if image.name != getattr(store_header, attr).name:
+            # Stand-in until the version is rendered in the background
+            response['Cache-Control'] = 'no-cache'
+            return response
+
+        for key, value in headers.items():
+            response[key] = value
+        response['Last-Modified'] = http_date(
+            image.storage.get_modified_time(image.name).timestamp()
+        )
+        return response
+
 
 class StoreCategoryListViewBase(generics.ListAPIView):
 
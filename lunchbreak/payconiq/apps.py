@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class PayconiqAppConfig(AppConfig):
     name = 'payconiq'
     verbose_name = 'Payconiq'
+
+    def ready(self):
+        from webhooks.models import WebhookEvent
+
+        from .models import Transaction
+
+        WebhookEvent.register_handler(
+            WebhookEvent.PAYCONIQ,
+            Transaction.handle_webhook_event
+        )
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payconiq', '0002_transaction_created_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='reconcile_attempts',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Aantal keer dat de status bij Payconiq opgevraagd werd zonder resultaat.', verbose_name='opvragingen'),
+        ),
+    ]
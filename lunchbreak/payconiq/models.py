@@ -1,19 +1,27 @@
+import logging
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from decimal import Decimal
 
 from django.conf import settings
 from django.core.urlresolvers import reverse
+from django.db import transaction as db_transaction
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import ugettext as _
 from Lunchbreak.exceptions import LunchbreakException
 from Lunchbreak.models import StatusSignalModel
 from payconiq import Transaction as PayconiqTransaction
-from payconiq import get_webhook_domain
+from payconiq import get_payconiq_settings, get_webhook_domain
 
+from .exceptions import PayconiqError
 from .fields import StatusSignalCharField
 from .signals import (transaction_canceled, transaction_failed,
                       transaction_succeeded, transaction_timedout)
-from .utils import generate_web_signature
+from .utils import RateLimiter, generate_web_signature
+
+logger = logging.getLogger('lunchbreak')
 
 
 class Merchant(models.Model):
@@ -139,6 +147,20 @@ class Transaction(StatusSignalModel):
         verbose_name=_('handelaar'),
         help_text=_('Handelaar.')
     )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        verbose_name=_('aangemaakt op'),
+        help_text=_('Moment waarop de transactie aangemaakt werd.')
+    )
+    reconcile_attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_('opvragingen'),
+        help_text=_(
+            'Aantal keer dat de status bij Payconiq opgevraagd werd zonder '
+            'resultaat.'
+        )
+    )
 
     @property
     def webhook_url(self):
@@ -193,6 +215,183 @@ class Transaction(StatusSignalModel):
         transaction.save()
         return transaction
 
+    @classmethod
+    def handle_webhook_event(cls, event):
+        """Apply a status received through the webhook.
+
+        Transactions that are not known yet are fetched from Payconiq and
+        linked to the order the webhook was called for.
+
+        Args:
+            event (WebhookEvent): Payconiq webhook event.
+        """
+        from customers.models import Order
+
+        remote_id = event.payload['transaction']['_id']
+        transaction_status = event.payload['transaction']['status']
+
+        try:
+            transaction = cls.objects.get(
+                remote_id=remote_id
+            )
+        except cls.DoesNotExist:
+            if event.payload['order_id'] is None:
+                raise
+            order = Order.objects.select_related(
+                'store__staff__payconiq'
+            ).get(
+                pk=event.payload['order_id']
+            )
+            merchant = order.store.staff.payconiq
+            transaction_data = PayconiqTransaction.get(
+                id=remote_id,
+                merchant_token=merchant.access_token
+            )
+            transaction = cls.objects.create(
+                remote_id=remote_id,
+                amount=transaction_data['amount'],
+                currency=transaction_data['currency'],
+                merchant=merchant
+            )
+            order.transaction = transaction
+            order.save()
+            # This is separated in order to trigger transaction_succeeded signal
+            # Order.transaction_succeeded also needs the order to already be
+            # linked to an existing transaction.
+
+        transaction.status = transaction_status
+        transaction.save()
+
+    @classmethod
+    def reconcile_stale(cls, stale_after=None, limit=None):
+        """Query the status of transactions of which the webhook was missed.
+
+        Transactions that are still unknown some time after they were created
+        are fetched concurrently from Payconiq, bounded by a worker pool and a
+        rate limit. The statuses are saved in batches, sending the status
+        signals of the transactions.
+
+        Transactions older than the 'reconcile_max_age' setting, or of which
+        the status could not be resolved or saved 'reconcile_max_attempts'
+        times, are
+        no longer queried. Transactions that were queried the least go first,
+        so those that stay unknown do not hold back newer ones.
+
+        Args:
+            stale_after (timedelta): Age after which an unknown transaction
+                is stale, defaults to the 'stale_after' setting.
+            limit (int): Maximum amount of transactions.
+
+        Returns:
+            Amount of transactions of which the status changed.
+            int
+        """
+        payconiq_settings = get_payconiq_settings()
+        stale_after = stale_after if stale_after is not None \
+            else payconiq_settings.get('stale_after', timedelta(minutes=10))
+        limit = limit if limit is not None \
+            else payconiq_settings.get('reconcile_limit', 1000)
+        max_age = payconiq_settings.get('reconcile_max_age', timedelta(days=1))
+        max_attempts = payconiq_settings.get('reconcile_max_attempts', 5)
+        batch_size = payconiq_settings.get('reconcile_batch_size', 100)
+        rate_limiter = RateLimiter(
+            payconiq_settings.get('reconcile_rate', 10)
+        )
+
+        now = timezone.now()
+        transactions = list(
+            cls.objects.select_related(
+                'merchant'
+            ).filter(
+                status=cls.UNKNOWN,
+                created_at__lte=now - stale_after,
+                created_at__gt=now - max_age,
+                reconcile_attempts__lt=max_attempts
+            ).order_by(
+                'reconcile_attempts',
+                'created_at'
+            )[:limit]
+        )
+        if not transactions:
+            return 0
+
+        def get_status(transaction):
+            rate_limiter.wait()
+            try:
+                return PayconiqTransaction.get(
+                    id=transaction.remote_id,
+                    merchant_token=transaction.merchant.access_token
+                ).get('status')
+            except PayconiqError as e:
+                logger.exception(
+                    str(e),
+                    exc_info=True,
+                    extra={
+                        'transaction': transaction.id,
+                    }
+                )
+                return None
+
+        statuses = {
+            cls.TIMEDOUT,
+            cls.CANCELED,
+            cls.FAILED,
+            cls.SUCCEEDED,
+        }
+        workers = min(
+            len(transactions),
+            payconiq_settings.get('reconcile_workers', 4)
+        )
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            remote_statuses = {
+                transaction.pk: remote_status
+                for transaction, remote_status in zip(
+                    transactions,
+                    executor.map(get_status, transactions)
+                )
+                if remote_status in statuses
+            }
+
+        changed = 0
+        failed = []
+        pks = list(remote_statuses)
+        for i in range(0, len(pks), batch_size):
+            with db_transaction.atomic():
+                # The webhook may have arrived in the meantime
+                batch = cls.objects.select_for_update().filter(
+                    pk__in=pks[i:i + batch_size],
+                    status=cls.UNKNOWN
+                )
+                for transaction in batch:
+                    transaction.status = remote_statuses[transaction.pk]
+                    # A failing status signal receiver only fails its own
+                    # transaction
+                    try:
+                        with db_transaction.atomic():
+                            transaction.save()
+                    except Exception as e:
+                        logger.exception(
+                            str(e),
+                            exc_info=True,
+                            extra={
+                                'transaction': transaction.id,
+                            }
+                        )
+                        failed.append(transaction.pk)
+                    else:
+                        changed += 1
+
+        cls.objects.filter(
+            pk__in=failed + [
+                transaction.pk
+                for transaction in transactions
+                if transaction.pk not in remote_statuses
+            ]
+        ).update(
+            reconcile_attempts=models.F('reconcile_attempts') + 1
+        )
+        return changed
+
     def save(self, *args, **kwargs):
         self.full_clean()
         super().save(*args, **kwargs)
@@ -1,9 +1,107 @@
+import logging
+import threading
+import time
+
 import payconiq
 import requests
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
 
 from .exceptions import PayconiqError
 
-requests.adapters.DEFAULT_RETRIES = 5
+logger = logging.getLogger('lunchbreak')
+
+session = None
+session_lock = threading.Lock()
+
+
+def get_session():
+    """Session of the current process, its connections are kept alive.
+
+    Only connection errors are retried for requests that are not idempotent.
+    """
+    global session
+    with session_lock:
+        if session is None:
+            settings = payconiq.get_payconiq_settings()
+            retries = settings.get('retries', 3)
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=settings.get('pool_size', 10),
+                max_retries=Retry(
+                    total=retries,
+                    connect=retries,
+                    read=retries,
+                    backoff_factor=settings.get('backoff_factor', 0.3),
+                    status_forcelist=(502, 503, 504,),
+                    method_whitelist=frozenset(['GET'])
+                )
+            )
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        return session
+
+
+def reset_session():
+    global session
+    with session_lock:
+        if session is not None:
+            session.close()
+        session = None
+
+
+class Metrics:
+    """Latency of the requests to Payconiq per method and endpoint.
+
+    Only kept in memory of the current process, see `snapshot`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = {}
+
+    def add(self, method, endpoint, seconds, failed):
+        with self._lock:
+            calls = self.calls.setdefault(
+                (method, endpoint,),
+                {
+                    'count': 0,
+                    'failed': 0,
+                    'seconds': 0.0,
+                    'max_seconds': 0.0,
+                }
+            )
+            calls['count'] += 1
+            calls['failed'] += int(failed)
+            calls['seconds'] += seconds
+            calls['max_seconds'] = max(calls['max_seconds'], seconds)
+
+    def snapshot(self):
+        """Copy of the metrics with the average latency.
+
+        Returns:
+            Metrics by 'METHOD endpoint'.
+            dict
+        """
+        with self._lock:
+            return {
+                '{method} {endpoint}'.format(
+                    method=method,
+                    endpoint=endpoint
+                ): dict(
+                    calls,
+                    average_seconds=calls['seconds'] / calls['count']
+                )
+                for (method, endpoint), calls in self.calls.items()
+            }
+
+
+metrics = Metrics()
 
 
 class Transaction:
@@ -22,9 +120,45 @@ class Transaction:
         )
 
     @classmethod
-    def request(cls, *args, **kwargs):
-        response = requests.request(*args, **kwargs)
-        if not 199 < response.status_code < 300:
+    def request(cls, method, url, endpoint=None, **kwargs):
+        """Send a request through the shared session.
+
+        Args:
+            method (str): HTTP method.
+            url (str): URL.
+            endpoint (str): Name of the endpoint in the metrics, defaults to
+                the URL.
+
+        Raises:
+            PayconiqError: Error status code or the request failed.
+        """
+        kwargs.setdefault(
+            'timeout',
+            payconiq.get_payconiq_settings().get('timeout', (3.05, 10,))
+        )
+        endpoint = endpoint if endpoint is not None else url
+
+        start = time.monotonic()
+        response = None
+        try:
+            response = get_session().request(method, url, **kwargs)
+        except requests.RequestException as e:
+            raise PayconiqError(str(e))
+        finally:
+            seconds = time.monotonic() - start
+            failed = response is None or not 199 < response.status_code < 300
+            metrics.add(method, endpoint, seconds, failed)
+            logger.debug(
+                'Payconiq request.',
+                extra={
+                    'method': method,
+                    'endpoint': endpoint,
+                    'seconds': seconds,
+                    'status_code': getattr(response, 'status_code', None),
+                }
+            )
+
+        if failed:
             raise PayconiqError.from_response(
                 response=response
             )
@@ -38,6 +172,7 @@ class Transaction:
         response = cls.request(
             method='POST',
             url=cls.get_base_url(),
+            endpoint='transactions',
             headers={
                 'Authorization': merchant_token,
             },
@@ -57,6 +192,7 @@ class Transaction:
         response = cls.request(
             method='GET',
             url=cls.get_url(id),
+            endpoint='transactions/{id}',
             headers={
                 'Authorization': merchant_token,
             }
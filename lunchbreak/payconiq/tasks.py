@@ -0,0 +1,9 @@
+from celery import shared_task
+from Lunchbreak.tasks import DebugLoggingTask
+
+
+@shared_task(base=DebugLoggingTask)
+def reconcile_stale_transactions():
+    """Query Payconiq for transactions that are still unknown."""
+    from .models import Transaction
+    return Transaction.reconcile_stale()
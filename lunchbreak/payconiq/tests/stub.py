@@ -0,0 +1,87 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StubServer:
+    """Local HTTP/1.1 server standing in for the Payconiq API.
+
+    Attributes:
+        latency (float): Seconds to wait before responding.
+        statuses (list): Status codes of the next responses, 200 afterwards.
+        json (dict): Body of the responses.
+        requests (list): Methods, paths and client addresses of the requests.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.reset()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def respond(self):
+                length = int(self.headers.get('Content-Length', 0))
+                self.rfile.read(length)
+                stub.requests.append(
+                    (self.command, self.path, self.client_address,)
+                )
+                time.sleep(stub.latency)
+
+                status = stub.statuses.pop(0) if stub.statuses else 200
+                content = json.dumps(stub.json).encode('utf-8')
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(content)))
+                    self.end_headers()
+                    self.wfile.write(content)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client timed out
+                    pass
+
+            do_GET = respond
+            do_POST = respond
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever,
+            daemon=True
+        )
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return 'http://{host}:{port}'.format(
+            host=host,
+            port=port
+        )
+
+    @property
+    def connections(self):
+        """Amount of distinct connections requests were received on."""
+        return len({address for method, path, address in self.requests})
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset(self):
+        self.latency = 0
+        self.statuses = []
+        self.json = {}
+        del self.requests[:]
@@ -0,0 +1,160 @@
+import uuid
+from datetime import timedelta
+
+import mock
+from django.utils import timezone
+from payconiq import Transaction as PayconiqTransaction
+
+from .testcase import PayconiqTestCase
+from ..exceptions import PayconiqError
+from ..models import Merchant, Transaction
+from ..signals import transaction_succeeded
+from ..tasks import reconcile_stale_transactions
+from ..utils import RateLimiter
+
+
+class ReconcileTestCase(PayconiqTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.merchant = Merchant.objects.create(
+            name='Merchant',
+            remote_id='merchant',
+            access_token='access_token',
+            widget_token=uuid.uuid4()
+        )
+        self.remote_statuses = {}
+
+        patcher_get = mock.patch.object(
+            PayconiqTransaction,
+            'get',
+            side_effect=self.get
+        )
+        self.mock_get = patcher_get.start()
+        self.addCleanup(patcher_get.stop)
+
+    def get(self, id, merchant_token=None):
+        status = self.remote_statuses[id]
+        if isinstance(status, Exception):
+            raise status
+        return {
+            '_id': id,
+            'status': status,
+        }
+
+    def transaction(self, remote_id, remote_status, age=timedelta(hours=1),
+                    status=Transaction.UNKNOWN):
+        transaction = Transaction.objects.create(
+            remote_id=remote_id,
+            amount=100,
+            status=status,
+            merchant=self.merchant
+        )
+        Transaction.objects.filter(
+            pk=transaction.pk
+        ).update(
+            created_at=timezone.now() - age
+        )
+        self.remote_statuses[remote_id] = remote_status
+        return transaction
+
+    def assertStatus(self, transaction, status):
+        transaction.refresh_from_db()
+        self.assertEqual(transaction.status, status)
+
+    def test_reconcile_stale(self):
+        """Test whether only stale unknown transactions are updated."""
+        succeeded = self.transaction('succeeded', Transaction.SUCCEEDED)
+        timedout = self.transaction('timedout', Transaction.TIMEDOUT)
+        pending = self.transaction('pending', Transaction.UNKNOWN)
+        failing = self.transaction('failing', PayconiqError())
+        fresh = self.transaction(
+            'fresh',
+            Transaction.SUCCEEDED,
+            age=timedelta(seconds=1)
+        )
+        done = self.transaction(
+            'done',
+            Transaction.SUCCEEDED,
+            status=Transaction.FAILED
+        )
+
+        receiver = mock.Mock()
+        transaction_succeeded.connect(receiver)
+        self.addCleanup(transaction_succeeded.disconnect, receiver)
+
+        changed = Transaction.reconcile_stale(stale_after=timedelta(minutes=10))
+
+        self.assertEqual(changed, 2)
+        self.assertEqual(self.mock_get.call_count, 4)
+        self.assertStatus(succeeded, Transaction.SUCCEEDED)
+        self.assertStatus(timedout, Transaction.TIMEDOUT)
+        self.assertStatus(pending, Transaction.UNKNOWN)
+        self.assertStatus(failing, Transaction.UNKNOWN)
+        self.assertStatus(fresh, Transaction.UNKNOWN)
+        self.assertStatus(done, Transaction.FAILED)
+        self.assertEqual(receiver.call_count, 1)
+
+    def test_reconcile_limits(self):
+        """Test whether transactions that stay unknown or are too old are no
+        longer queried."""
+        pending = self.transaction('pending', Transaction.UNKNOWN)
+        old = self.transaction(
+            'old',
+            Transaction.SUCCEEDED,
+            age=timedelta(days=2)
+        )
+
+        with self.settings(PAYCONIQ={'reconcile_max_attempts': 2}):
+            for i in range(3):
+                self.assertEqual(Transaction.reconcile_stale(), 0)
+
+            new = self.transaction('new', Transaction.SUCCEEDED)
+            self.assertEqual(Transaction.reconcile_stale(limit=1), 1)
+
+        self.assertEqual(
+            [call[1]['id'] for call in self.mock_get.call_args_list],
+            ['pending', 'pending', 'new']
+        )
+        pending.refresh_from_db()
+        self.assertEqual(pending.reconcile_attempts, 2)
+        self.assertStatus(old, Transaction.UNKNOWN)
+        self.assertStatus(new, Transaction.SUCCEEDED)
+
+    def test_receiver_failure(self):
+        """Test whether a failing status signal receiver only fails its own
+        transaction."""
+        failing = self.transaction('failing', Transaction.SUCCEEDED)
+        succeeded = self.transaction('succeeded', Transaction.SUCCEEDED)
+
+        def receiver(sender, transaction, **kwargs):
+            if transaction.pk == failing.pk:
+                raise ValueError('Receiver failed.')
+
+        transaction_succeeded.connect(receiver)
+        self.addCleanup(transaction_succeeded.disconnect, receiver)
+
+        self.assertEqual(Transaction.reconcile_stale(), 1)
+        self.assertStatus(failing, Transaction.UNKNOWN)
+        self.assertStatus(succeeded, Transaction.SUCCEEDED)
+        self.assertEqual(failing.reconcile_attempts, 1)
+        succeeded.refresh_from_db()
+        self.assertEqual(succeeded.reconcile_attempts, 0)
+
+    def test_task(self):
+        self.transaction('remote', Transaction.SUCCEEDED)
+        self.assertEqual(reconcile_stale_transactions(), 1)
+
+    @mock.patch('payconiq.utils.time')
+    def test_rate_limiter(self, mock_time):
+        """Test whether calls are spaced out by the interval."""
+        mock_time.monotonic.return_value = 100.0
+        rate_limiter = RateLimiter(4)
+
+        for i in range(3):
+            rate_limiter.wait()
+
+        self.assertEqual(
+            [call[0][0] for call in mock_time.sleep.call_args_list],
+            [0.25, 0.5]
+        )
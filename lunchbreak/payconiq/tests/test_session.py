@@ -0,0 +1,98 @@
+import mock
+from django.test.utils import override_settings
+
+from ..exceptions import PayconiqError
+from ..resources import Transaction, metrics, reset_session
+from ..utils import load_public_key
+from .stub import StubServer
+from .testcase import PayconiqTestCase
+
+
+class SessionTestCase(PayconiqTestCase):
+
+    REMOTE_ID = '5e14137fe51905040b202c04'
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.stub = StubServer()
+        cls.stub.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        self.stub.reset()
+        self.stub.json = {
+            'transactionId': self.REMOTE_ID,
+            '_id': self.REMOTE_ID,
+            'status': 'SUCCEEDED',
+        }
+        reset_session()
+        self.addCleanup(reset_session)
+        metrics.reset()
+
+        patcher_base = mock.patch('payconiq.api_base_test', self.stub.url)
+        self.addCleanup(patcher_base.stop)
+        patcher_base.start()
+
+    def test_connection_reuse(self):
+        """Test whether requests reuse the same connection."""
+        for i in range(3):
+            Transaction.get(id=self.REMOTE_ID, merchant_token='token')
+        Transaction.start(amount=1, webhook_url='', merchant_token='token')
+
+        self.assertEqual(len(self.stub.requests), 4)
+        self.assertEqual(self.stub.connections, 1)
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['GET transactions/{id}']['count'], 3)
+        self.assertEqual(snapshot['POST transactions']['count'], 1)
+        self.assertEqual(snapshot['POST transactions']['failed'], 0)
+
+    def test_retry(self):
+        """Test whether only idempotent requests are retried."""
+        with override_settings(PAYCONIQ={'backoff_factor': 0}):
+            self.stub.statuses = [503]
+            transaction = Transaction.get(
+                id=self.REMOTE_ID,
+                merchant_token='token'
+            )
+            self.assertEqual(transaction['status'], 'SUCCEEDED')
+            self.assertEqual(len(self.stub.requests), 2)
+
+            self.stub.statuses = [503]
+            self.assertRaises(
+                PayconiqError,
+                Transaction.start,
+                amount=1,
+                webhook_url='',
+                merchant_token='token'
+            )
+            self.assertEqual(len(self.stub.requests), 3)
+
+        self.assertEqual(
+            metrics.snapshot()['POST transactions']['failed'],
+            1
+        )
+
+    def test_timeout(self):
+        """Test whether slow responses time out."""
+        self.stub.latency = 0.5
+        with override_settings(PAYCONIQ={'timeout': (1, 0.1,), 'retries': 0}):
+            self.assertRaises(
+                PayconiqError,
+                Transaction.get,
+                id=self.REMOTE_ID,
+                merchant_token='token'
+            )
+        self.assertEqual(
+            metrics.snapshot()['GET transactions/{id}']['failed'],
+            1
+        )
+
+    def test_public_key_cached(self):
+        self.assertIs(load_public_key(), load_public_key())
@@ -1,3 +1,5 @@
+import threading
+import time
 from base64 import b64decode, b64encode
 from binascii import Error, crc32
 from hashlib import sha256
@@ -11,6 +13,23 @@ from payconiq import get_public_key
 from .exceptions import PayconiqError
 
 
+# PEM data -> parsed public key, one per environment
+public_keys = {}
+
+
+def load_public_key():
+    """Public key of the current environment, only parsed once."""
+    data = get_public_key()
+    if data not in public_keys:
+        try:
+            public_keys[data] = openssl_backend.load_pem_public_key(
+                data=data
+            )
+        except ValueError as e:
+            raise PayconiqError(str(e))
+    return public_keys[data]
+
+
 def is_signature_valid(signature, merchant_id, timestamp, algorithm, body):
     if isinstance(signature, str):
         signature = signature.encode('utf8')
@@ -32,12 +51,7 @@ def is_signature_valid(signature, merchant_id, timestamp, algorithm, body):
             crc32=crc32_hex
         ).encode('utf8')
 
-        try:
-            public_key = openssl_backend.load_pem_public_key(
-                data=get_public_key()
-            )
-        except ValueError as e:
-            raise PayconiqError(str(e))
+        public_key = load_public_key()
 
         try:
             public_key.verify(
@@ -67,3 +81,25 @@ def generate_web_signature(merchant_id, webhook_id, currency, amount, widget_tok
     return b64encode(
         signature.digest()
     ).decode('utf-8')
+
+
+class RateLimiter:
+    """Spaces calls out evenly over multiple threads.
+
+    Args:
+        rate (float): Maximum amount of calls per second.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.next_call = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the next call is allowed."""
+        with self._lock:
+            now = time.monotonic()
+            call = max(now, self.next_call)
+            self.next_call = call + self.interval
+        if call > now:
+            time.sleep(call - now)
@@ -7,8 +7,8 @@ from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django.views.generic.base import View
-from payconiq.resources import Transaction as TransactionResource
 from rest_framework import status
+from webhooks.models import WebhookEvent
 
 from .models import Transaction
 from .utils import is_signature_valid
@@ -142,27 +142,18 @@ class WebhookView(View):
             )
             raise Http404()
 
-        if order is not None:
-            transaction_data = TransactionResource.get(
+        WebhookEvent.receive(
+            provider=WebhookEvent.PAYCONIQ,
+            event_id='{id}:{status}'.format(
                 id=transaction_remote_id,
-                merchant_token=merchant.access_token
-            )
-            transaction = Transaction.objects.create(
-                remote_id=transaction_remote_id,
-                amount=transaction_data['amount'],
-                currency=transaction_data['currency'],
-                merchant=merchant
-            )
-            order.transaction = transaction
-            order.save()
-            # This is separated in order to trigger transaction_succeeded signal
-            # Order.transaction_succeeded also needs the order to already be
-            # linked to an existing transaction.
-            transaction.status = transaction_status
-            transaction.save()
-        else:
-            transaction.status = transaction_status
-            transaction.save()
+                status=transaction_status
+            ),
+            object_id=transaction_remote_id,
+            payload={
+                'transaction': data,
+                'order_id': order.pk if order is not None else None,
+            }
+        )
 
         return HttpResponse(
             status=status.HTTP_200_OK
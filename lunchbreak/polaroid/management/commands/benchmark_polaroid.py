@@ -0,0 +1,144 @@
+import time
+
+from django.core.management.base import BaseCommand
+from lunch import specs as lunch_specs
+from pilkit.processors import ResizeToCover
+from pilkit.utils import img_to_fobj, open_image
+
+from ... import specs as polaroid_specs
+from ...processors import draft
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the CPU time and output size of rendering every spec from a '
+        'fully decoded image, from a reduced JPEG decode and in cascade.'
+    )
+
+    SPECS = (
+        ('lunch', (
+            lunch_specs.XXXHDPI,
+            lunch_specs.XXHDPI,
+            lunch_specs.XHDPI,
+            lunch_specs.HDPI,
+            lunch_specs.MDPI,
+            lunch_specs.LDPI,
+        ),),
+        ('polaroid', (
+            polaroid_specs.FullHD,
+            polaroid_specs.HD,
+            polaroid_specs.HQ,
+            polaroid_specs.LQ,
+        ),),
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--image',
+            default='test.jpg',
+            help='Path of the JPEG image to render.'
+        )
+        parser.add_argument(
+            '--quality',
+            type=int,
+            default=None,
+            help='JPEG quality of the reduced renders, defaults to the spec\'s.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Amount of renders per spec and method.'
+        )
+
+    def handle(self, *args, **options):
+        self.path = options['image']
+        self.quality = options['quality']
+
+        for name, specs in self.SPECS:
+            self.stdout.write('{name}:'.format(name=name))
+            for spec in specs:
+                size = self.size(spec)
+                full_time, full_size = self.measure(
+                    options['repeat'],
+                    self.render_full,
+                    spec
+                )
+                reduced_time, reduced_size = self.measure(
+                    options['repeat'],
+                    self.render_reduced,
+                    spec
+                )
+                self.stdout.write(
+                    '  {spec} {width}x{height}: full {full_time:.1f}ms '
+                    '{full_size}B, reduced {reduced_time:.1f}ms '
+                    '{reduced_size}B'.format(
+                        spec=spec.__name__,
+                        width=size.width,
+                        height=size.height,
+                        full_time=full_time * 1000,
+                        full_size=full_size,
+                        reduced_time=reduced_time * 1000,
+                        reduced_size=reduced_size
+                    )
+                )
+
+            cascade_time, cascade_size = self.measure(
+                options['repeat'],
+                self.render_cascade,
+                specs
+            )
+            self.stdout.write(
+                '  cascade of all specs: {time:.1f}ms {size}B'.format(
+                    time=cascade_time * 1000,
+                    size=cascade_size
+                )
+            )
+
+    def measure(self, repeat, method, *args):
+        """Average CPU time and output bytes of the given method."""
+        start = time.process_time()
+        for i in range(repeat):
+            size = method(*args)
+        return (time.process_time() - start) / repeat, size
+
+    def size(self, spec):
+        return spec.processors[0]
+
+    def options(self, spec):
+        options = dict(spec.options)
+        if self.quality is not None:
+            options['quality'] = self.quality
+        return options
+
+    def encode(self, img, spec, options):
+        return len(img_to_fobj(img, spec.format, **options).getvalue())
+
+    def render_full(self, spec):
+        """The rendering used before reduced decoding."""
+        size = self.size(spec)
+        with open(self.path, 'rb') as image_file:
+            img = open_image(image_file)
+            img.load()
+        img = ResizeToCover(size.width, size.height).process(img)
+        return self.encode(img, spec, {'quality': 100})
+
+    def render_reduced(self, spec):
+        size = self.size(spec)
+        with open(self.path, 'rb') as image_file:
+            img = draft(open_image(image_file), size.width, size.height)
+            img.load()
+        img = size.process(img)
+        return self.encode(img, spec, self.options(spec))
+
+    def render_cascade(self, specs):
+        largest = self.size(specs[0])
+        with open(self.path, 'rb') as image_file:
+            img = draft(open_image(image_file), largest.width, largest.height)
+            img.load()
+
+        total = 0
+        for spec in specs:
+            img = self.size(spec).process(img)
+            total += self.encode(img, spec, self.options(spec))
+        return total
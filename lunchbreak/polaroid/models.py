@@ -1,7 +1,11 @@
+from django.core.files.base import ContentFile
 from django.db import models
+from imagekit.cachefiles.backends import CacheFileState
 from imagekit.models import ImageSpecField
 from pilkit.processors.resize import ResizeToCover
+from pilkit.utils import img_to_fobj, open_image
 
+from .processors import draft
 from .specs import HD, HQ, LQ, FullHD
 
 
@@ -14,6 +18,9 @@ class Polaroid(models.Model):
     class Meta:
         abstract = True
 
+    # Versions of each source, set once the class is prepared.
+    polaroid_versions = {}
+
     @staticmethod
     def retrieve(original, versions, width, height, source=None):
         attr = source
@@ -26,28 +33,151 @@ class Polaroid(models.Model):
 
         return ((original if best is None else best), attr,)
 
-    def retrieve_from_source(self, source, width, height):
-        original = None
-        versions = {}
+    @classmethod
+    def get_polaroid_versions(cls):
+        """Versions of each image source of this class.
 
-        for key, value in self.__class__.__dict__.items():
+        Returns:
+            Dictionary of the source names and lists of ``(attr, processor)``
+            tuples sorted from small to large.
+            dict
+        """
+        sources = set()
+        versions = {}
+        for key, value in cls.__dict__.items():
             if hasattr(value, 'field'):
                 field = value.field
-                if isinstance(field, ImageSpecField) and field.source == source:
-                    spec = field.get_spec(source)
-                    processors = spec.processors
-                    for processor in processors:
+                if isinstance(field, ImageSpecField):
+                    spec = field.get_spec(field.source)
+                    for processor in spec.processors:
                         if isinstance(processor, ResizeToCover):
-                            versions[key] = processor
-                elif key == source and isinstance(field, models.ImageField):
-                    original = field
+                            versions.setdefault(field.source, []).append(
+                                (key, processor,)
+                            )
+                elif isinstance(field, models.ImageField):
+                    sources.add(key)
+
+        return {
+            source: sorted(
+                versions.get(source, []),
+                key=lambda version: (version[1].width, version[1].height,)
+            ) for source in sources
+        }
+
+    @staticmethod
+    def class_prepared(sender, **kwargs):
+        if issubclass(sender, Polaroid):
+            sender.polaroid_versions = sender.get_polaroid_versions()
+
+    def best_version(self, source, width, height):
+        """Name of the smallest version of the source covering the given size.
+
+        Args:
+            source (str): Name of the image field.
+            width (int): Minimum width.
+            height (int): Minimum height.
+
+        Returns:
+            Name of the version or of the source if no version is large
+            enough.
+            str
+        """
+        try:
+            versions = self.polaroid_versions[source]
+        except KeyError:
+            raise InvalidPolaroidSource()
+
+        for attr, version in versions:
+            if version.width >= width and version.height >= height:
+                return attr
+        return source
 
-        if original is None:
+    def retrieve_from_source(self, source, width, height, generated=False):
+        """Smallest version of the source covering the given size.
+
+        Args:
+            source (str): Name of the image field.
+            width (int): Minimum width.
+            height (int): Minimum height.
+            generated (bool): Whether only already generated versions can be
+            returned. If the best version has not been generated yet, the
+            next larger generated version or the source is returned.
+
+        Returns:
+            The version or the source if no version is large enough.
+        """
+        best = self.best_version(source, width, height)
+        if not generated or best == source:
+            return getattr(self, best)
+
+        attrs = [attr for attr, version in self.polaroid_versions[source]]
+        for attr in attrs[attrs.index(best):]:
+            image = getattr(self, attr)
+            if image.exists():
+                return image
+            self.version_missing(attr)
+        return getattr(self, source)
+
+    def render_versions(self, source, attrs=None):
+        """Render the missing versions of the source, decoding it only once.
+
+        The source is decoded at the smallest size a JPEG decoder can reduce
+        it to while still covering the largest version. Versions are rendered
+        from large to small, each one from the previous one if that still
+        covers it.
+
+        Args:
+            source (str): Name of the image field.
+            attrs (list, optional): Only render these versions.
+        """
+        try:
+            versions = self.polaroid_versions[source]
+        except KeyError:
             raise InvalidPolaroidSource()
 
-        best, attr = Polaroid.retrieve(original, versions, width, height, source)
+        missing = []
+        for attr, version in reversed(versions):
+            if attrs is not None and attr not in attrs:
+                continue
+            image = getattr(self, attr)
+            if not image.exists():
+                missing.append((image, version,))
+        if not missing:
+            return
+
+        original = getattr(self, source)
+        original.open()
+        try:
+            largest = missing[0][1]
+            decoded = draft(open_image(original), largest.width, largest.height)
+            decoded.load()
+        finally:
+            original.close()
+
+        previous = decoded
+        for image, version in missing:
+            covers = previous.size[0] >= version.width \
+                and previous.size[1] >= version.height
+            previous = version.process(previous if covers else decoded)
+
+            spec = image.generator
+            content = img_to_fobj(previous, spec.format, **spec.options)
+            image.storage.save(image.name, ContentFile(content.read()))
+            image.cachefile_backend.set_state(image, CacheFileState.EXISTS)
+
+    def version_missing(self, attr):
+        """Called when a version has not been generated yet.
+
+        Args:
+            attr (str): Name of the version.
+        """
+        pass
+
 
-        return getattr(self, attr)
+models.signals.class_prepared.connect(
+    Polaroid.class_prepared,
+    weak=False
+)
 
 
 class PolaroidBase(Polaroid):
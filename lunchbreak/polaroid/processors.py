@@ -0,0 +1,30 @@
+from pilkit.processors import ResizeToCover
+
+
+def draft(img, width, height):
+    """Let the JPEG decoder downscale the image while decoding.
+
+    The image is reduced by the largest power of two, up to 8, for which it
+    still covers the given size. This is only possible before the image is
+    loaded, otherwise nothing happens.
+
+    Args:
+        img: Unloaded PIL image.
+        width (int): Minimum width.
+        height (int): Minimum height.
+
+    Returns:
+        The same image.
+    """
+    if img.format == 'JPEG':
+        img.draft(img.mode, (width, height,))
+    return img
+
+
+class DraftResizeToCover(ResizeToCover):
+    """``ResizeToCover`` that decodes JPEG images at a reduced size first."""
+
+    def process(self, img):
+        return super().process(
+            draft(img, self.width, self.height)
+        )
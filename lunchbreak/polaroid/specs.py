@@ -1,42 +1,42 @@
+from django.conf import settings
 from imagekit import ImageSpec
-from imagekit.processors import ResizeToCover
+
+from .processors import DraftResizeToCover
+
+JPEG_OPTIONS = {
+    'quality': getattr(settings, 'POLAROID_JPEG_QUALITY', 100),
+    'progressive': True,
+    'optimize': True,
+}
 
 
 class LQ(ImageSpec):
     processors = [
-        ResizeToCover(640, 360)
+        DraftResizeToCover(640, 360)
     ]
     format = 'JPEG'
-    options = {
-        'quality': 100
-    }
+    options = JPEG_OPTIONS
 
 
 class HQ(ImageSpec):
     processors = [
-        ResizeToCover(854, 480)
+        DraftResizeToCover(854, 480)
     ]
     format = 'JPEG'
-    options = {
-        'quality': 100
-    }
+    options = JPEG_OPTIONS
 
 
 class HD(ImageSpec):
     processors = [
-        ResizeToCover(1280, 720)
+        DraftResizeToCover(1280, 720)
     ]
     format = 'JPEG'
-    options = {
-        'quality': 100
-    }
+    options = JPEG_OPTIONS
 
 
 class FullHD(ImageSpec):
     processors = [
-        ResizeToCover(1920, 1080)
+        DraftResizeToCover(1920, 1080)
     ]
     format = 'JPEG'
-    options = {
-        'quality': 100
-    }
+    options = JPEG_OPTIONS
@@ -1,14 +1,18 @@
 from collections import defaultdict
 from copy import deepcopy
+from operator import itemgetter
 
 from django.utils.functional import cached_property
+from rest_framework.serializers import LIST_SERIALIZER_KWARGS, Serializer
 
+from .serializers import VersionedListSerializer
 from .transformer import Transformer
-from .utils import get_version_index
+from .utils import get_version_index, transformation_plans
 
 
 class VersionedMixin:
 
+    _defer_transformations = False
     default_transformation_classes = {
         'self': [],
         'field_names': defaultdict(list),
@@ -23,6 +27,91 @@ class VersionedMixin:
             cls._transformation_classes['self'].append(transformation_class)
         else:
             cls._transformation_classes['field_names'][field_name].append(transformation_class)
+        # Subclasses share the transformation classes
+        transformation_plans.clear()
+
+    @classmethod
+    def get_transformation_plan(cls, version, forwards):
+        """Transformation classes of this class applied in the given version.
+
+        The plan is built once per class, version and direction. It is sorted
+        in the order the transformations need to be applied, see
+        ``Transformation``.
+
+        Args:
+            version (str): Version requested.
+            forwards (bool): Whether transforming input.
+
+        Returns:
+            Tuple of ``(transformation_class, field_name)`` tuples. The field
+            name is None for transformations of the class itself.
+            tuple
+        """
+        key = (cls, version, forwards,)
+        plan = transformation_plans.get(key)
+        if plan is not None:
+            return plan
+
+        transformation_classes = getattr(
+            cls,
+            '_transformation_classes',
+            cls.default_transformation_classes
+        )
+        candidates = [
+            (transformation_class, None,)
+            for transformation_class in transformation_classes['self']
+        ]
+        for field_name, field_transformation_classes in transformation_classes['field_names'].items():
+            candidates.extend(
+                (transformation_class, field_name,)
+                for transformation_class in field_transformation_classes
+            )
+
+        version_index = get_version_index(version)
+        is_serializer = issubclass(cls, Serializer)
+        ordered = []
+        for transformation_class, field_name in candidates:
+            transformation_index = get_version_index(transformation_class.version)
+            if transformation_index <= version_index:
+                continue
+            # Serializers come after their specific fields of the same version
+            for_serializer = is_serializer and field_name is None
+            ordered.append(
+                (
+                    (transformation_index, for_serializer,),
+                    transformation_class,
+                    field_name,
+                )
+            )
+        ordered.sort(key=itemgetter(0))
+
+        plan = tuple(
+            (transformation_class, field_name,)
+            for order, transformation_class, field_name in ordered
+        )
+        if not forwards:
+            plan = plan[::-1]
+        transformation_plans[key] = plan
+        return plan
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        meta = getattr(cls, 'Meta', None)
+        if hasattr(meta, 'list_serializer_class'):
+            return super().many_init(*args, **kwargs)
+
+        allow_empty = kwargs.pop('allow_empty', None)
+        child_serializer = cls(*args, **kwargs)
+        list_kwargs = {
+            'child': child_serializer,
+        }
+        if allow_empty is not None:
+            list_kwargs['allow_empty'] = allow_empty
+        list_kwargs.update({
+            key: value for key, value in kwargs.items()
+            if key in LIST_SERIALIZER_KWARGS
+        })
+        return VersionedListSerializer(*args, **list_kwargs)
 
     @cached_property
     def _request(self):
@@ -43,6 +132,10 @@ class VersionedMixin:
     def version(self):
         return self._request.version
 
+    @cached_property
+    def _planned_transformations(self):
+        return {}
+
     @property
     def transformation_classes(self):
         return getattr(
@@ -52,46 +145,139 @@ class VersionedMixin:
         )
 
     def to_internal_value(self, data):
-        transformed_data = self.get_transformer(
-            data=data,
-            forwards=True,
-        ).forwards(
-            obj=None,
-            data=data,
-            request=self._request
-        )
+        transformations = self.get_planned_transformations(forwards=True)
+        if transformations:
+            data = self.transform(
+                transformations=transformations,
+                items=[(None, data,)],
+                forwards=True
+            )[0]
 
-        return super().to_internal_value(transformed_data)
+        return super().to_internal_value(data)
 
     def to_representation(self, obj):
         data = super().to_representation(obj)
+        if self._defer_transformations:
+            return data
+
+        transformations = self.get_planned_transformations(forwards=False)
+        if not transformations:
+            return data
+        return self.transform(
+            transformations=transformations,
+            items=[(obj, data,)],
+            forwards=False
+        )[0]
+
+    def to_representation_many(self, objs):
+        """Representations of all of the objects, transformed in one pass.
+
+        Every object is represented by ``to_representation`` of the instance,
+        including overrides of subclasses, with the transformations deferred
+        until all of them are represented.
+
+        Args:
+            objs: Iterable of objects.
 
-        return self.get_transformer(
-            data=data,
-            forwards=False,
-        ).backwards(
-            obj=obj,
-            data=data,
-            request=self._request
+        Returns:
+            List of representations.
+            list
+        """
+        self._defer_transformations = True
+        try:
+            items = [
+                (obj, self.to_representation(obj),)
+                for obj in objs
+            ]
+        finally:
+            self._defer_transformations = False
+
+        transformations = self.get_planned_transformations(forwards=False)
+        if not transformations:
+            return [data for obj, data in items]
+        return self.transform(
+            transformations=transformations,
+            items=items,
+            forwards=False
         )
 
-    def get_transformations(self, forwards, field=None):
-        if field is None:
-            transformation_classes = self.transformation_classes['self']
-        else:
-            transformation_classes = self.transformation_classes['field_names'][field.field_name]
+    def get_planned_transformations(self, forwards):
+        """Transformations of the plan for the requested version.
 
-        result = []
-        version_index = get_version_index(self.version)
-        for transformation_class in transformation_classes:
-            transformation = transformation_class(self, field=field)
-            newer_version = transformation.is_newer_version(version_index)
+        They are only instantiated once per instance and direction.
 
-            if newer_version:
-                result.append(transformation)
+        Args:
+            forwards (bool): Whether transforming input.
 
+        Returns:
+            List of ``(field_name, transformation)`` tuples in the order they
+            need to be applied.
+            list
+        """
+        planned = self._planned_transformations
+        if forwards not in planned:
+            transformations = []
+            plan = self.get_transformation_plan(
+                version=self.version,
+                forwards=forwards
+            )
+            for transformation_class, field_name in plan:
+                if field_name is None:
+                    field = None
+                elif field_name in self.fields:
+                    field = self.fields[field_name]
+                else:
+                    continue
+                transformations.append(
+                    (field_name, transformation_class(self, field=field),)
+                )
+            planned[forwards] = transformations
+        return planned[forwards]
+
+    def transform(self, transformations, items, forwards):
+        """Apply the transformations to all of the items.
+
+        Transformations of a specific field are only applied if the field is
+        present in the untransformed data.
+
+        Args:
+            transformations (list): Result of ``get_planned_transformations``.
+            items (list): List of ``(obj, data)`` tuples.
+            forwards (bool): Whether transforming input.
+
+        Returns:
+            List of the transformed data.
+            list
+        """
+        request = self._request
+        keys = [
+            set(data) if isinstance(data, dict) else ()
+            for obj, data in items
+        ]
+        result = [data for obj, data in items]
+        for field_name, transformation in transformations:
+            for i, (obj, data) in enumerate(items):
+                if field_name is not None and field_name not in keys[i]:
+                    continue
+                try:
+                    result[i] = transformation.transform(
+                        obj=obj,
+                        data=result[i],
+                        request=request,
+                        forwards=forwards
+                    )
+                except NotImplementedError:
+                    continue
         return result
 
+    def get_transformations(self, forwards, field=None):
+        field_name = None if field is None else field.field_name
+        return [
+            transformation
+            for transformation_field_name, transformation in self.get_planned_transformations(forwards)
+            if transformation_field_name == field_name
+        ]
+
     def get_transformer(self, data, forwards):
         transformer = Transformer()
 
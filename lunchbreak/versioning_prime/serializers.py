@@ -0,0 +1,13 @@
+from django.db import models
+from rest_framework.serializers import ListSerializer
+
+
+class VersionedListSerializer(ListSerializer):
+    """List serializer that transforms all of its items in one pass.
+
+    The child needs to subclass ``VersionedMixin``.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        return self.child.to_representation_many(iterable)
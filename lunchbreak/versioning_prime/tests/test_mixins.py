@@ -0,0 +1,144 @@
+import mock
+from rest_framework import serializers
+
+from ..mixins import VersionedMixin
+from ..serializers import VersionedListSerializer
+from ..transformation import Transformation
+from .testcase import VersioningPrimeTestCase
+
+
+class PlanField(VersionedMixin, serializers.IntegerField):
+    pass
+
+
+class PlanSerializer(VersionedMixin, serializers.Serializer):
+    name = PlanField()
+    amount = PlanField()
+
+
+class RenameTransformation(Transformation):
+
+    bases = []
+    version = '1.0.0'
+    instances = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        RenameTransformation.instances += 1
+
+    def backwards_serializer(self, data, obj, request):
+        data['old_name'] = data.pop('name')
+        return data
+
+
+class MultiplyTransformation(Transformation):
+
+    bases = []
+    version = '1.1.0'
+
+    def backwards_field(self, data, obj, request):
+        return obj * 10
+
+
+class SpecificFieldTransformation(Transformation):
+
+    bases = []
+    version = '1.0.0'
+
+
+PlanSerializer.add_transformation(RenameTransformation)
+PlanSerializer.add_transformation(SpecificFieldTransformation, field_name='amount')
+PlanField.add_transformation(MultiplyTransformation)
+
+
+class VersionedMixinTestCase(VersioningPrimeTestCase):
+
+    def serialize(self, version, instance, many=False):
+        return PlanSerializer(
+            instance,
+            many=many,
+            context={
+                'request': mock.Mock(version=version)
+            }
+        )
+
+    def test_transformation_plan(self):
+        """Test whether plans are sorted, filtered by version and cached."""
+        plan = PlanSerializer.get_transformation_plan(
+            version='0.9.1',
+            forwards=True
+        )
+        self.assertEqual(
+            plan,
+            (
+                (SpecificFieldTransformation, 'amount',),
+                (RenameTransformation, None,),
+            )
+        )
+        self.assertIs(
+            PlanSerializer.get_transformation_plan(
+                version='0.9.1',
+                forwards=True
+            ),
+            plan
+        )
+        self.assertEqual(
+            PlanSerializer.get_transformation_plan(
+                version='0.9.1',
+                forwards=False
+            ),
+            plan[::-1]
+        )
+        self.assertEqual(
+            PlanSerializer.get_transformation_plan(
+                version='1.0.0',
+                forwards=False
+            ),
+            ()
+        )
+        self.assertEqual(
+            PlanField.get_transformation_plan(
+                version='1.0.1',
+                forwards=False
+            ),
+            ((MultiplyTransformation, None,),)
+        )
+
+    def test_to_representation_many(self):
+        """Test whether a list is transformed like its separate items."""
+        instances = [
+            {
+                'name': i,
+                'amount': i + 1,
+            } for i in range(3)
+        ]
+
+        instances_before = RenameTransformation.instances
+        serializer = self.serialize('0.9.1', instances, many=True)
+        self.assertIsInstance(serializer, VersionedListSerializer)
+        self.assertEqual(
+            serializer.data,
+            [
+                {
+                    'old_name': i * 10,
+                    'amount': (i + 1) * 10,
+                } for i in range(3)
+            ]
+        )
+        self.assertEqual(
+            serializer.data,
+            [
+                self.serialize('0.9.1', instance).data
+                for instance in instances
+            ]
+        )
+        # One for the list, one for every single serializer
+        self.assertEqual(
+            RenameTransformation.instances - instances_before,
+            1 + len(instances)
+        )
+
+        self.assertEqual(
+            self.serialize('1.1.1', instances, many=True).data,
+            instances
+        )
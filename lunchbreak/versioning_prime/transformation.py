@@ -130,14 +130,17 @@ class Transformation:
                 value = self.field.get_value(data)
             else:
                 value = self.field.get_attribute(obj)
-            kwargs['data'] = data[self.field]
+            specific_kwargs = {
+                'data': value,
+                'request': request,
+            }
+            if not forwards:
+                specific_kwargs['obj'] = obj
             transformed_value = getattr(self, method_prefix + 'specific_field')(
-                obj=obj,
-                data=value,
-                request=request
+                **specific_kwargs
             )
             if forwards:
-                set_value(data, self.field.source_attrs, value)
+                set_value(data, self.field.source_attrs, transformed_value)
             else:
                 data[self.field.field_name] = transformed_value
             return data
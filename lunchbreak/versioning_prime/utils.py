@@ -9,10 +9,31 @@ from .apps import VersioningPrimeConfig as AppConfig
 
 logger = logging.getLogger()
 retrieved_modules = set()
+# Allowed versions the indices and plans below were built for.
+version_indices = [None, {}]
+# Cached transformation plans by (class, version, forwards).
+transformation_plans = {}
 
 
 def get_version_index(version):
-    return get_allowed_versions().index(version)
+    allowed_versions = get_allowed_versions()
+    if version_indices[0] is not allowed_versions:
+        version_indices[:] = [
+            allowed_versions,
+            {
+                allowed_version: index
+                for index, allowed_version in enumerate(allowed_versions)
+            }
+        ]
+        transformation_plans.clear()
+    try:
+        return version_indices[1][version]
+    except KeyError:
+        raise ValueError(
+            '{version} is not an allowed version.'.format(
+                version=version
+            )
+        )
 
 
 def get_allowed_versions():
@@ -42,6 +63,22 @@ def get_classes(module):
                 yield obj
 
 
+def get_subclasses(cls):
+    """Iterator that returns all of the subclasses of a class.
+
+    Args:
+        cls: Class.
+
+    Yields:
+        Direct and indirect subclasses.
+        class
+    """
+    for subclass in cls.__subclasses__():
+        yield subclass
+        for subsubclass in get_subclasses(subclass):
+            yield subsubclass
+
+
 def assert_versioned_mixin(serializer):
     from .mixins import VersionedMixin
     assert issubclass(serializer, VersionedMixin), (
@@ -106,9 +143,13 @@ def generate_transformations():
     Every subclass of ``Transformation`` has a list of bases. An instance of
     the ``Transformation`` will be added to each of those bases.
 
+    Afterwards the transformation plans of the versioned serializers and
+    fields are built for every allowed version.
+
     .. note::
         This should only be called once. This is done in ``AppConfig.ready()``.
     """
+    from .mixins import VersionedMixin
     from .transformation import Transformation
 
     for app in settings.INSTALLED_APPS:
@@ -133,3 +174,11 @@ def generate_transformations():
                     if base is None:
                         continue
                     base.add_transformation(transformation, field_name=field_name)
+
+    for cls in set(get_subclasses(VersionedMixin)):
+        for version in get_allowed_versions():
+            for forwards in (True, False,):
+                cls.get_transformation_plan(
+                    version=version,
+                    forwards=forwards
+                )
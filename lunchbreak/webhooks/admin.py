@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from .models import WebhookEvent
+
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    list_display = ('provider', 'event_id', 'received_at', 'processed_at',
+                    'attempts',)
+    search_fields = ('event_id', 'object_id',)
+    list_filter = ('provider', 'processed_at',)
+    ordering = ('-received_at',)
+
+    readonly_fields = ('provider', 'event_id', 'object_id', 'payload',
+                       'received_at', 'error',)
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+
+class Settings:
+
+    @property
+    def settings(self):
+        from django.conf import settings
+        return getattr(settings, 'WEBHOOKS', {})
+
+    @property
+    def BATCH_SIZE(self):
+        return self.settings.get(
+            'batch_size',
+            100
+        )
+
+    @property
+    def MAX_ATTEMPTS(self):
+        return self.settings.get(
+            'max_attempts',
+            10
+        )
+
+    @property
+    def RETRY_DELAY(self):
+        # Doubled after every failed attempt
+        return self.settings.get(
+            'retry_delay',
+            timedelta(seconds=30)
+        )
+
+
+settings = Settings()  # NOQA
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookEvent',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(choices=[('plivo', 'Plivo'), ('twilio', 'Twilio'), ('gocardless', 'GoCardless'), ('payconiq', 'Payconiq')], help_text='Provider die de webhook aanriep.', max_length=10, verbose_name='provider')),
+                ('event_id', models.CharField(help_text='ID van het event bij de provider.', max_length=191, verbose_name='event id')),
+                ('object_id', models.CharField(blank=True, help_text='ID van het object bij de provider waarvan de events in volgorde verwerkt worden.', max_length=191, verbose_name='object id')),
+                ('payload', jsonfield.fields.JSONField(help_text='Inhoud van het event.', verbose_name='inhoud')),
+                ('received_at', models.DateTimeField(auto_now_add=True, help_text='Moment waarop het event ontvangen werd.', verbose_name='ontvangen op')),
+                ('processed_at', models.DateTimeField(blank=True, db_index=True, help_text='Moment waarop het event verwerkt werd.', null=True, verbose_name='verwerkt op')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='Aantal keer dat het event verwerkt werd.', verbose_name='pogingen')),
+                ('retry_at', models.DateTimeField(blank=True, help_text='Moment waarop het event opnieuw verwerkt wordt.', null=True, verbose_name='opnieuw proberen om')),
+                ('error', models.TextField(blank=True, help_text='Fout bij de laatste poging.', verbose_name='fout')),
+            ],
+            options={
+                'verbose_name': 'webhook event',
+                'verbose_name_plural': 'webhook events',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='webhookevent',
+            unique_together=set([('provider', 'event_id')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='webhookevent',
+            index_together=set([('provider', 'object_id')]),
+        ),
+    ]
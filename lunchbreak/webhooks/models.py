@@ -0,0 +1,345 @@
+import logging
+from functools import reduce
+from operator import or_
+
+import jsonfield
+from django.db import IntegrityError, models, transaction
+from django.db.models import Exists, Min, OuterRef, Q
+from django.utils import timezone
+from django.utils.translation import ugettext as _
+
+from .conf import settings
+from .tasks import process_webhook_events
+
+logger = logging.getLogger('lunchbreak')
+
+
+class WebhookEventQuerySet(models.QuerySet):
+
+    def unprocessed(self):
+        """Events that still need to be handled, including those waiting for
+        a retry."""
+        return self.filter(
+            processed_at__isnull=True,
+            attempts__lt=settings.MAX_ATTEMPTS
+        )
+
+    def due(self):
+        """Unprocessed events that can be handled now."""
+        return self.unprocessed().filter(
+            Q(retry_at__isnull=True) | Q(retry_at__lte=timezone.now())
+        )
+
+    def unblocked(self):
+        """Events of which no earlier event of the same object is waiting for
+        a retry."""
+        waiting = self.model.objects.unprocessed().filter(
+            provider=OuterRef('provider'),
+            object_id=OuterRef('object_id'),
+            id__lt=OuterRef('id'),
+            retry_at__gt=timezone.now()
+        )
+        return self.annotate(
+            blocked=Exists(waiting)
+        ).filter(
+            Q(object_id='') | Q(blocked=False)
+        )
+
+
+class WebhookEvent(models.Model):
+    """Webhook call of a provider that was received, but not necessarily
+    handled yet.
+
+    Webhook views only verify the signature and store the event, which is
+    then handled by a worker through the handler registered for the provider.
+    Events of the same object are handled in the order they were received.
+    """
+
+    class Meta:
+        verbose_name = _('webhook event')
+        verbose_name_plural = _('webhook events')
+        unique_together = (('provider', 'event_id',),)
+        index_together = (('provider', 'object_id',),)
+
+    def __str__(self):
+        return '{provider} {event_id}'.format(
+            provider=self.get_provider_display(),
+            event_id=self.event_id
+        )
+
+    PLIVO = 'plivo'
+    TWILIO = 'twilio'
+    GOCARDLESS = 'gocardless'
+    PAYCONIQ = 'payconiq'
+    PROVIDERS = (
+        (PLIVO, 'Plivo'),
+        (TWILIO, 'Twilio'),
+        (GOCARDLESS, 'GoCardless'),
+        (PAYCONIQ, 'Payconiq'),
+    )
+
+    provider = models.CharField(
+        max_length=10,
+        choices=PROVIDERS,
+        verbose_name=_('provider'),
+        help_text=_('Provider die de webhook aanriep.')
+    )
+    event_id = models.CharField(
+        max_length=191,
+        verbose_name=_('event id'),
+        help_text=_('ID van het event bij de provider.')
+    )
+    object_id = models.CharField(
+        max_length=191,
+        blank=True,
+        verbose_name=_('object id'),
+        help_text=_(
+            'ID van het object bij de provider waarvan de events in volgorde '
+            'verwerkt worden.'
+        )
+    )
+    payload = jsonfield.JSONField(
+        verbose_name=_('inhoud'),
+        help_text=_('Inhoud van het event.')
+    )
+    received_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('ontvangen op'),
+        help_text=_('Moment waarop het event ontvangen werd.')
+    )
+    processed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name=_('verwerkt op'),
+        help_text=_('Moment waarop het event verwerkt werd.')
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_('pogingen'),
+        help_text=_('Aantal keer dat het event verwerkt werd.')
+    )
+    retry_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('opnieuw proberen om'),
+        help_text=_('Moment waarop het event opnieuw verwerkt wordt.')
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name=_('fout'),
+        help_text=_('Fout bij de laatste poging.')
+    )
+
+    objects = WebhookEventQuerySet.as_manager()
+
+    handlers = {}
+    preparers = {}
+
+    @classmethod
+    def register_handler(cls, provider, handler, prepare=None):
+        """Register the function handling the events of a provider.
+
+        Args:
+            provider (str): Provider.
+            handler (callable): Called with the event, raises an exception if
+                it should be retried.
+            prepare (callable): Called with the events of the provider in a
+                batch before they are handled, its result is passed to the
+                handler as second argument. Used to load what the events
+                need at once.
+        """
+        cls.handlers[provider] = handler
+        if prepare is not None:
+            cls.preparers[provider] = prepare
+
+    @classmethod
+    def receive(cls, provider, event_id, payload, object_id=''):
+        """Store an event and have it handled after the transaction commits.
+
+        Args:
+            provider (str): Provider.
+            event_id (str): Unique ID of the event at the provider.
+            payload: JSON serializable event.
+            object_id (str): ID of the object the event is about.
+
+        Returns:
+            Whether the event is new, events that were received before are
+            ignored.
+            bool
+        """
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    provider=provider,
+                    event_id=event_id,
+                    object_id=object_id,
+                    payload=payload
+                )
+        except IntegrityError:
+            return False
+
+        transaction.on_commit(process_webhook_events.delay)
+        return True
+
+    @classmethod
+    def process_batch(cls, size=None):
+        """Handle a batch of due events in the order they were received.
+
+        The events are locked while they are handled, so other workers skip
+        them. Events of which an earlier event of the same object is waiting
+        for a retry are not selected, so they do not take up the batch. An
+        event is held back while an earlier event of the same object is
+        unprocessed and not part of the batch, or failed in this batch.
+
+        Args:
+            size (int): Maximum number of events, defaults to BATCH_SIZE.
+
+        Returns:
+            Number of events that were attempted and number of events that
+            were held back.
+            tuple
+        """
+        size = size if size is not None else settings.BATCH_SIZE
+
+        with transaction.atomic():
+            events = list(
+                cls.objects.due().unblocked().select_for_update(
+                    skip_locked=True
+                ).order_by(
+                    'id'
+                )[:size]
+            )
+            if not events:
+                return 0, 0
+
+            keys = {
+                (event.provider, event.object_id,)
+                for event in events
+                if event.object_id
+            }
+            earlier = {}
+            if keys:
+                earlier = {
+                    (row['provider'], row['object_id'],): row['first_id']
+                    for row in cls.objects.unprocessed().filter(
+                        reduce(
+                            or_,
+                            [
+                                Q(provider=provider, object_id=object_id)
+                                for provider, object_id in keys
+                            ]
+                        )
+                    ).exclude(
+                        id__in=[event.id for event in events]
+                    ).values(
+                        'provider',
+                        'object_id',
+                    ).annotate(
+                        first_id=Min('id')
+                    )
+                }
+
+            contexts = cls.prepare(events)
+
+            attempted = 0
+            held = 0
+            failed = set()
+            for event in events:
+                key = (event.provider, event.object_id,)
+                if event.object_id and (
+                        key in failed or
+                        earlier.get(key, event.id) < event.id):
+                    held += 1
+                    continue
+
+                attempted += 1
+                if not event.process(contexts.get(event.provider)):
+                    failed.add(key)
+
+        return attempted, held
+
+    @classmethod
+    def prepare(cls, events):
+        """Call the preparers of the providers with events in the batch.
+
+        A preparer that fails only means the handlers get no context.
+
+        Returns:
+            Results of the preparers by provider.
+            dict
+        """
+        contexts = {}
+        for provider, prepare in cls.preparers.items():
+            provider_events = [
+                event
+                for event in events
+                if event.provider == provider
+            ]
+            if not provider_events:
+                continue
+            try:
+                with transaction.atomic():
+                    contexts[provider] = prepare(provider_events)
+            except Exception as e:
+                logger.exception(
+                    str(e),
+                    exc_info=True,
+                    extra={
+                        'provider': provider,
+                    }
+                )
+        return contexts
+
+    def handle(self, context=None):
+        handler = self.handlers[self.provider]
+        if self.provider in self.preparers:
+            handler(self, context)
+        else:
+            handler(self)
+
+    def process(self, context=None):
+        """Handle the event and record the outcome.
+
+        Failed events are retried with an exponential backoff until
+        MAX_ATTEMPTS is reached.
+
+        Args:
+            context: Result of the preparer of the provider.
+
+        Returns:
+            Whether the event was handled.
+            bool
+        """
+        self.attempts += 1
+        try:
+            with transaction.atomic():
+                self.handle(context)
+        except Exception as e:
+            logger.exception(
+                str(e),
+                exc_info=True,
+                extra={
+                    'provider': self.provider,
+                    'event_id': self.event_id,
+                    'attempts': self.attempts,
+                }
+            )
+            self.error = str(e)
+            self.retry_at = timezone.now() \
+                + settings.RETRY_DELAY * 2 ** (self.attempts - 1)
+            handled = False
+        else:
+            self.error = ''
+            self.processed_at = timezone.now()
+            handled = True
+
+        self.save(
+            update_fields=[
+                'attempts',
+                'error',
+                'retry_at',
+                'processed_at',
+            ]
+        )
+        return handled
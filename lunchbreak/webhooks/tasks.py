@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from celery import shared_task
+from django.core.cache import cache
+from django.db.models import Min
+from django.utils import timezone
+from Lunchbreak.tasks import DebugLoggingTask
+
+FOLLOW_UP_KEY = 'webhooks:follow-up:{eta}'
+
+
+@shared_task(base=DebugLoggingTask)
+def process_webhook_events(batch_size=None):
+    """Drain the webhook inbox.
+
+    Batches are handled until no event can be handled anymore. Events that are
+    waiting for a retry are picked up again by a single run at the earliest
+    retry, events held by another worker are left to the run of that worker.
+    A periodic run, see ``CELERY_BEAT_SCHEDULE``, picks up what is left when a
+    run did not start or stopped too early.
+    """
+    from .models import WebhookEvent
+
+    while True:
+        attempted, held = WebhookEvent.process_batch(batch_size)
+        if attempted == 0:
+            break
+
+    retry_at = WebhookEvent.objects.unprocessed().filter(
+        retry_at__gt=timezone.now()
+    ).aggregate(
+        retry_at=Min('retry_at')
+    )['retry_at']
+    if retry_at is not None:
+        schedule_follow_up(retry_at, batch_size)
+
+
+def schedule_follow_up(eta, batch_size=None):
+    """Run ``process_webhook_events`` at the given time, unless a run at that
+    time was already scheduled.
+
+    Every run that finds events waiting for a retry schedules the earliest
+    one, so concurrent runs would otherwise each start a chain of their own.
+
+    Args:
+        eta (datetime): Time of the run, rounded up to the second.
+        batch_size (int): Passed to the run.
+
+    Returns:
+        Whether the run was scheduled.
+        bool
+    """
+    if eta.microsecond:
+        eta = eta.replace(microsecond=0) + timedelta(seconds=1)
+    countdown = max((eta - timezone.now()).total_seconds(), 0)
+    key = FOLLOW_UP_KEY.format(
+        eta=int(eta.timestamp())
+    )
+    if not cache.add(key, True, countdown + 60):
+        return False
+
+    process_webhook_events.apply_async(
+        kwargs={
+            'batch_size': batch_size,
+        },
+        eta=eta
+    )
+    return True
@@ -0,0 +1,151 @@
+from datetime import timedelta
+
+import mock
+from django.core.cache import cache
+from django.test.utils import override_settings
+from django.utils import timezone
+from Lunchbreak.tests.testcase import LunchbreakTestCase
+
+from ..models import WebhookEvent
+from ..tasks import process_webhook_events
+
+
+class InboxTestCase(LunchbreakTestCase):
+
+    PROVIDER = WebhookEvent.PLIVO
+
+    def setUp(self):
+        super().setUp()
+        self.handled = []
+        self.failing = set()
+
+        patcher_handlers = mock.patch.dict(
+            WebhookEvent.handlers,
+            {
+                self.PROVIDER: self.handle,
+            }
+        )
+        self.addCleanup(patcher_handlers.stop)
+        patcher_handlers.start()
+
+    def handle(self, event):
+        if event.event_id in self.failing:
+            raise ValueError('Failed to handle {}.'.format(event.event_id))
+        self.handled.append(event.event_id)
+
+    def receive(self, event_id, object_id=''):
+        return WebhookEvent.receive(
+            provider=self.PROVIDER,
+            event_id=event_id,
+            object_id=object_id,
+            payload={
+                'id': event_id,
+            }
+        )
+
+    def test_duplicate(self):
+        """Test whether events that are received again are ignored."""
+        self.assertTrue(self.receive('event'))
+        self.assertFalse(self.receive('event'))
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+
+        self.assertEqual(WebhookEvent.process_batch(), (1, 0,))
+        self.assertFalse(self.receive('event'))
+        self.assertEqual(WebhookEvent.process_batch(), (0, 0,))
+        self.assertEqual(self.handled, ['event'])
+
+    def test_object_order(self):
+        """Test whether events of an object are handled in order."""
+        self.receive('first', object_id='object')
+        self.receive('second', object_id='object')
+        self.receive('other', object_id='other')
+
+        self.failing.add('first')
+        self.assertEqual(WebhookEvent.process_batch(), (2, 1,))
+        self.assertEqual(self.handled, ['other'])
+
+        first = WebhookEvent.objects.get(event_id='first')
+        self.assertEqual(first.attempts, 1)
+        self.assertIsNone(first.processed_at)
+        self.assertGreater(first.retry_at, timezone.now())
+        self.assertIn('first', first.error)
+
+        # The second event waits for the retry of the first one
+        self.assertEqual(WebhookEvent.process_batch(), (0, 0,))
+
+        self.failing.clear()
+        WebhookEvent.objects.filter(
+            pk=first.pk
+        ).update(
+            retry_at=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(WebhookEvent.process_batch(), (2, 0,))
+        self.assertEqual(self.handled, ['other', 'first', 'second'])
+        self.assertFalse(WebhookEvent.objects.unprocessed().exists())
+
+    def test_batch_size(self):
+        """Test whether later events of an object wait for the next batch."""
+        self.receive('first', object_id='object')
+        self.receive('second', object_id='object')
+
+        self.assertEqual(WebhookEvent.process_batch(size=1), (1, 0,))
+        self.assertEqual(WebhookEvent.process_batch(size=1), (1, 0,))
+        self.assertEqual(self.handled, ['first', 'second'])
+
+    def test_blocked(self):
+        """Test whether events waiting for a retry of an earlier event do not
+        take up the batch."""
+        self.receive('first', object_id='object')
+        self.receive('second', object_id='object')
+        self.receive('third', object_id='object')
+        self.receive('other', object_id='other')
+
+        self.failing.add('first')
+        self.assertEqual(WebhookEvent.process_batch(size=1), (1, 0,))
+        self.assertEqual(WebhookEvent.process_batch(size=1), (1, 0,))
+        self.assertEqual(self.handled, ['other'])
+        self.assertEqual(WebhookEvent.process_batch(size=1), (0, 0,))
+
+    @override_settings(WEBHOOKS={'max_attempts': 1})
+    def test_max_attempts(self):
+        """Test whether events that keep failing stop blocking the object."""
+        self.receive('first', object_id='object')
+        self.receive('second', object_id='object')
+
+        self.failing.add('first')
+        self.assertEqual(WebhookEvent.process_batch(), (1, 1,))
+        self.assertEqual(WebhookEvent.process_batch(), (1, 0,))
+        self.assertEqual(self.handled, ['second'])
+        self.assertEqual(
+            WebhookEvent.objects.get(event_id='first').attempts,
+            1
+        )
+
+    @mock.patch('webhooks.tasks.process_webhook_events.apply_async')
+    def test_task(self, mock_apply_async):
+        """Test whether the task drains the inbox in batches."""
+        for i in range(5):
+            self.receive('event{}'.format(i))
+
+        process_webhook_events(batch_size=2)
+        self.assertEqual(len(self.handled), 5)
+        self.assertFalse(mock_apply_async.called)
+
+        cache.clear()
+        self.failing.add('failing')
+        self.receive('failing')
+        process_webhook_events()
+        self.assertTrue(mock_apply_async.called)
+
+        # One follow-up at the retry, not one for every run
+        retry_at = WebhookEvent.objects.get(event_id='failing').retry_at
+        self.assertGreaterEqual(
+            mock_apply_async.call_args[1]['eta'],
+            retry_at
+        )
+        self.assertLess(
+            mock_apply_async.call_args[1]['eta'],
+            retry_at + timedelta(seconds=1)
+        )
+        process_webhook_events()
+        self.assertEqual(mock_apply_async.call_count, 1)